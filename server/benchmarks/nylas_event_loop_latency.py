@@ -0,0 +1,101 @@
+"""
+Event-loop latency while NylasService fetches mail for concurrent onboardings.
+
+A fake Nylas client stands in for the SDK: each messages.list call blocks its
+thread for --latency seconds, like a real HTTP round-trip through `requests`.
+While N fetches run concurrently, a ticker coroutine measures how late the
+event loop wakes it up. The run is repeated with the SDK called directly on
+the event loop (the previous behaviour) and through the Nylas thread pool.
+
+Usage (from the server directory):
+    python -m benchmarks.nylas_event_loop_latency --fetches 8 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from src.modules.nylas import service as service_module
+from src.modules.nylas.service import NylasService
+
+
+class FakeMessage:
+    def __init__(self, i: int):
+        self.i = i
+
+    def to_dict(self):
+        return {"id": f"msg-{self.i}", "folders": ["INBOX"], "body": "hello"}
+
+
+class FakeMessages:
+    def __init__(self, latency: float, page_size: int):
+        self.latency = latency
+        self.page_size = page_size
+
+    def list(self, identifier, query_params=None):
+        time.sleep(self.latency)
+        data = [FakeMessage(i) for i in range(self.page_size)]
+        return SimpleNamespace(data=data, next_cursor=None)
+
+
+async def _call_inline(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+async def measure(service: NylasService, fetches: int, tick: float = 0.01) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(tick)
+            lags.append(time.perf_counter() - started - tick)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(tick)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(service.get_messages(f"grant-{i}", limit=200) for i in range(fetches))
+    )
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticker_task
+
+    return {
+        "wall_seconds": elapsed,
+        "max_lag_ms": max(lags) * 1000,
+        "p50_lag_ms": statistics.median(lags) * 1000,
+        "ticks": len(lags),
+    }
+
+
+async def main(fetches: int, latency: float, page_size: int) -> None:
+    service = NylasService()
+    service.client = SimpleNamespace(messages=FakeMessages(latency, page_size))
+
+    original = service_module.run_in_nylas_executor
+    service_module.run_in_nylas_executor = _call_inline
+    try:
+        blocking = await measure(service, fetches)
+    finally:
+        service_module.run_in_nylas_executor = original
+    pooled = await measure(service, fetches)
+
+    print(f"{fetches} concurrent fetches, {latency * 1000:.0f} ms per SDK call")
+    print(f"{'mode':<12}{'wall s':>10}{'max lag ms':>14}{'p50 lag ms':>14}")
+    for name, result in (("inline", blocking), ("executor", pooled)):
+        print(
+            f"{name:<12}{result['wall_seconds']:>10.2f}"
+            f"{result['max_lag_ms']:>14.1f}{result['p50_lag_ms']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fetches", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.fetches, args.latency, args.page_size))
@@ -0,0 +1,123 @@
+"""
+Bytes transferred and pages fetched when streaming one folder of a mailbox.
+
+A fake Nylas mailbox stands in for the API: it applies the "in" and "select"
+query parameters the way Nylas does and counts the JSON bytes of every page it
+returns. The run compares the previous flow (fetch every message with every
+field, filter folders on the client) with folder filtering and field selection
+pushed into the query.
+
+Usage (from the server directory):
+    python -m benchmarks.nylas_folder_filter_bytes --messages 2000 --inbox-share 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+from src.modules.nylas.folders import folder_cache
+from src.modules.nylas.service import NylasService
+
+FOLDERS = [
+    SimpleNamespace(id="Label_inbox", name="Inbox", attributes=["\\Inbox"]),
+    SimpleNamespace(id="Label_sent", name="Sent", attributes=["\\Sent"]),
+    SimpleNamespace(id="Label_archive", name="Archive", attributes=[]),
+]
+
+
+def make_mailbox(count: int, inbox_share: float, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    mailbox = []
+    for i in range(count):
+        folder = "Label_inbox" if rng.random() < inbox_share else "Label_archive"
+        mailbox.append(
+            {
+                "id": f"msg-{i}",
+                "grant_id": "grant-1",
+                "object": "message",
+                "thread_id": f"thread-{i // 3}",
+                "subject": f"Subject {i}",
+                "from": [{"email": f"sender{i}@example.com", "name": "Sender"}],
+                "to": [{"email": "me@example.com"}],
+                "date": 1700000000 + i,
+                "folders": [folder],
+                "body": "<p>" + "lorem ipsum " * rng.randint(50, 400) + "</p>",
+                "snippet": "lorem ipsum " * 10,
+                "headers": [
+                    {"name": f"X-Header-{h}", "value": "x" * 40} for h in range(20)
+                ],
+                "attachments": [],
+                "starred": False,
+                "unread": True,
+            }
+        )
+    return mailbox
+
+
+class FakeMailbox:
+    def __init__(self, mailbox: list):
+        self.mailbox = mailbox
+        self.bytes = 0
+        self.pages = 0
+
+    def list(self, identifier, query_params=None):
+        params = query_params or {}
+        messages = self.mailbox
+        if "in" in params:
+            wanted = set(params["in"])
+            messages = [m for m in messages if wanted & set(m["folders"])]
+        if "select" in params:
+            fields = params["select"].split(",")
+            messages = [{k: m[k] for k in fields if k in m} for m in messages]
+
+        start = int(params.get("page_token") or 0)
+        limit = int(params.get("limit", 50))
+        page = messages[start : start + limit]
+        self.bytes += len(json.dumps({"data": page}))
+        self.pages += 1
+        next_cursor = str(start + limit) if start + limit < len(messages) else None
+        return SimpleNamespace(
+            data=[SimpleNamespace(to_dict=lambda m=m: m) for m in page],
+            next_cursor=next_cursor,
+        )
+
+
+async def stream(service: NylasService, pushdown: bool, page_size: int) -> int:
+    count = 0
+    if pushdown:
+        pages = service.iter_messages("grant-1", folders=["INBOX"], page_size=page_size)
+        async for page in pages:
+            count += len(page)
+    else:
+        pages = service.iter_messages("grant-1", page_size=page_size, fields=None)
+        async for page in pages:
+            count += sum("Label_inbox" in m["folders"] for m in page)
+    return count
+
+
+async def main(messages: int, inbox_share: float, page_size: int) -> None:
+    mailbox = make_mailbox(messages, inbox_share)
+    service = NylasService()
+    print(f"{messages} messages, {inbox_share:.0%} in INBOX, page size {page_size}")
+    print(f"{'mode':<12}{'matched':>10}{'pages':>8}{'MB':>10}")
+    for name, pushdown in (("client", False), ("pushdown", True)):
+        folder_cache.invalidate("grant-1")
+        fake = FakeMailbox(mailbox)
+        service.client = SimpleNamespace(
+            messages=fake,
+            folders=SimpleNamespace(
+                list=lambda identifier: SimpleNamespace(data=FOLDERS)
+            ),
+        )
+        matched = await stream(service, pushdown, page_size)
+        print(f"{name:<12}{matched:>10}{fake.pages:>8}{fake.bytes / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--inbox-share", type=float, default=0.3)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.inbox_share, args.page_size))
@@ -0,0 +1,120 @@
+"""
+Latency of loading a user's task list from Neo4j.
+
+Seeds a throwaway user with `--tasks` tasks in the graph at NEO4J_URL, then
+compares the previous dashboard query (every task node, fully sorted and
+inflated) with a top-K page and a deep keyset page of projected fields. The
+seeded nodes are deleted afterwards.
+
+Usage (from the server directory, against a development database):
+    python -m benchmarks.task_page_latency --tasks 10000 --limit 50
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from src.models.graph.nodes import TaskNode
+from src.models.graph.repository import graph
+from src.modules.tasks.service import (
+    TaskService,
+    decode_task_cursor,
+    encode_task_cursor,
+)
+
+FULL_QUERY = """
+MATCH (u:UserNode {userid: $user_id})-[:HAS_EMAIL]->(e:EmailNode)-[:CONTAINS_TASK]->(t:TaskNode)
+RETURN t
+ORDER BY t.relevance_score DESC
+"""
+
+CLEANUP_QUERY = """
+MATCH (u:UserNode {userid: $user_id})
+OPTIONAL MATCH (u)-[:HAS_EMAIL]->(e:EmailNode)
+OPTIONAL MATCH (e)-[:CONTAINS_TASK]->(t:TaskNode)
+DETACH DELETE t, e, u
+"""
+
+
+async def seed(user_id: str, count: int) -> None:
+    rng = random.Random(7)
+    tasks = []
+    for i in range(count):
+        task = TaskNode(
+            task_id=str(uuid.uuid4()),
+            task=f"Task {i} " + "lorem ipsum " * 10,
+            priority=rng.choice(["high", "medium", "low"]),
+            deadline="No Deadline",
+            relevance_score=rng.random(),
+            utility_score=rng.random(),
+            cost_score=rng.random(),
+            classification=rng.choice(["Today", "Later", ""]),
+        )
+        task.messageId = f"{user_id}-msg-{i // 3}"
+        tasks.append(task)
+    for start in range(0, count, TaskService.BULK_WRITE_BATCH_SIZE):
+        await graph.create_tasks(
+            user_id, tasks[start : start + TaskService.BULK_WRITE_BATCH_SIZE]
+        )
+
+
+async def timed(label: str, coro_factory, runs: int) -> None:
+    await coro_factory()  # warm up plan cache and pool
+    start = time.perf_counter()
+    for _ in range(runs):
+        rows = await coro_factory()
+    elapsed = (time.perf_counter() - start) / runs * 1000
+    print(f"{label:<24}{len(rows):>8}{elapsed:>12.1f}")
+
+
+async def full_list(user_id: str):
+    result = await graph.run(FULL_QUERY, user_id=user_id)
+    return [TaskNode.inflate(record["t"]) for record in result.records]
+
+
+async def deep_page(user_id: str, limit: int, pages: int):
+    # Straight to the graph: TaskService would read the ranking table, which
+    # needs the relational database
+    after = None
+    for _ in range(pages):
+        tasks = await graph.get_task_page(user_id, limit=limit, after=after)
+        if not tasks:
+            break
+        last = tasks[-1]
+        after = decode_task_cursor(
+            encode_task_cursor(last.get("relevance_score"), last["task_id"])
+        )
+    return tasks
+
+
+async def main(count: int, limit: int, runs: int) -> None:
+    user_id = f"bench-{uuid.uuid4()}"
+    try:
+        await seed(user_id, count)
+        print(f"{count} tasks for one user, limit {limit}, {runs} runs")
+        print(f"{'query':<24}{'rows':>8}{'ms':>12}")
+        await timed("full list (before)", lambda: full_list(user_id), runs)
+        await timed(
+            "top-K page",
+            lambda: graph.get_task_page(user_id, limit=limit),
+            runs,
+        )
+        await timed(
+            "top-K classification",
+            lambda: graph.get_task_page(user_id, limit=limit, classification="Today"),
+            runs,
+        )
+        await timed("10th keyset page", lambda: deep_page(user_id, limit, 10), 1)
+    finally:
+        await graph.run(CLEANUP_QUERY, write=True, user_id=user_id)
+        await graph.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.limit, args.runs))
@@ -0,0 +1,85 @@
+"""
+Latency of looking up the users of a Nylas grant.
+
+Populates a throwaway SQLite database with users holding encrypted grant IDs
+and compares the previous lookup (load every user with a grant and decrypt
+each one) with the blind-index lookup (one indexed equality query).
+
+Usage (from the server directory):
+    python -m benchmarks.user_grant_lookup --users 10000 100000 --lookups 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from tortoise import Tortoise
+from src.models.user import User
+from src.utils.encryption import encryption
+
+
+async def populate(count: int) -> list:
+    grant_ids = [f"grant-{i:07d}" for i in range(count)]
+    users = [
+        User(
+            name=f"user {i}",
+            email=f"user{i}@example.com",
+            nylas_grant_id=encryption.encrypt(grant_id),
+            nylas_grant_index=encryption.blind_index(grant_id),
+        )
+        for i, grant_id in enumerate(grant_ids)
+    ]
+    await User.bulk_create(users, batch_size=5000)
+    return grant_ids
+
+
+async def scan_lookup(grant_id: str) -> list:
+    users = await User.filter(nylas_grant_id__not_isnull=True).all()
+    return [user for user in users if user.get_nylas_grant_id() == grant_id]
+
+
+async def time_lookups(lookup, grant_ids: list) -> float:
+    start = time.perf_counter()
+    for grant_id in grant_ids:
+        assert len(await lookup(grant_id)) == 1
+    return (time.perf_counter() - start) / len(grant_ids) * 1000
+
+
+async def run(count: int, lookups: int, scan_lookups: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        await Tortoise.init(
+            db_url=f"sqlite://{os.path.join(tmp, 'bench.sqlite3')}",
+            modules={"models": ["src.models.user"]},
+        )
+        await Tortoise.generate_schemas()
+        try:
+            grant_ids = await populate(count)
+            rng = random.Random(7)
+            sample = rng.sample(grant_ids, lookups)
+            scan_ms = await time_lookups(scan_lookup, sample[:scan_lookups])
+            index_ms = await time_lookups(User.get_all_users_by_grant_id, sample)
+            print(f"{count:>10}{scan_ms:>14.1f}{index_ms:>14.3f}")
+        finally:
+            await Tortoise.close_connections()
+
+
+async def main(users: list, lookups: int, scan_lookups: int) -> None:
+    print(f"{'users':>10}{'scan ms':>14}{'index ms':>14}")
+    for count in users:
+        await run(count, lookups, min(scan_lookups, lookups))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=20)
+    parser.add_argument(
+        "--scan-lookups",
+        type=int,
+        default=3,
+        help="Lookups timed with the scan (each one decrypts every user)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.lookups, args.scan_lookups))
@@ -3,6 +3,7 @@ FastAPI Template Application
 This is a template for FastAPI applications following best practices.
 """
 
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -12,6 +13,12 @@ from tortoise.exceptions import BaseORMException
 from contextlib import asynccontextmanager
 from src.config import  settings
 from src.database import init_db, close_db
+from src.models.task_scoring import scoring_model
+from src.models.graph.repository import graph
+from src.models.graph.schema import ensure_schema
+from src.jobs.handlers import JOB_HANDLERS
+from src.jobs.queue import job_queue
+from src.jobs.worker import JobWorker
 from src.modules.auth.router import router as user_router
 from src.modules.nylas.router import router as nylas_router
 from src.modules.nylas.email_router import router as nylas_email_router
@@ -32,7 +39,23 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     await init_db()
     neo_config.DATABASE_URL = settings.NEO4J_URL
+    schema_task = None
+    if settings.NEO4J_INSTALL_SCHEMA_ON_STARTUP:
+        # Index builds can take a while on a large graph; don't block startup
+        schema_task = asyncio.create_task(ensure_schema())
+    worker = None
+    if settings.JOB_WORKER_IN_PROCESS or settings.JOB_QUEUE_BACKEND == "memory":
+        worker = JobWorker(job_queue, JOB_HANDLERS)
+        worker.start()
     yield
+    # Let running jobs finish before shutting down
+    if worker is not None:
+        await worker.stop()
+    # Apply buffered reorder feedback before the database goes away
+    await scoring_model.feedback_buffer.flush_all()
+    if schema_task is not None and not schema_task.done():
+        schema_task.cancel()
+    await graph.close()
     await close_db()
 # Initialize FastAPI app
 app = FastAPI(
@@ -55,6 +78,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -0,0 +1,16 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "idempotency_keys" (
+    "key" VARCHAR(64) NOT NULL PRIMARY KEY,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_idempotency_created_2d7b1a" ON "idempotency_keys" ("created_at");
+COMMENT ON TABLE "idempotency_keys" IS 'Claimed idempotency key (SHA-256 of a webhook event or message ID).';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "idempotency_keys";"""
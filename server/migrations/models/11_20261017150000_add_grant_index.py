@@ -0,0 +1,53 @@
+from tortoise import BaseDBAsyncClient
+from src.utils.encryption import encryption
+
+BATCH_SIZE = 1000
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    await db.execute_script(
+        """
+        ALTER TABLE "users" ADD "nylas_grant_index" VARCHAR(64);
+COMMENT ON COLUMN "users"."nylas_grant_index" IS 'Blind index (keyed HMAC) of the Nylas grant ID';"""
+    )
+
+    # Backfill: grant IDs are Fernet-encrypted, so the index is computed here
+    last_id = None
+    while True:
+        if last_id is None:
+            rows = await db.execute_query_dict(
+                'SELECT "id", "nylas_grant_id" FROM "users" '
+                'WHERE "nylas_grant_id" IS NOT NULL ORDER BY "id" LIMIT $1',
+                [BATCH_SIZE],
+            )
+        else:
+            rows = await db.execute_query_dict(
+                'SELECT "id", "nylas_grant_id" FROM "users" '
+                'WHERE "nylas_grant_id" IS NOT NULL AND "id" > $1 '
+                'ORDER BY "id" LIMIT $2',
+                [last_id, BATCH_SIZE],
+            )
+        if not rows:
+            break
+        for row in rows:
+            try:
+                grant_index = encryption.blind_index(
+                    encryption.decrypt(row["nylas_grant_id"])
+                )
+            except Exception as e:
+                print(f"Skipping grant index for user {row['id']}: {str(e)}")
+                continue
+            await db.execute_query(
+                'UPDATE "users" SET "nylas_grant_index" = $1 WHERE "id" = $2',
+                [grant_index, row["id"]],
+            )
+        last_id = rows[-1]["id"]
+
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_users_nylas_g_5e2c9a" ON "users" ("nylas_grant_index");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_nylas_g_5e2c9a";
+        ALTER TABLE "users" DROP COLUMN "nylas_grant_index";"""
@@ -0,0 +1,37 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "task_rankings" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "user_id" VARCHAR(64) NOT NULL,
+    "task_id" VARCHAR(64) NOT NULL,
+    "message_id" VARCHAR(255),
+    "task" TEXT NOT NULL,
+    "deadline" VARCHAR(255),
+    "priority" VARCHAR(32),
+    "classification" VARCHAR(64),
+    "relevance_score" DOUBLE PRECISION NOT NULL DEFAULT 0,
+    "utility_score" DOUBLE PRECISION,
+    "cost_score" DOUBLE PRECISION,
+    "task_created_at" TIMESTAMPTZ,
+    "task_updated_at" TIMESTAMPTZ,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT "uid_task_rankin_user_id_8d3e51" UNIQUE ("user_id", "task_id")
+);
+CREATE INDEX IF NOT EXISTS "idx_task_rankin_user_id_1c7a2f" ON "task_rankings" ("user_id", "relevance_score" DESC, "task_id");
+CREATE INDEX IF NOT EXISTS "idx_task_rankin_user_id_6b94d0" ON "task_rankings" ("user_id", "classification", "relevance_score" DESC, "task_id");
+CREATE INDEX IF NOT EXISTS "idx_task_rankin_task_id_2f0c8b" ON "task_rankings" ("task_id");
+COMMENT ON TABLE "task_rankings" IS 'Denormalised copy of a user''s tasks, ordered for the dashboard.';
+        CREATE TABLE IF NOT EXISTS "task_ranking_state" (
+    "user_id" VARCHAR(64) NOT NULL PRIMARY KEY,
+    "built_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+COMMENT ON TABLE "task_ranking_state" IS 'Users whose ranking has been built from the graph.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "task_ranking_state";
+        DROP TABLE IF EXISTS "task_rankings";"""
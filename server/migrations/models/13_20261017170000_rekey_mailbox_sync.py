@@ -0,0 +1,57 @@
+import hashlib
+from tortoise import BaseDBAsyncClient
+from src.utils.encryption import encryption
+
+BATCH_SIZE = 1000
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # Sync rows were keyed by an unkeyed SHA-256 of the grant ID; move them to
+    # the blind index. Grant IDs are Fernet-encrypted, so keys are computed here
+    last_id = None
+    while True:
+        if last_id is None:
+            rows = await db.execute_query_dict(
+                'SELECT "id", "nylas_grant_id" FROM "users" '
+                'WHERE "nylas_grant_id" IS NOT NULL ORDER BY "id" LIMIT $1',
+                [BATCH_SIZE],
+            )
+        else:
+            rows = await db.execute_query_dict(
+                'SELECT "id", "nylas_grant_id" FROM "users" '
+                'WHERE "nylas_grant_id" IS NOT NULL AND "id" > $1 '
+                'ORDER BY "id" LIMIT $2',
+                [last_id, BATCH_SIZE],
+            )
+        if not rows:
+            break
+        for row in rows:
+            try:
+                grant_id = encryption.decrypt(row["nylas_grant_id"])
+            except Exception as e:
+                print(f"Skipping sync key for user {row['id']}: {str(e)}")
+                continue
+            old_key = hashlib.sha256(grant_id.encode("utf-8")).hexdigest()
+            new_key = encryption.blind_index(grant_id)
+            for table in ("mailbox_sync_state", "synced_messages"):
+                await db.execute_query(
+                    f'UPDATE "{table}" SET "grant_key" = $1 WHERE "grant_key" = $2',
+                    [new_key, old_key],
+                )
+        last_id = rows[-1]["id"]
+
+    # Rows of grants no user holds any more can no longer be rekeyed
+    return """
+        DELETE FROM "synced_messages" WHERE "grant_key" NOT IN (
+            SELECT "nylas_grant_index" FROM "users"
+            WHERE "nylas_grant_index" IS NOT NULL);
+        DELETE FROM "mailbox_sync_state" WHERE "grant_key" NOT IN (
+            SELECT "nylas_grant_index" FROM "users"
+            WHERE "nylas_grant_index" IS NOT NULL);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    # The old keys cannot be derived from the blind index; the store is a cache
+    return """
+        DELETE FROM "synced_messages";
+        DELETE FROM "mailbox_sync_state";"""
@@ -0,0 +1,37 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "mailbox_sync_state" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "grant_key" VARCHAR(64) NOT NULL UNIQUE,
+    "synced_from" BIGINT NOT NULL,
+    "synced_until" BIGINT NOT NULL,
+    "last_synced_at" BIGINT NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+COMMENT ON COLUMN "mailbox_sync_state"."synced_from" IS 'Oldest covered received_at';
+COMMENT ON COLUMN "mailbox_sync_state"."synced_until" IS 'High-water mark (received_at)';
+COMMENT ON COLUMN "mailbox_sync_state"."last_synced_at" IS 'Unix time of the last sync';
+COMMENT ON TABLE "mailbox_sync_state" IS 'Per-grant mailbox sync progress.';
+        CREATE TABLE IF NOT EXISTS "synced_messages" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "grant_key" VARCHAR(64) NOT NULL,
+    "message_id" VARCHAR(255) NOT NULL,
+    "received_at" BIGINT NOT NULL,
+    "folders" JSONB NOT NULL,
+    "data" JSONB NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT "uid_synced_mess_grant_k_5b0c1e" UNIQUE ("grant_key", "message_id")
+);
+CREATE INDEX IF NOT EXISTS "idx_synced_mess_grant_k_3f9a2d" ON "synced_messages" ("grant_key", "received_at");
+COMMENT ON COLUMN "synced_messages"."data" IS 'Message fields as returned by Nylas';
+COMMENT ON TABLE "synced_messages" IS 'Local copy of a message pulled by the mailbox sync.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "synced_messages";
+        DROP TABLE IF EXISTS "mailbox_sync_state";"""
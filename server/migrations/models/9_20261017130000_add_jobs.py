@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "jobs" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "kind" VARCHAR(100) NOT NULL,
+    "payload" JSONB NOT NULL,
+    "status" VARCHAR(16) NOT NULL DEFAULT 'pending',
+    "attempts" INT NOT NULL DEFAULT 0,
+    "run_after" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "locked_at" TIMESTAMPTZ,
+    "last_error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_jobs_status_8c1f4e" ON "jobs" ("status", "run_after");
+COMMENT ON TABLE "jobs" IS 'Background job persisted by the Postgres job queue.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "jobs";"""
@@ -1,29 +1,49 @@
 from langfuse.openai import AsyncOpenAI
 from src.config import settings
 import json
+import time
 from src.tools.get_task_deadline import get_task_deadline
+from src.agents.response_cache import make_cache_key, response_cache
+from src.agents.llm_scheduler import estimate_tokens, llm_scheduler
+from src.agents.retry_policy import RetryPolicy
+from src.exceptions.llm import LLMException
 from langfuse import Langfuse
 from langfuse.decorators import langfuse_context, observe
 
 langfuse = Langfuse()
 
+# Clients are shared so that all agents reuse one connection pool. Retries are
+# handled by RetryPolicy, so the client's own retries are disabled.
+_clients = {}
+
+
+def _get_client(base_url, api_key) -> AsyncOpenAI:
+    key = (base_url, api_key)
+    if key not in _clients:
+        _clients[key] = AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0)
+    return _clients[key]
+
 
 class BaseAgent:
     """
     Base class for all agents.
+
+    Subclasses whose output depends only on the request can set
+    `cache_responses = True` to serve repeated requests from the response cache.
     """
 
+    cache_responses = False
+
     def __init__(
         self,
         model="gpt-4o",
         base_url=settings.LLM_BASE_URL,
         api_key=settings.LLM_API_KEY,
+        retry_policy=None,
     ):
         self.model = model
-        self.client = AsyncOpenAI(
-            base_url=base_url,
-            api_key=api_key,
-        )
+        self.client = _get_client(base_url, api_key)
+        self.retry_policy = retry_policy or RetryPolicy()
 
     @observe()
     async def execute(
@@ -44,19 +64,39 @@ class BaseAgent:
 
         Returns:
             The LLM response as a string or JSON object
+
+        Raises:
+            LLMException: If the API call failed fatally or ran out of retries
         """
+        cache_key = None
+        if self.cache_responses and response_cache is not None:
+            cache_key = make_cache_key(
+                self.model, system_prompt, user_input, response_format, tool_schemas
+            )
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Retries of both round-trips share one deadline
+        deadline = time.monotonic() + self.retry_policy.deadline_seconds
+
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_input},
-                ],
-                tools=tool_schemas if tool_schemas else None,
-                tool_choice="auto" if tool_schemas else None,
-                response_format=(
-                    {"type": "json_object"} if response_format == "json" else None
+            response = await self.retry_policy.run(
+                lambda: self._create_completion(
+                    estimate_tokens(system_prompt, user_input),
+                    deadline,
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_input},
+                    ],
+                    tools=tool_schemas if tool_schemas else None,
+                    tool_choice="auto" if tool_schemas else None,
+                    response_format=(
+                        {"type": "json_object"} if response_format == "json" else None
+                    ),
                 ),
+                deadline,
             )
 
             message = response.choices[0].message
@@ -104,12 +144,23 @@ class BaseAgent:
                 ]
 
                 # Call the API again with the tool results
-                second_response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=new_messages,
-                    response_format=(
-                        {"type": "json_object"} if response_format == "json" else None
+                second_response = await self.retry_policy.run(
+                    lambda: self._create_completion(
+                        estimate_tokens(
+                            system_prompt,
+                            user_input,
+                            *(result["content"] for result in tool_results),
+                        ),
+                        deadline,
+                        model=self.model,
+                        messages=new_messages,
+                        response_format=(
+                            {"type": "json_object"}
+                            if response_format == "json"
+                            else None
+                        ),
                     ),
+                    deadline,
                 )
 
                 result = second_response.choices[0].message.content
@@ -119,18 +170,48 @@ class BaseAgent:
             # Convert JSON string to Python object if response_format is "json"
             if response_format == "json" and result:
                 try:
-                    return json.loads(result)
+                    result = json.loads(result)
                 except json.JSONDecodeError as e:
                     return {"error": "Failed to parse API response"}
 
+            if cache_key and result:
+                await response_cache.set(cache_key, result)
+
             return result
 
+        except LLMException as e:
+            print(f"LLM API error: {str(e)}")
+            raise
         except Exception as e:
             print(f"LLM API error: {str(e)}")
             if response_format == "json":
                 return {"error": f"API error: {str(e)}"}
             return f"Error: {str(e)}"
 
+    async def _create_completion(
+        self, estimated_tokens: int, deadline: float = None, **kwargs
+    ):
+        """
+        Send a chat completion request through the process-wide LLM scheduler
+
+        Args:
+            estimated_tokens: Token estimate used for rate limiting
+            deadline: Optional time.monotonic() deadline; the request times out
+                once it passes, including time spent waiting for a slot
+            **kwargs: Arguments for client.chat.completions.create
+
+        Returns:
+            The chat completion response
+        """
+        async with llm_scheduler.slot(estimated_tokens) as report_usage:
+            if deadline is not None:
+                kwargs["timeout"] = max(0, deadline - time.monotonic())
+            response = await self.client.chat.completions.create(**kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                report_usage(usage.total_tokens)
+            return response
+
     @observe()
     async def _execute_tool_function(self, function_name, function_args):
         """
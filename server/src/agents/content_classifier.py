@@ -9,6 +9,8 @@ class ContentClassifier(BaseAgent):
     Agent to classify content by type and usefulness.
     """
 
+    cache_responses = True
+
     def __init__(self):
         """
         Initialize the ContentClassifier agent
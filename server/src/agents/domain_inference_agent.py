@@ -8,6 +8,8 @@ from langfuse.decorators import observe
 class DomainInferenceAgent(BaseAgent):
     """Agent for inferring a user's professional domain from their email."""
 
+    cache_responses = True
+
     def __init__(self):
         """Initialize the domain inference agent."""
         super().__init__()
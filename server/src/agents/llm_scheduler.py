@@ -0,0 +1,210 @@
+"""
+Process-wide scheduler that bounds concurrent and per-minute LLM usage
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, List, Optional
+from src.config import settings
+
+
+class LLMPriority(IntEnum):
+    """Priority classes for LLM requests; lower values are served first."""
+
+    REALTIME = 0
+    DEFAULT = 1
+    BACKFILL = 2
+
+
+# Priority of the LLM requests made by the current task and its children
+current_priority: ContextVar[LLMPriority] = ContextVar(
+    "llm_priority", default=LLMPriority.DEFAULT
+)
+
+
+def with_llm_priority(priority: LLMPriority):
+    """
+    Decorator that runs an async function with the given LLM priority
+
+    Tasks spawned inside the function (e.g. with asyncio.gather) inherit it.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = current_priority.set(priority)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                current_priority.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough token estimate for rate limiting (about four characters per token)."""
+    return sum(len(text or "") for text in texts) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `capacity` per minute.
+
+    A capacity of 0 disables the limit. The level may go negative when a
+    request turns out to use more than estimated, which delays later requests.
+    """
+
+    def __init__(self, capacity: float):
+        self.capacity = float(capacity)
+        self.level = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(
+            self.capacity, self.level + (now - self._updated) * self.capacity / 60.0
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken, 0 if available now."""
+        if not self.capacity:
+            return 0.0
+        self._refill()
+        # A request bigger than the bucket is admitted once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if self.capacity:
+            self._refill()
+            self.level -= amount
+
+
+class LLMScheduler:
+    """
+    Admission control shared by every agent in the process.
+
+    A request is admitted when fewer than `max_concurrency` requests are in
+    flight and both the requests-per-minute and tokens-per-minute buckets can
+    cover it. Waiting requests are admitted strictly by priority, then FIFO, so
+    webhook traffic overtakes queued onboarding backfill.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        requests_per_minute: int = settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = settings.LLM_TOKENS_PER_MINUTE,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.in_flight = 0
+        self.admitted = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 1, priority: Optional[LLMPriority] = None):
+        """
+        Wait for permission to send one LLM request
+
+        Args:
+            tokens: Estimated tokens the request will use
+            priority: Priority class, defaults to the current task's priority
+
+        Yields:
+            Callable that reports the actual token usage once known
+        """
+        if priority is None:
+            priority = current_priority.get()
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._queue, (int(priority), next(self._sequence), tokens, future)
+        )
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as we were cancelled; give the slot back
+                self._release()
+            raise
+
+        self.total_wait_seconds += time.monotonic() - started
+
+        def report_usage(actual_tokens: int) -> None:
+            self.tokens.take(actual_tokens - tokens)
+
+        try:
+            yield report_usage
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth and throughput metrics."""
+        queued = {priority.name.lower(): 0 for priority in LLMPriority}
+        for priority, _, _, future in self._queue:
+            if not future.done():
+                queued[LLMPriority(priority).name.lower()] += 1
+        return {
+            "in_flight": self.in_flight,
+            "queued": sum(queued.values()),
+            "queued_by_priority": queued,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+        }
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._queue:
+            _, _, tokens, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= self.max_concurrency:
+                return
+
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait > 0:
+                self._schedule(wait)
+                return
+
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            self.admitted += 1
+            future.set_result(None)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None and not self._timer.cancelled():
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._dispatch)
+
+
+# Create singleton instance
+llm_scheduler = LLMScheduler()
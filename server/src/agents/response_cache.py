@@ -0,0 +1,278 @@
+"""
+Response cache for LLM calls made through BaseAgent.execute
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional
+from src.config import settings
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    user_input: str,
+    response_format: str,
+    tool_schemas: List[Dict[str, Any]],
+) -> str:
+    """
+    Build a stable cache key for an LLM request
+
+    Tool results (e.g. deadline utility) depend on the current date, so
+    requests that use tools are only shared within the same day.
+
+    Args:
+        model: The model name
+        system_prompt: The system prompt
+        user_input: The user input prompt
+        response_format: The expected response format
+        tool_schemas: Tool schemas passed to the request
+
+    Returns:
+        str: SHA-256 hex digest identifying the request
+    """
+    payload = {
+        "model": model,
+        "system_prompt": system_prompt,
+        "user_input": user_input,
+        "response_format": response_format,
+        "tools": tool_schemas or [],
+    }
+    if tool_schemas:
+        payload["date"] = date.today().isoformat()
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    Base class for response cache backends.
+
+    Values are stored as JSON text, so every hit returns a fresh copy that the
+    caller is free to mutate. Subclasses implement `_load`, `_store`, `_clear`
+    and `__len__`; hit/miss counting lives here. `_load` and `_store` are
+    awaited on the request path, so backends doing I/O must not block the
+    event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached response
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Optional[Any]: The cached response, or None on a miss
+        """
+        encoded = await self._load(key)
+        if encoded is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(encoded)
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a response
+
+        Args:
+            key: Cache key from make_cache_key
+            value: JSON-serializable response
+        """
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        await self._store(key, encoded)
+
+    def clear(self) -> None:
+        """Drop every cached response and reset the counters."""
+        self._clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - stored_at > self.ttl_seconds
+
+    @abstractmethod
+    async def _load(self, key: str) -> Optional[str]:
+        """Return the stored JSON text, or None if missing or expired."""
+
+    @abstractmethod
+    async def _store(self, key: str, encoded: str) -> None:
+        """Store JSON text under the key, evicting entries past `max_entries`."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Delete every entry."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries."""
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU response cache with a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.LLM_CACHE_TTL_SECONDS,
+    ):
+        super().__init__(max_entries, ttl_seconds)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def _load(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        encoded, stored_at = entry
+        if self._expired(stored_at):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return encoded
+
+    async def _store(self, key: str, encoded: str) -> None:
+        self._entries[key] = (encoded, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteResponseCache(ResponseCache):
+    """
+    On-disk response cache backed by sqlite.
+
+    Survives restarts and can be shared by several worker processes on the same
+    host. Least recently used rows are deleted once `max_entries` is exceeded.
+    Reads and writes run in a worker thread so the event loop never waits on
+    the disk.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.LLM_CACHE_PATH,
+        max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.LLM_CACHE_TTL_SECONDS,
+    ):
+        super().__init__(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed_at "
+            "ON llm_responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    async def _load(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._load_row, key)
+
+    async def _store(self, key: str, encoded: str) -> None:
+        await asyncio.to_thread(self._store_row, key, encoded)
+
+    def _load_row(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            encoded, stored_at = row
+            if self._expired(stored_at):
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE llm_responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            return encoded
+
+    def _store_row(self, key: str, encoded: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, encoded, now, now),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM llm_responses WHERE key IN (
+                    SELECT key FROM llm_responses ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+            return row[0]
+
+
+def create_response_cache(
+    backend: str = settings.LLM_CACHE_BACKEND,
+) -> Optional[ResponseCache]:
+    """
+    Create the configured response cache backend
+
+    Args:
+        backend: "memory", "sqlite" or "none"
+
+    Returns:
+        Optional[ResponseCache]: The cache, or None if caching is disabled
+    """
+    if backend == "memory":
+        return MemoryResponseCache()
+    if backend == "sqlite":
+        return SqliteResponseCache()
+    if backend != "none":
+        print(f"WARNING: Unknown LLM cache backend '{backend}', caching disabled")
+    return None
+
+
+# Create singleton instance
+response_cache = create_response_cache()
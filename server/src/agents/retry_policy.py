@@ -0,0 +1,159 @@
+"""
+Retry policy for LLM API calls
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+import httpx
+import openai
+from src.config import settings
+from src.exceptions.llm import LLMFatalError, LLMRetriesExhaustedError
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Classify an error raised by the OpenAI client
+
+    Timeouts, connection failures, rate limits and 5xx responses are transient;
+    any other API status (bad request, auth, not found, ...) is fatal.
+    """
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return isinstance(error, (httpx.TimeoutException, httpx.NetworkError))
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Whether the error is a client-side request timeout."""
+    return isinstance(error, (openai.APITimeoutError, httpx.TimeoutException))
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Read the server-requested delay from a Retry-After style header
+
+    Returns:
+        Optional[float]: Delay in seconds, or None if the response has no hint
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by attempts and a deadline.
+
+    The delay before attempt n + 1 is uniform in [0, min(max_delay,
+    base_delay * 2 ** n)], unless the provider sent Retry-After, which is
+    honoured as a lower bound. A retry that would finish past the deadline is
+    not attempted, and a timeout is only retried while time remains, since
+    callers bound each request by the time left until the deadline.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = settings.LLM_RETRY_MAX_ATTEMPTS,
+        base_delay: float = settings.LLM_RETRY_BASE_DELAY,
+        max_delay: float = settings.LLM_RETRY_MAX_DELAY,
+        deadline_seconds: float = settings.LLM_RETRY_DEADLINE_SECONDS,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Delay in seconds before retrying after the given (1-based) attempt."""
+        delay = random.uniform(
+            0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        )
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self, func: Callable[[], Awaitable[T]], deadline: Optional[float] = None
+    ) -> T:
+        """
+        Call `func` until it succeeds, fails fatally or the budget runs out
+
+        Args:
+            func: Zero-argument coroutine function making one API call
+            deadline: Optional absolute time.monotonic() deadline shared by
+                several calls; defaults to now + deadline_seconds
+
+        Returns:
+            The result of `func`
+
+        Raises:
+            LLMFatalError: If the error is not retryable
+            LLMRetriesExhaustedError: If attempts or the deadline run out
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.deadline_seconds
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise LLMFatalError(
+                        f"LLM request failed: {str(e)}", attempt, e
+                    ) from e
+                if is_timeout(e) and time.monotonic() >= deadline:
+                    raise LLMRetriesExhaustedError(
+                        f"LLM request timed out at the deadline after {attempt} attempts",
+                        attempt,
+                        e,
+                    ) from e
+                if attempt >= self.max_attempts:
+                    raise LLMRetriesExhaustedError(
+                        f"LLM request failed after {attempt} attempts: {str(e)}",
+                        attempt,
+                        e,
+                    ) from e
+
+                delay = self.backoff(attempt, e)
+                if time.monotonic() + delay >= deadline:
+                    raise LLMRetriesExhaustedError(
+                        f"LLM request deadline exceeded after {attempt} attempts: {str(e)}",
+                        attempt,
+                        e,
+                    ) from e
+
+                print(
+                    f"LLM request attempt {attempt} failed ({str(e)}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
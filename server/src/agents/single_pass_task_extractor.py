@@ -0,0 +1,74 @@
+from typing import List, Optional
+from pydantic import ValidationError
+from src.tools.get_task_deadline import get_task_deadline
+from src.agents.base_agent import BaseAgent
+from src.modules.agent.schemas import SinglePassExtractionResult
+from src.utils.file_utils import FileUtils
+from langfuse.decorators import observe
+
+
+class SinglePassTaskExtractor(BaseAgent):
+    """
+    Agent to extract tasks from an email together with their scoring features.
+    """
+
+    cache_responses = True
+
+    def __init__(self):
+        """
+        Initialize the SinglePassTaskExtractor agent
+        Load the task extractor prompt and the single-pass output instructions
+        """
+        super().__init__()
+        self.system_prompt = (
+            FileUtils.read_file_content("src/prompts/v1/task_extractor.md")
+            + "\n\n"
+            + FileUtils.read_file_content(
+                "src/prompts/v1/task_extractor_single_pass.md"
+            )
+        )
+
+    @observe()
+    async def process(
+        self, email_body: str, user_personality: str = None
+    ) -> Optional[List[dict]]:
+        """
+        Calls LLM to extract tasks with inline utility and cost features.
+
+        Args:
+            email_body: The body of the email to extract tasks from
+            user_personality: Optional user personality data to help with task extraction
+
+        Returns:
+            Optional[List[dict]]: Tasks with "title", "due_date", "priority",
+                "utility_features" and "cost_features", or None if the response
+                does not match the schema
+        """
+        result = await self.execute(
+            self.system_prompt.replace("{{user_context}}", user_personality or ""),
+            f"EMAIL CONTENT:\n{email_body}" if user_personality else email_body,
+            response_format="json",
+        )
+
+        try:
+            extraction = SinglePassExtractionResult.model_validate(result)
+        except ValidationError as e:
+            print(f"Single-pass extraction failed validation: {str(e)}")
+            return None
+
+        tasks = []
+        for task in extraction.tasks:
+            utility_features = task.utility_features.model_dump()
+            utility_features["deadline_time"] = (
+                get_task_deadline(task.due_date) if task.due_date else 0
+            )
+            tasks.append(
+                {
+                    "title": task.title,
+                    "due_date": task.due_date,
+                    "priority": task.priority,
+                    "utility_features": utility_features,
+                    "cost_features": task.cost_features.model_dump(),
+                }
+            )
+        return tasks
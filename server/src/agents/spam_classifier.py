@@ -1,4 +1,5 @@
 from src.agents.base_agent import BaseAgent
+from src.exceptions.llm import LLMException
 from src.utils.file_utils import FileUtils
 from langfuse.decorators import observe
 
@@ -7,6 +8,8 @@ class SpamClassifier(BaseAgent):
     Agent to classify emails as Spam or Not Spam.
     """
 
+    cache_responses = True
+
     def __init__(self):
         """
         Initialize the SpamClassifier agent
@@ -60,6 +63,9 @@ class SpamClassifier(BaseAgent):
 
             return result
 
+        except LLMException:
+            # Let the caller retry later instead of treating the email as not spam
+            raise
         except Exception as e:
             import traceback
 
@@ -7,6 +7,8 @@ class CostFeaturesExtractor(BaseAgent):
     Agent to extract action items from emails.
     """
 
+    cache_responses = True
+
     @observe()
     def __init__(self):
         """
@@ -8,6 +8,8 @@ class TaskExtractor(BaseAgent):
     Agent to extract action items from emails.
     """
 
+    cache_responses = True
+
     def __init__(self):
         """
         Initialize the TaskExtractor agent
@@ -37,7 +39,7 @@ class TaskExtractor(BaseAgent):
             input_text = email_body
 
         return await self.execute(
-            self.system_prompt.replace("{{user_context}}", user_personality),
+            self.system_prompt.replace("{{user_context}}", user_personality or ""),
             input_text,
             response_format="json",
         )
@@ -0,0 +1,54 @@
+from src.tools.get_task_deadline import get_task_deadline
+from src.agents.base_agent import BaseAgent
+from src.utils.file_utils import FileUtils
+from langfuse.decorators import observe
+
+
+class TaskFeaturesExtractor(BaseAgent):
+    """
+    Agent to extract utility and cost features for a task in one request.
+    """
+
+    cache_responses = True
+
+    def __init__(self):
+        """
+        Initialize the TaskFeaturesExtractor agent
+        Load the system prompt during initialization
+        """
+        super().__init__()
+        self.system_prompt = FileUtils.read_file_content(
+            "src/prompts/v1/task_features_extractor.md"
+        )
+
+    @observe()
+    async def process(self, task_context: str, due_date: str = None):
+        """
+        Calls LLM to extract utility and cost features for a task.
+
+        The deadline utility is computed locally from the due date instead of
+        through a tool call, so the request is a single round-trip.
+
+        Args:
+            task_context: User personality, email content and the task
+            due_date: Optional task due date in YYYY-MM-DD format
+
+        Returns:
+            dict: {"utility_features": {...}, "cost_features": {...}}
+        """
+        result = await self.execute(
+            self.system_prompt, task_context, response_format="json"
+        )
+
+        utility_features = result.get("utility_features")
+        cost_features = result.get("cost_features")
+        if not isinstance(utility_features, dict):
+            utility_features = {}
+        if not isinstance(cost_features, dict):
+            cost_features = {}
+
+        utility_features["deadline_time"] = (
+            get_task_deadline(due_date) if due_date else 0
+        )
+
+        return {"utility_features": utility_features, "cost_features": cost_features}
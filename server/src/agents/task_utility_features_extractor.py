@@ -12,6 +12,8 @@ class UtilityFeaturesExtractor(BaseAgent):
     Agent to extract action items from emails.
     """
 
+    cache_responses = True
+
     def __init__(self):
         """
         Initialize the UtilityFeaturesExtractor agent
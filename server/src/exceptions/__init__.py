@@ -8,6 +8,7 @@ from src.exceptions.handlers import (
     generic_exception_handler,
 )
 from src.exceptions.database import DatabaseException, database_exception_handler
+from src.exceptions.llm import LLMException, LLMFatalError, LLMRetriesExhaustedError
 
 __all__ = [
     "http_exception_handler",
@@ -15,4 +16,7 @@ __all__ = [
     "generic_exception_handler",
     "DatabaseException",
     "database_exception_handler",
+    "LLMException",
+    "LLMFatalError",
+    "LLMRetriesExhaustedError",
 ]
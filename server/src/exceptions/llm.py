@@ -0,0 +1,28 @@
+"""
+LLM request exceptions
+"""
+
+from typing import Optional
+
+
+class LLMException(Exception):
+    """Base exception for LLM requests that could not be completed"""
+
+    def __init__(
+        self,
+        message: str,
+        attempts: int = 1,
+        last_error: Optional[BaseException] = None,
+    ):
+        self.message = message
+        self.attempts = attempts
+        self.last_error = last_error
+        super().__init__(self.message)
+
+
+class LLMFatalError(LLMException):
+    """The provider rejected the request in a way retrying cannot fix"""
+
+
+class LLMRetriesExhaustedError(LLMException):
+    """A retryable error persisted until the attempt limit or deadline"""
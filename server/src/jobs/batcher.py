@@ -0,0 +1,85 @@
+"""
+Keyed micro-batcher that coalesces concurrent work items into one call
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Groups items by key and hands each group to `process_batch` at once.
+
+    A key's batch is flushed when it holds `max_items` items or
+    `window_seconds` after its first item arrived, whichever comes first, so
+    batching adds at most one window of latency. Every `add` call waits for
+    the batch it joined and returns that item's result.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_items: int,
+        window_seconds: float,
+    ):
+        """
+        Args:
+            process_batch: Coroutine returning one result per item, in order
+            max_items: Flush a key's batch once it holds this many items
+            window_seconds: Flush a key's batch this long after its first item
+        """
+        self.process_batch = process_batch
+        self.max_items = max_items
+        self.window_seconds = window_seconds
+        self._batches: Dict[str, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._running: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def add(self, key: str, item: Any) -> Any:
+        """
+        Add an item to the key's batch and wait for its result
+
+        Args:
+            key: Batching key, e.g. a grant ID
+            item: The work item
+
+        Returns:
+            The result `process_batch` returned for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._batches.setdefault(key, [])
+        batch.append((item, future))
+
+        if len(batch) >= self.max_items:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window_seconds, self._flush, key)
+        return await future
+
+    def _flush(self, key: str) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._batches.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
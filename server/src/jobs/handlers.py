@@ -0,0 +1,70 @@
+"""
+Job handlers keyed by job kind
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.config import settings
+from src.jobs.batcher import MicroBatcher
+from src.jobs.queue import PermanentJobError
+
+WEBHOOK_JOB = "nylas.webhook"
+
+_agent_service = None
+_webhook_batcher = None
+
+
+def get_agent_service():
+    """Return the AgentService shared by all jobs, creating it on first use."""
+    global _agent_service
+    if _agent_service is None:
+        # Imported lazily so the web process can enqueue without building agents
+        from src.modules.agent.service import AgentService
+
+        _agent_service = AgentService()
+    return _agent_service
+
+
+def get_webhook_batcher() -> MicroBatcher:
+    """Return the batcher that coalesces webhook events per grant."""
+    global _webhook_batcher
+    if _webhook_batcher is None:
+        _webhook_batcher = MicroBatcher(
+            get_agent_service().handle_webhook_batch,
+            max_items=settings.WEBHOOK_BATCH_SIZE,
+            window_seconds=settings.WEBHOOK_BATCH_WINDOW_SECONDS,
+        )
+    return _webhook_batcher
+
+
+async def process_webhook(payload: Dict[str, Any]) -> Optional[bool]:
+    """
+    Process one Nylas webhook event
+
+    Events for the same grant that arrive within WEBHOOK_BATCH_WINDOW_SECONDS
+    are processed together; the job completes when its batch does.
+
+    Args:
+        payload: The webhook body as received from Nylas
+
+    Returns:
+        Optional[bool]: False if the event should be retried
+
+    Raises:
+        PermanentJobError: If a message.created event is missing its message ID
+            or body; redelivering the same payload cannot fix it
+    """
+    if payload.get("type") == "message.created":
+        message_data = payload.get("data", {}).get("object", {})
+        if not message_data.get("id") or not message_data.get("body"):
+            raise PermanentJobError("Webhook message ID or body not found")
+
+    if settings.WEBHOOK_BATCH_SIZE <= 1:
+        return await get_agent_service().handle_webhook_event(payload)
+
+    grant_id = payload.get("data", {}).get("object", {}).get("grant_id")
+    return await get_webhook_batcher().add(str(grant_id), payload)
+
+
+JOB_HANDLERS: Dict[str, Callable[[Any], Awaitable[Optional[bool]]]] = {
+    WEBHOOK_JOB: process_webhook,
+}
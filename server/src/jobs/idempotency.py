@@ -0,0 +1,120 @@
+"""
+Idempotency store that rejects duplicate webhook deliveries
+"""
+
+import datetime
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Set
+from tortoise import timezone
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+from src.config import settings
+from src.models.idempotency import IdempotencyKey
+
+
+def idempotency_key(namespace: str, *parts: Optional[str]) -> str:
+    """
+    Build a fixed-length key such as ("message", grant_id, message_id)
+
+    Hashing keeps grant IDs out of the table and bounds the key size.
+    """
+    raw = ":".join([namespace, *(str(part) for part in parts)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Claims keys exactly once across processes.
+
+    Keys this process claimed are kept in an in-process LRU, so a redelivery
+    seen by the same process is rejected without any I/O. Only committed
+    claims enter the LRU: a key another process owns may be released by it,
+    so a duplicate seen here is never cached. Other claims insert the
+    keys into idempotency_keys in one transaction; the primary key makes the
+    insert atomic, so two concurrent deliveries cannot both win. Keys older
+    than `ttl_seconds` are purged every `purge_every` claims.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.IDEMPOTENCY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.IDEMPOTENCY_TTL_SECONDS,
+        purge_every: int = 1000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = purge_every
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        # Keys of claims whose insert is still in flight in this process
+        self._in_flight: Set[str] = set()
+        self._claims = 0
+        self.duplicates = 0
+
+    async def claim(self, keys: List[str]) -> bool:
+        """
+        Claim all keys, or none of them if any was claimed before
+
+        Args:
+            keys: Keys from idempotency_key
+
+        Returns:
+            bool: True if this caller owns the keys, False for a duplicate
+
+        Raises:
+            Exception: If the store is unavailable; nothing is claimed
+        """
+        if any(key in self._recent or key in self._in_flight for key in keys):
+            self.duplicates += 1
+            return False
+
+        # Mark before awaiting so concurrent in-process deliveries lose here
+        self._in_flight.update(keys)
+        try:
+            async with in_transaction():
+                for key in keys:
+                    await IdempotencyKey.create(key=key)
+        except IntegrityError:
+            self.duplicates += 1
+            return False
+        finally:
+            self._in_flight.difference_update(keys)
+
+        for key in keys:
+            self._remember(key)
+
+        self._claims += 1
+        if self.purge_every and self._claims % self.purge_every == 0:
+            await self.purge_expired()
+        return True
+
+    async def release(self, keys: List[str]) -> None:
+        """
+        Give up claimed keys so a redelivery is processed again
+
+        Args:
+            keys: Keys previously claimed by this caller
+        """
+        self._forget(keys)
+        await IdempotencyKey.filter(key__in=keys).delete()
+
+    async def purge_expired(self) -> int:
+        """Delete persisted keys older than the TTL; returns the number deleted."""
+        if not self.ttl_seconds:
+            return 0
+        cutoff = timezone.now() - datetime.timedelta(seconds=self.ttl_seconds)
+        return await IdempotencyKey.filter(created_at__lt=cutoff).delete()
+
+    def _remember(self, key: str) -> None:
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_entries:
+            self._recent.popitem(last=False)
+
+    def _forget(self, keys: List[str]) -> None:
+        for key in keys:
+            self._recent.pop(key, None)
+
+
+# Create singleton instance
+webhook_dedup = IdempotencyStore()
@@ -0,0 +1,327 @@
+"""
+Pluggable job queue backends for background work such as webhook processing
+"""
+
+import asyncio
+import datetime
+import itertools
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, Optional
+from tortoise import connections, timezone
+from src.config import settings
+from src.models.job import JobRecord
+
+
+class Job:
+    """A unit of background work handed to a worker."""
+
+    def __init__(self, id: str, kind: str, payload: Any, attempts: int = 0):
+        self.id = id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"Job({self.id!r}, {self.kind!r}, attempts={self.attempts})"
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when its job can never succeed and must not be retried"""
+
+
+class JobQueue(ABC):
+    """
+    Base class for job queue backends.
+
+    A dequeued job must be acknowledged with `ack` once handled, or reported
+    with `fail`, which schedules a retry with exponential backoff until
+    `max_attempts` is reached. Subclasses implement `enqueue`, `dequeue`,
+    `_ack`, `_retry`, `_bury` and `pending`; counters live here.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        retry_base_delay: float = settings.JOB_RETRY_BASE_DELAY,
+        retry_max_delay: float = settings.JOB_RETRY_MAX_DELAY,
+    ):
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.enqueued = 0
+        self.completed = 0
+        self.retried = 0
+        self.dead = 0
+
+    @abstractmethod
+    async def enqueue(self, kind: str, payload: Any) -> str:
+        """
+        Add a job to the queue
+
+        Args:
+            kind: Handler name, e.g. "nylas.webhook"
+            payload: JSON-serializable job data
+
+        Returns:
+            str: The job ID
+        """
+
+    @abstractmethod
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        """
+        Claim the next runnable job
+
+        Args:
+            timeout: Seconds to wait for a job
+
+        Returns:
+            Optional[Job]: The claimed job, or None if none became available
+        """
+
+    @abstractmethod
+    async def pending(self) -> int:
+        """Number of jobs waiting to run."""
+
+    async def ack(self, job: Job) -> None:
+        """Mark a job as done."""
+        await self._ack(job)
+        self.completed += 1
+
+    async def fail(self, job: Job, error: BaseException, retry: bool = True) -> None:
+        """
+        Report a failed job, retrying it later if attempts remain
+
+        Args:
+            job: The job that failed
+            error: The error raised by the handler
+            retry: Whether the failure may succeed on another attempt
+        """
+        if retry and job.attempts < self.max_attempts:
+            delay = self.retry_delay(job.attempts)
+            print(
+                f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: "
+                f"{str(error)}, retrying in {delay:.0f}s"
+            )
+            await self._retry(job, error, delay)
+            self.retried += 1
+        else:
+            print(f"Job {job.id} ({job.kind}) failed permanently: {str(error)}")
+            await self._bury(job, error)
+            self.dead += 1
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff in seconds before the next attempt."""
+        return min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+
+    async def stats(self) -> Dict[str, int]:
+        """Return queue depth and job counters."""
+        return {
+            "pending": await self.pending(),
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
+
+    @abstractmethod
+    async def _ack(self, job: Job) -> None:
+        """Remove a handled job."""
+
+    @abstractmethod
+    async def _retry(self, job: Job, error: BaseException, delay: float) -> None:
+        """Make a failed job runnable again after `delay` seconds."""
+
+    @abstractmethod
+    async def _bury(self, job: Job, error: BaseException) -> None:
+        """Keep a permanently failed job out of the queue."""
+
+
+class MemoryJobQueue(JobQueue):
+    """
+    In-process asyncio queue.
+
+    Enqueueing never blocks, but jobs only live in this process: they are lost
+    on restart and can only be run by a worker in the same process.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._ids = itertools.count(1)
+        self._retry_handles = set()
+        # Recent permanently failed jobs, for debugging
+        self.dead_jobs: deque = deque(maxlen=100)
+
+    async def enqueue(self, kind: str, payload: Any) -> str:
+        job = Job(str(next(self._ids)), kind, payload)
+        self._queue.put_nowait(job)
+        self.enqueued += 1
+        return job.id
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        try:
+            job = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        job.attempts += 1
+        return job
+
+    async def pending(self) -> int:
+        return self._queue.qsize() + len(self._retry_handles)
+
+    async def _ack(self, job: Job) -> None:
+        pass
+
+    async def _retry(self, job: Job, error: BaseException, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+
+        def requeue():
+            self._retry_handles.discard(handle)
+            self._queue.put_nowait(job)
+
+        handle = loop.call_later(delay, requeue)
+        self._retry_handles.add(handle)
+
+    async def _bury(self, job: Job, error: BaseException) -> None:
+        self.dead_jobs.append((job, str(error)))
+
+
+class PostgresJobQueue(JobQueue):
+    """
+    Durable queue stored in the jobs table.
+
+    Workers claim rows with FOR UPDATE SKIP LOCKED, so several worker
+    processes can share the table. A job whose worker died is claimed again
+    once it has been running for longer than `visibility_timeout` seconds, or
+    moved to dead by a periodic sweep if it has no attempts left.
+    """
+
+    CLAIM_SQL = """
+        UPDATE "jobs"
+        SET "status" = 'running', "locked_at" = NOW(), "attempts" = "attempts" + 1
+        WHERE "id" = (
+            SELECT "id" FROM "jobs"
+            WHERE ("status" = 'pending' AND "run_after" <= NOW())
+               OR ("status" = 'running'
+                   AND "locked_at" < NOW() - make_interval(secs => $1)
+                   AND "attempts" < $2)
+            ORDER BY "run_after"
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING "id", "kind", "payload", "attempts"
+    """
+
+    SWEEP_SQL = """
+        UPDATE "jobs"
+        SET "status" = 'dead', "locked_at" = NULL,
+            "last_error" = 'Worker lost the job on its last attempt'
+        WHERE "status" = 'running'
+          AND "locked_at" < NOW() - make_interval(secs => $1)
+          AND "attempts" >= $2
+        RETURNING "id"
+    """
+
+    def __init__(
+        self,
+        visibility_timeout: float = settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+        sweep_interval: float = 60.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    async def enqueue(self, kind: str, payload: Any) -> str:
+        record = await JobRecord.create(kind=kind, payload=payload)
+        self.enqueued += 1
+        return str(record.id)
+
+    async def sweep(self) -> int:
+        """
+        Bury running jobs whose worker died on their last attempt
+
+        CLAIM_SQL never reclaims these, so without the sweep they would stay
+        running forever.
+
+        Returns:
+            int: Number of jobs moved to dead
+        """
+        rows = await connections.get("default").execute_query_dict(
+            self.SWEEP_SQL, [self.visibility_timeout, self.max_attempts]
+        )
+        for row in rows:
+            print(f"Job {row['id']} failed permanently: worker lost it")
+        self.dead += len(rows)
+        return len(rows)
+
+    async def dequeue(self, timeout: float) -> Optional[Job]:
+        if time.monotonic() >= self._next_sweep:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Error sweeping stuck jobs: {str(e)}")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            rows = await connections.get("default").execute_query_dict(
+                self.CLAIM_SQL, [self.visibility_timeout, self.max_attempts]
+            )
+            if rows:
+                row = rows[0]
+                payload = row["payload"]
+                if isinstance(payload, str):
+                    payload = json.loads(payload)
+                return Job(str(row["id"]), row["kind"], payload, row["attempts"])
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+    async def pending(self) -> int:
+        return await JobRecord.filter(status__in=["pending", "running"]).count()
+
+    async def _ack(self, job: Job) -> None:
+        await JobRecord.filter(id=job.id).delete()
+
+    async def _retry(self, job: Job, error: BaseException, delay: float) -> None:
+        await JobRecord.filter(id=job.id).update(
+            status="pending",
+            run_after=timezone.now() + datetime.timedelta(seconds=delay),
+            locked_at=None,
+            last_error=str(error),
+        )
+
+    async def _bury(self, job: Job, error: BaseException) -> None:
+        await JobRecord.filter(id=job.id).update(
+            status="dead", locked_at=None, last_error=str(error)
+        )
+
+
+def create_job_queue(backend: str = settings.JOB_QUEUE_BACKEND) -> JobQueue:
+    """
+    Create the configured job queue backend
+
+    Args:
+        backend: "memory" or "postgres"
+
+    Returns:
+        JobQueue: The queue
+    """
+    if backend == "postgres":
+        return PostgresJobQueue()
+    if backend != "memory":
+        print(f"WARNING: Unknown job queue backend '{backend}', using memory")
+    return MemoryJobQueue()
+
+
+# Create singleton instance
+job_queue = create_job_queue()
@@ -0,0 +1,135 @@
+"""
+Worker that runs queued jobs with bounded concurrency.
+
+Run a standalone worker (Postgres backend) from the server directory with:
+    python -m src.jobs.worker
+"""
+
+import asyncio
+import signal
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from src.config import settings
+from src.jobs.queue import Job, JobQueue, PermanentJobError
+
+
+class JobWorker:
+    """
+    Pulls jobs from a queue and runs up to `concurrency` of them at once.
+
+    A job is acknowledged when its handler returns anything but False. It is
+    retried when the handler returns False or raises. Jobs of an unknown kind,
+    and jobs whose handler raises PermanentJobError, fail permanently.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[Any], Awaitable[Any]]],
+        concurrency: int = settings.JOB_WORKER_CONCURRENCY,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self._running = False
+        self._runner: Optional[asyncio.Task] = None
+
+    async def run(self) -> None:
+        """Process jobs until stop is requested, then wait for running jobs."""
+        self._running = True
+        while self._running:
+            await self._slots.acquire()
+            try:
+                job = await self.queue.dequeue(timeout=self.poll_interval)
+            except Exception as e:
+                print(f"Error claiming job: {str(e)}")
+                job = None
+                await asyncio.sleep(self.poll_interval)
+            if job is None:
+                self._slots.release()
+                continue
+
+            task = asyncio.create_task(self._process(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def start(self) -> asyncio.Task:
+        """Run the worker in a background task of the current event loop."""
+        self._runner = asyncio.create_task(self.run())
+        return self._runner
+
+    def request_stop(self) -> None:
+        """Stop claiming new jobs; running jobs are allowed to finish."""
+        self._running = False
+
+    async def stop(self) -> None:
+        """Stop the worker started with `start` and wait for it to drain."""
+        self.request_stop()
+        if self._runner is not None:
+            await self._runner
+            self._runner = None
+
+    async def _process(self, job: Job) -> None:
+        try:
+            handler = self.handlers.get(job.kind)
+            if handler is None:
+                await self.queue.fail(
+                    job, ValueError(f"No handler for job kind '{job.kind}'"), False
+                )
+                return
+            try:
+                result = await handler(job.payload)
+            except PermanentJobError as e:
+                await self.queue.fail(job, e, False)
+                return
+            except Exception as e:
+                await self.queue.fail(job, e)
+                return
+            if result is False:
+                await self.queue.fail(job, RuntimeError("Handler reported failure"))
+            else:
+                await self.queue.ack(job)
+        except Exception as e:
+            print(f"Error finishing job {job.id}: {str(e)}")
+        finally:
+            self._slots.release()
+
+
+async def main() -> None:
+    """Run a standalone worker until SIGINT/SIGTERM."""
+    from neomodel import config as neo_config
+    from src.database import init_db, close_db
+    from src.jobs.handlers import JOB_HANDLERS
+    from src.jobs.queue import job_queue
+    from src.models.graph.repository import graph
+    from src.models.task_scoring import scoring_model
+
+    if settings.JOB_QUEUE_BACKEND != "postgres":
+        print("The memory job queue only runs inside the web process")
+        return
+
+    await init_db()
+    neo_config.DATABASE_URL = settings.NEO4J_URL
+
+    worker = JobWorker(job_queue, JOB_HANDLERS)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.request_stop)
+
+    print(f"Job worker started with concurrency {worker.concurrency}")
+    try:
+        await worker.run()
+    finally:
+        await scoring_model.feedback_buffer.flush_all()
+        await graph.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
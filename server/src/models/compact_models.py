@@ -0,0 +1,26 @@
+"""
+Rewrite per-user scoring models still stored as joblib pickles.
+
+Legacy rows are also converted lazily on a user's first model load; this
+converts the rest in one go. Run from the server directory with:
+    python -m src.models.compact_models
+"""
+
+import asyncio
+from src.models.user import UserModel
+
+
+async def main() -> None:
+    """Convert every legacy model row and print how many were rewritten."""
+    from src.database import init_db, close_db
+
+    await init_db()
+    try:
+        converted = await UserModel.migrate_legacy_models()
+        print(f"Converted models of {converted} users to the compact format")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""
+Fixed-schema vectorizer that turns LLM feature dictionaries into model inputs
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+
+def parse_dependency_count(value: str) -> float:
+    """Map a dependency count such as "2" to a cost value, capped at 0.5"""
+    if value == "none":
+        return 0.0
+    try:
+        return min(0.5, int(value) * 0.1)
+    except ValueError:
+        return 0.1
+
+
+class FeatureVectorizer:
+    """
+    Compiled feature encoder with a fixed column order.
+
+    The column order and the code -> float lookup tables are built once from the
+    feature mappings, so encoding a task is a dictionary walk that writes floats
+    straight into a preallocated NumPy row. Missing features encode as 0.0 and
+    unknown feature names are ignored, which keeps the width constant no matter
+    what the LLM returned or in which order.
+    """
+
+    def __init__(
+        self,
+        mappings: Dict[str, Dict[Any, float]],
+        extra_columns: Sequence[str] = (),
+        fallbacks: Optional[Dict[str, Callable[[str], float]]] = None,
+    ):
+        """
+        Args:
+            mappings: Feature name -> {categorical code: numerical value}
+            extra_columns: Numeric-only features appended after the mapped ones
+            fallbacks: Optional feature name -> parser used when a string code is
+                not found in the lookup table
+        """
+        fallbacks = fallbacks or {}
+        self.columns = tuple(mappings.keys()) + tuple(extra_columns)
+        self.width = len(self.columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+
+        self._tables: List[Dict[Any, float]] = []
+        self._fallbacks: List[Optional[Callable[[str], float]]] = []
+        for name in self.columns:
+            table = {}
+            for code, value in mappings.get(name, {}).items():
+                table[code] = float(value)
+                if isinstance(code, str):
+                    # Precompute the common casings so most lookups skip lower()
+                    for variant in (code.lower(), code.upper(), code.capitalize()):
+                        table[variant] = float(value)
+            self._tables.append(table)
+            self._fallbacks.append(fallbacks.get(name))
+
+    def _encode(self, column: int, value: Any) -> float:
+        if isinstance(value, (int, float)):
+            return float(value)
+        if not isinstance(value, str):
+            return 0.0
+
+        fallback = self._fallbacks[column]
+        if fallback is not None:
+            return fallback(value)
+
+        table = self._tables[column]
+        encoded = table.get(value)
+        if encoded is None:
+            encoded = table.get(value.strip().lower(), 0.0)
+        return encoded
+
+    def vectorize(
+        self, features: Optional[Dict[str, Any]], out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Encode one feature dictionary
+
+        Args:
+            features: Feature dictionary as returned by the feature extractors
+            out: Optional preallocated row of length `width` to write into
+
+        Returns:
+            np.ndarray: Row of length `width` in schema column order
+        """
+        if out is None:
+            out = np.zeros(self.width)
+        else:
+            out[:] = 0.0
+
+        if not features:
+            return out
+
+        index = self._index
+        for name, value in features.items():
+            column = index.get(name)
+            if column is not None:
+                out[column] = self._encode(column, value)
+        return out
+
+    def vectorize_many(self, features_list: Iterable[Dict[str, Any]]) -> np.ndarray:
+        """
+        Encode many feature dictionaries into one matrix
+
+        Args:
+            features_list: Feature dictionaries, one per task
+
+        Returns:
+            np.ndarray: (N, width) matrix in schema column order
+        """
+        features_list = list(features_list)
+        matrix = np.zeros((len(features_list), self.width))
+        for i, features in enumerate(features_list):
+            self.vectorize(features, out=matrix[i])
+        return matrix
@@ -0,0 +1,104 @@
+"""
+Per-user buffer that batches reorder feedback into mini-batch model updates
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+import numpy as np
+from src.config import settings
+
+Sample = Tuple[Tuple[np.ndarray, np.ndarray], Dict[str, float]]
+
+
+class FeedbackBuffer:
+    """
+    Collects (features, targets) samples per user and applies them in one batch.
+
+    A user's buffer is flushed when it reaches `max_samples` or when no new
+    sample has arrived for `flush_seconds` (debounce), so a burst of drags in
+    the UI turns into a single load / partial_fit / save cycle. `flush_all`
+    must be awaited on shutdown so buffered feedback is not lost.
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[List[Any], List[Dict[str, float]], str], Awaitable[Any]],
+        max_samples: int = settings.FEEDBACK_BATCH_SIZE,
+        flush_seconds: float = settings.FEEDBACK_FLUSH_SECONDS,
+    ):
+        """
+        Args:
+            apply_batch: Coroutine called with (features_list, targets, user_id)
+            max_samples: Flush a user's buffer once it holds this many samples
+            flush_seconds: Flush a user's buffer after this much idle time
+        """
+        self.apply_batch = apply_batch
+        self.max_samples = max_samples
+        self.flush_seconds = flush_seconds
+        self._samples: Dict[str, List[Sample]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def add(
+        self,
+        user_id: str,
+        features: Tuple[np.ndarray, np.ndarray],
+        targets: Dict[str, float],
+    ) -> None:
+        """
+        Buffer one feedback sample for a user
+
+        Args:
+            user_id: The ID of the user
+            features: Tuple of (utility_features, cost_features)
+            targets: Dictionary with 'utility' and 'cost' values
+        """
+        key = str(user_id)
+        samples = self._samples.setdefault(key, [])
+        samples.append((features, targets))
+
+        if len(samples) >= self.max_samples:
+            await self.flush(key)
+        else:
+            self._schedule(key)
+
+    def pending(self, user_id: str) -> int:
+        """Return the number of buffered samples for a user."""
+        return len(self._samples.get(str(user_id), []))
+
+    async def flush(self, user_id: str) -> None:
+        """Apply all buffered samples for a user in one mini-batch."""
+        key = str(user_id)
+        timer = self._timers.pop(key, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            samples = self._samples.pop(key, [])
+            if not samples:
+                return
+            try:
+                await self.apply_batch(
+                    [features for features, _ in samples],
+                    [targets for _, targets in samples],
+                    key,
+                )
+                print(f"Applied {len(samples)} feedback samples for user {key}")
+            except Exception as e:
+                print(f"Error applying feedback batch for user {key}: {str(e)}")
+
+    async def flush_all(self) -> None:
+        """Flush every user's buffer, e.g. on application shutdown."""
+        for key in list(self._samples.keys()):
+            await self.flush(key)
+
+    def _schedule(self, key: str) -> None:
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        self._timers[key] = asyncio.create_task(self._flush_later(key))
+
+    async def _flush_later(self, key: str) -> None:
+        await asyncio.sleep(self.flush_seconds)
+        await self.flush(key)
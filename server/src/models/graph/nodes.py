@@ -28,10 +28,10 @@ class EmailNode(StructuredNode):
     References email by its ID since actual email data is stored elsewhere.
     """
 
-    messageId = StringProperty(required=True)
+    messageId = StringProperty(unique_index=True, required=True)
     snippet = StringProperty(default=None)
     subject = StringProperty(default=None)
-    classification = StringProperty(default=None)
+    classification = StringProperty(index=True, default=None)
     tasks = RelationshipTo("TaskNode", "CONTAINS_TASK", cardinality=ZeroOrMore)
     user = RelationshipFrom("UserNode", "HAS_EMAIL", cardinality=OneOrMore)
 
@@ -0,0 +1,232 @@
+"""
+Graph schema installer: constraints, indexes and query plans.
+
+Declares the uniqueness constraints and indexes the task graph relies on,
+verifies they are online, and reports the plans of the hot queries so a
+label scan shows up before it shows up in latency.
+
+Run from the server directory with:
+    python -m src.models.graph.schema [--explain]
+"""
+
+import argparse
+import asyncio
+from typing import Any, Dict, List, Optional
+from src.models.graph.repository import (
+    CREATE_TASKS_QUERY,
+    EMAILS_BY_CLASSIFICATION_QUERY,
+    GET_TASK_QUERY,
+    MERGE_EMAIL_QUERY,
+    TASKS_BY_MESSAGE_QUERY,
+    GraphRepository,
+    graph,
+    task_page_query,
+)
+
+# (name, label, properties); names match the ones neomodel generates
+CONSTRAINTS = [
+    ("constraint_unique_UserNode_userid", "UserNode", ["userid"]),
+    ("constraint_unique_TaskNode_task_id", "TaskNode", ["task_id"]),
+    ("constraint_unique_EmailNode_messageId", "EmailNode", ["messageId"]),
+]
+
+INDEXES = [
+    ("index_EmailNode_classification", "EmailNode", ["classification"]),
+    (
+        "index_TaskNode_classification_relevance_score",
+        "TaskNode",
+        ["classification", "relevance_score"],
+    ),
+]
+
+# Sample parameters only need the right types; EXPLAIN does not run the query
+HOT_QUERIES = {
+    "get_task": (GET_TASK_QUERY, {"task_id": ""}),
+    "tasks_by_message": (TASKS_BY_MESSAGE_QUERY, {"message_id": ""}),
+    "task_page": (
+        task_page_query(classification=True, after=True, limit=True),
+        {
+            "user_id": "",
+            "classification": "",
+            "after_score": 0.0,
+            "after_id": "",
+            "limit": 50,
+        },
+    ),
+    "emails_by_classification": (
+        EMAILS_BY_CLASSIFICATION_QUERY,
+        {"user_id": "", "classification": ""},
+    ),
+    "merge_email": (MERGE_EMAIL_QUERY, {"user_id": "", "message_id": "", "props": {}}),
+    "create_tasks": (CREATE_TASKS_QUERY, {"user_id": "", "rows": []}),
+}
+
+SCAN_OPERATORS = ("AllNodesScan", "NodeByLabelScan")
+
+DUPLICATES_QUERY = """
+MATCH (n:{label})
+WHERE {present}
+WITH {keys} AS key, count(*) AS copies
+WHERE copies > 1
+RETURN key, copies
+LIMIT 10
+"""
+
+
+def _keys(properties: List[str]) -> str:
+    return ", ".join(f"n.{prop}" for prop in properties)
+
+
+def _present(properties: List[str]) -> str:
+    # Nodes missing a key are not covered by the constraint, so they never clash
+    return " AND ".join(f"n.{prop} IS NOT NULL" for prop in properties)
+
+
+def constraint_statement(name: str, label: str, properties: List[str]) -> str:
+    """Build an idempotent uniqueness constraint statement."""
+    keys = _keys(properties)
+    if len(properties) > 1:
+        keys = f"({keys})"
+    return (
+        f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+        f"FOR (n:{label}) REQUIRE {keys} IS UNIQUE"
+    )
+
+
+def index_statement(name: str, label: str, properties: List[str]) -> str:
+    """Build an idempotent range index statement."""
+    return (
+        f"CREATE INDEX {name} IF NOT EXISTS "
+        f"FOR (n:{label}) ON ({_keys(properties)})"
+    )
+
+
+def plan_operators(plan: Optional[Dict[str, Any]]) -> List[str]:
+    """Flatten a plan tree from the result summary into operator names."""
+    if not plan:
+        return []
+    operators = [plan.get("operatorType", "").split("@")[0]]
+    for child in plan.get("children", []):
+        operators.extend(plan_operators(child))
+    return operators
+
+
+async def install_schema(repository: GraphRepository = graph) -> Dict[str, Any]:
+    """
+    Create missing constraints and indexes and wait for them to come online
+
+    Constraints that already exist are left alone. Before creating a missing
+    uniqueness constraint, the label is checked for duplicate keys: the
+    constraint cannot be created while they exist, so in that case a plain
+    index on the same properties is created instead and the duplicates are
+    reported.
+
+    Args:
+        repository: The graph repository to install into
+
+    Returns:
+        Dict[str, Any]: Installed, fallen-back and offline schema names
+    """
+    report = {"installed": [], "fallback": {}, "offline": []}
+    existing = await repository.run("SHOW CONSTRAINTS YIELD name")
+    existing = {record["name"] for record in existing.records}
+
+    for name, label, properties in CONSTRAINTS:
+        if name in existing:
+            report["installed"].append(name)
+            continue
+        duplicates = await repository.run(
+            DUPLICATES_QUERY.format(
+                label=label,
+                present=_present(properties),
+                keys=f"[{_keys(properties)}]",
+            )
+        )
+        if duplicates.records:
+            report["fallback"][name] = [
+                (record["key"], record["copies"]) for record in duplicates.records
+            ]
+            fallback = name.replace("constraint_unique_", "index_")
+            await repository.run(
+                index_statement(fallback, label, properties), write=True
+            )
+            report["installed"].append(fallback)
+            continue
+        await repository.run(constraint_statement(name, label, properties), write=True)
+        report["installed"].append(name)
+
+    for name, label, properties in INDEXES:
+        await repository.run(index_statement(name, label, properties), write=True)
+        report["installed"].append(name)
+
+    await repository.run("CALL db.awaitIndexes(300)")
+    indexes = await repository.run("SHOW INDEXES YIELD name, state")
+    states = {record["name"]: record["state"] for record in indexes.records}
+    # Uniqueness constraints are backed by an index of the same name
+    report["offline"] = [
+        name for name in report["installed"] if states.get(name) != "ONLINE"
+    ]
+    return report
+
+
+async def explain_queries(
+    repository: GraphRepository = graph,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Report the plan of every hot query
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per query, its plan operators and whether
+            it scans a whole label instead of seeking an index
+    """
+    plans = {}
+    for name, (query, params) in HOT_QUERIES.items():
+        result = await repository.run(f"EXPLAIN {query}", **params)
+        operators = plan_operators(result.summary.plan)
+        plans[name] = {
+            "operators": operators,
+            "scans": [op for op in operators if op in SCAN_OPERATORS],
+        }
+    return plans
+
+
+async def ensure_schema(repository: GraphRepository = graph) -> bool:
+    """
+    Install the schema and print the report; used on startup
+
+    Returns:
+        bool: True if every constraint and index is online
+    """
+    try:
+        report = await install_schema(repository)
+    except Exception as e:
+        print(f"Error installing graph schema: {str(e)}")
+        return False
+
+    for name in report["installed"]:
+        state = "OFFLINE" if name in report["offline"] else "ONLINE"
+        print(f"Graph schema {state:<8} {name}")
+    for name, duplicates in report["fallback"].items():
+        print(f"Graph schema skipped {name}: duplicate keys {duplicates}")
+    return not report["offline"] and not report["fallback"]
+
+
+async def main(explain: bool) -> None:
+    """Install the schema, print the report and optionally the query plans."""
+    try:
+        await ensure_schema()
+        if explain:
+            for name, plan in (await explain_queries()).items():
+                flag = f"  SCANS {', '.join(plan['scans'])}" if plan["scans"] else ""
+                print(f"{name:<26} {' <- '.join(plan['operators'])}{flag}")
+    finally:
+        await graph.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--explain", action="store_true", help="Report plans of the hot queries"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.explain))
@@ -0,0 +1,19 @@
+from tortoise import fields, models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Claimed idempotency key (SHA-256 of a webhook event or message ID).
+
+    The primary key makes a claim an atomic insert: of two concurrent
+    deliveries only one insert succeeds.
+    """
+
+    key = fields.CharField(max_length=64, pk=True)
+    created_at = fields.DatetimeField(auto_now_add=True, index=True)
+
+    class Meta:
+        table = "idempotency_keys"
+
+    def __str__(self):
+        return f"Idempotency key {self.key[:8]}"
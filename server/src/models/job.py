@@ -0,0 +1,30 @@
+from tortoise import fields, models, timezone
+import uuid
+
+
+class JobRecord(models.Model):
+    """
+    Background job persisted by the Postgres job queue.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+    workers can poll the table without handing the same job to two of them.
+    Acknowledged jobs are deleted; jobs that ran out of attempts stay with
+    status "dead" for inspection.
+    """
+
+    id = fields.UUIDField(pk=True, default=uuid.uuid4)
+    kind = fields.CharField(max_length=100)
+    payload = fields.JSONField()
+    status = fields.CharField(max_length=16, default="pending")
+    attempts = fields.IntField(default=0)
+    run_after = fields.DatetimeField(default=timezone.now)
+    locked_at = fields.DatetimeField(null=True)
+    last_error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "jobs"
+        indexes = (("status", "run_after"),)
+
+    def __str__(self):
+        return f"Job {self.id} ({self.kind}, {self.status})"
@@ -0,0 +1,204 @@
+"""
+Compact linear regressor used for per-user task scoring models
+"""
+
+import struct
+from typing import Any, Sequence
+import numpy as np
+
+# Header: magic, format version, dtype code, learning rate code, padding,
+# n_features, intercept, t, eta0, power_t, l2 strength
+_HEADER = struct.Struct("<4sBBBxIddddd")
+_MAGIC = b"GLRM"
+_VERSION = 1
+
+_DTYPES = {0: np.dtype("<f8"), 1: np.dtype("<f4")}
+_DTYPE_CODES = {dtype: code for code, dtype in _DTYPES.items()}
+
+_LEARNING_RATES = {"constant": 0, "invscaling": 1, "adaptive": 2}
+_LEARNING_RATE_NAMES = {code: name for name, code in _LEARNING_RATES.items()}
+
+# Same clipping sklearn applies to the loss gradient
+_MAX_DLOSS = 1e12
+
+
+class LinearRegressor:
+    """
+    Pure-NumPy squared-loss linear model with SGD updates.
+
+    Mirrors the parts of sklearn's SGDRegressor the scoring pipeline uses
+    (`predict` and `partial_fit` with an L2 penalty and constant, adaptive or
+    invscaling learning rates) and serializes to a small versioned binary blob
+    instead of a pickle.
+    """
+
+    def __init__(
+        self,
+        coef: Sequence[float],
+        intercept: float = 0.0,
+        t: float = 1.0,
+        eta0: float = 0.01,
+        power_t: float = 0.25,
+        l2: float = 0.0,
+        learning_rate: str = "adaptive",
+    ):
+        if learning_rate not in _LEARNING_RATES:
+            raise ValueError(f"Unsupported learning rate: {learning_rate}")
+
+        self.coef_ = np.array(coef, dtype=np.float64).reshape(-1)
+        self.intercept_ = np.array([float(intercept)])
+        self.t_ = float(t)
+        self.eta0 = float(eta0)
+        self.power_t = float(power_t)
+        self.l2 = float(l2)
+        self.learning_rate = learning_rate
+
+    @property
+    def n_features_in_(self) -> int:
+        return self.coef_.shape[0]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict scores for an (N, n_features) matrix"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but LinearRegressor is expecting {self.n_features_in_} features as input."
+            )
+        return X @ self.coef_ + self.intercept_[0]
+
+    def partial_fit(self, X: np.ndarray, y: Sequence[float]) -> "LinearRegressor":
+        """
+        Run one SGD pass over the samples, in order
+
+        Args:
+            X: (N, n_features) feature matrix
+            y: N target values
+
+        Returns:
+            LinearRegressor: self
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        y = np.asarray(y, dtype=np.float64).reshape(-1)
+        if X.shape[0] != y.shape[0]:
+            raise ValueError("X and y must have the same number of samples")
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but LinearRegressor is expecting {self.n_features_in_} features as input."
+            )
+
+        coef = self.coef_
+        intercept = self.intercept_[0]
+        for x, target in zip(X, y):
+            if self.learning_rate == "invscaling":
+                eta = self.eta0 / pow(self.t_, self.power_t)
+            else:
+                eta = self.eta0
+
+            prediction = coef @ x + intercept
+            dloss = min(max(prediction - target, -_MAX_DLOSS), _MAX_DLOSS)
+            update = -eta * dloss
+
+            if self.l2:
+                coef *= max(0.0, 1.0 - eta * self.l2)
+            coef += update * x
+            intercept += update
+            self.t_ += 1.0
+
+        self.intercept_[0] = intercept
+        return self
+
+    def to_bytes(self, dtype: Any = np.float64) -> bytes:
+        """Serialize to the compact binary format"""
+        dtype = np.dtype(dtype).newbyteorder("<")
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            _DTYPE_CODES[dtype],
+            _LEARNING_RATES[self.learning_rate],
+            self.n_features_in_,
+            self.intercept_[0],
+            self.t_,
+            self.eta0,
+            self.power_t,
+            self.l2,
+        )
+        return header + self.coef_.astype(dtype).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LinearRegressor":
+        """Deserialize from the compact binary format"""
+        if not cls.is_compact(data):
+            raise ValueError("Not a compact linear model blob")
+
+        (
+            _,
+            version,
+            dtype_code,
+            learning_rate_code,
+            n_features,
+            intercept,
+            t,
+            eta0,
+            power_t,
+            l2,
+        ) = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported linear model format version: {version}")
+
+        coef = np.frombuffer(
+            data, dtype=_DTYPES[dtype_code], count=n_features, offset=_HEADER.size
+        )
+        return cls(
+            coef,
+            intercept=intercept,
+            t=t,
+            eta0=eta0,
+            power_t=power_t,
+            l2=l2,
+            learning_rate=_LEARNING_RATE_NAMES[learning_rate_code],
+        )
+
+    @staticmethod
+    def is_compact(data: bytes) -> bool:
+        """Check whether a blob is in the compact format (as opposed to a pickle)"""
+        return bool(data) and bytes(data[:4]) == _MAGIC
+
+    @classmethod
+    def from_sklearn(cls, model) -> "LinearRegressor":
+        """
+        Convert a fitted sklearn SGDRegressor
+
+        Args:
+            model: Fitted SGDRegressor with squared_error loss
+
+        Returns:
+            LinearRegressor: Model with the same coefficients and optimizer state
+        """
+        if isinstance(model, cls):
+            return model
+        if model.loss != "squared_error":
+            raise ValueError(f"Unsupported loss: {model.loss}")
+        if model.penalty in ("l1", "elasticnet") and model.l1_ratio:
+            print(f"WARNING: Dropping L1 part of {model.penalty} penalty on conversion")
+
+        # sklearn scales the weights by (1 - eta * alpha) for L2 and by
+        # (1 - (1 - l1_ratio) * eta * alpha) for elasticnet
+        l2 = 0.0
+        if model.penalty == "l2":
+            l2 = model.alpha
+        elif model.penalty == "elasticnet":
+            l2 = (1.0 - model.l1_ratio) * model.alpha
+
+        return cls(
+            model.coef_,
+            intercept=float(np.ravel(model.intercept_)[0]),
+            t=getattr(model, "t_", 1.0),
+            eta0=model.eta0,
+            power_t=model.power_t,
+            l2=l2,
+            learning_rate=model.learning_rate,
+        )
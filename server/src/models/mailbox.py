@@ -0,0 +1,138 @@
+from tortoise import fields, models
+import uuid
+from typing import Any, Dict, List, Optional
+from src.utils.encryption import encryption
+
+
+def grant_sync_key(grant_id: str) -> str:
+    """
+    Key sync rows by the blind index (keyed HMAC) of the grant ID.
+
+    Grant IDs are stored encrypted on the user, so the sync tables never hold
+    them in plain text, and without the index key the keys cannot be matched
+    against guessed grant IDs.
+    """
+    return encryption.blind_index(grant_id)
+
+
+class MailboxSyncState(models.Model):
+    """
+    Per-grant mailbox sync progress.
+
+    Messages received in [synced_from, synced_until] have been copied into
+    synced_messages; the next sync only asks Nylas for messages received after
+    synced_until (the high-water mark) and, for backfills, before synced_from.
+    """
+
+    id = fields.IntField(pk=True)
+    grant_key = fields.CharField(max_length=64, unique=True)
+    synced_from = fields.BigIntField(description="Oldest covered received_at")
+    synced_until = fields.BigIntField(description="High-water mark (received_at)")
+    last_synced_at = fields.BigIntField(description="Unix time of the last sync")
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "mailbox_sync_state"
+
+    def __str__(self):
+        return (
+            f"Sync state {self.grant_key[:8]} ({self.synced_from}-{self.synced_until})"
+        )
+
+
+class SyncedMessage(models.Model):
+    """
+    Local copy of a message pulled by the mailbox sync.
+
+    Messages received more than NYLAS_SYNC_RETENTION_DAYS ago are purged by
+    the sync, so the store only holds the window onboarding reads.
+    """
+
+    id = fields.UUIDField(pk=True, default=uuid.uuid4)
+    grant_key = fields.CharField(max_length=64)
+    message_id = fields.CharField(max_length=255)
+    received_at = fields.BigIntField()
+    folders = fields.JSONField(default=list)
+    data = fields.JSONField(description="Message fields as returned by Nylas")
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "synced_messages"
+        unique_together = (("grant_key", "message_id"),)
+        indexes = (("grant_key", "received_at"),)
+
+    def __str__(self):
+        return f"Synced message {self.message_id}"
+
+    @classmethod
+    async def store_page(cls, grant_key: str, messages: List[Dict[str, Any]]) -> None:
+        """
+        Insert a page of messages, skipping ones that were already synced
+
+        Args:
+            grant_key: Sync key of the grant the messages belong to
+            messages: Message dicts as returned by Nylas
+        """
+        rows = [
+            cls(
+                grant_key=grant_key,
+                message_id=message["id"],
+                received_at=int(message.get("date") or 0),
+                folders=message.get("folders") or [],
+                data=message,
+            )
+            for message in messages
+            if message.get("id")
+        ]
+        if rows:
+            await cls.bulk_create(rows, ignore_conflicts=True)
+
+    @classmethod
+    async def purge_before(cls, grant_key: str, cutoff: int) -> int:
+        """
+        Delete a grant's messages received before `cutoff`
+
+        Args:
+            grant_key: Sync key of the grant
+            cutoff: Unix timestamp; older messages are deleted
+
+        Returns:
+            int: Number of messages deleted
+        """
+        return await cls.filter(grant_key=grant_key, received_at__lt=cutoff).delete()
+
+    @classmethod
+    async def get_recent(
+        cls,
+        grant_key: str,
+        since: int,
+        folder_ids: Optional[List[str]] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get synced messages received after `since`, newest first
+
+        Args:
+            grant_key: Sync key of the grant
+            since: Unix timestamp lower bound on received_at
+            folder_ids: Only return messages in at least one of these folders
+            limit: Maximum number of messages to return
+
+        Returns:
+            List[Dict[str, Any]]: Message dicts as returned by Nylas
+        """
+        rows = (
+            await cls.filter(grant_key=grant_key, received_at__gte=since)
+            .order_by("-received_at")
+            .values("folders", "data")
+        )
+        wanted = set(folder_ids or [])
+        messages = []
+        for row in rows:
+            if wanted and not wanted.intersection(row["folders"] or []):
+                continue
+            messages.append(row["data"])
+            if len(messages) >= limit:
+                break
+        return messages
@@ -0,0 +1,58 @@
+"""
+In-process LRU cache of deserialized per-user scoring models
+"""
+
+from typing import Any, Optional, Tuple
+from src.config import settings
+from src.utils.lru_cache import BoundedLRUCache
+
+
+class UserModelCache(BoundedLRUCache):
+    """
+    Bounded LRU cache of (utility_model, cost_model) pairs keyed by user id.
+
+    The byte size of an entry is the size of its serialized blobs, which is a
+    good proxy for the in-memory footprint of a linear model. Entries expire
+    after a TTL so that workers which did not perform a write eventually pick
+    up models saved by another process.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.MODEL_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.MODEL_CACHE_MAX_BYTES,
+        ttl_seconds: float = settings.MODEL_CACHE_TTL_SECONDS,
+    ):
+        super().__init__(max_entries, max_bytes, ttl_seconds)
+
+    def get(self, user_id: str) -> Optional[Tuple[Any, Any]]:
+        """
+        Get the cached models for a user
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Optional[Tuple]: (utility_model, cost_model) if cached and fresh, None otherwise
+        """
+        return self._lookup(str(user_id))
+
+    def put(self, user_id: str, utility_model, cost_model, nbytes: int = 0) -> None:
+        """
+        Store models for a user, evicting least recently used entries if needed
+
+        Args:
+            user_id: The ID of the user
+            utility_model: Deserialized utility model
+            cost_model: Deserialized cost model
+            nbytes: Approximate size of the entry in bytes
+        """
+        self._store(str(user_id), (utility_model, cost_model), nbytes)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the cached models for a user, if any."""
+        self._discard(str(user_id))
+
+
+# Create singleton instance
+model_cache = UserModelCache()
@@ -0,0 +1,239 @@
+from datetime import datetime
+from tortoise import fields, models, timezone
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+from typing import Any, Dict, List, Optional, Tuple
+
+# Task fields copied into the ranking, keyed as in TaskResponse
+RANKED_FIELDS = {
+    "task_id": "task_id",
+    "task": "task",
+    "deadline": "deadline",
+    "priority": "priority",
+    "relevance_score": "relevance_score",
+    "utility_score": "utility_score",
+    "cost_score": "cost_score",
+    "classification": "classification",
+    "messageId": "message_id",
+    "createdAt": "task_created_at",
+    "updatedAt": "task_updated_at",
+}
+
+
+class TaskRanking(models.Model):
+    """
+    Denormalised copy of a user's tasks, ordered for the dashboard.
+
+    Rows are kept in step with the graph by TaskService and FeedbackService,
+    so a prioritised task list is one range read on
+    (user_id, [classification,] relevance_score DESC, task_id) instead of a
+    user->email->task traversal and sort.
+    """
+
+    id = fields.IntField(pk=True)
+    user_id = fields.CharField(max_length=64)
+    task_id = fields.CharField(max_length=64)
+    message_id = fields.CharField(max_length=255, null=True)
+    task = fields.TextField()
+    deadline = fields.CharField(max_length=255, null=True)
+    priority = fields.CharField(max_length=32, null=True)
+    classification = fields.CharField(max_length=64, null=True)
+    relevance_score = fields.FloatField(default=0.0)
+    utility_score = fields.FloatField(null=True)
+    cost_score = fields.FloatField(null=True)
+    task_created_at = fields.DatetimeField(null=True)
+    task_updated_at = fields.DatetimeField(null=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "task_rankings"
+        unique_together = (("user_id", "task_id"),)
+        indexes = (
+            ("user_id", "relevance_score", "task_id"),
+            ("user_id", "classification", "relevance_score", "task_id"),
+            ("task_id",),
+        )
+
+    def __str__(self):
+        return f"Ranking of task {self.task_id} ({self.relevance_score})"
+
+    @staticmethod
+    def _columns(task: Dict[str, Any]) -> Dict[str, Any]:
+        columns = {
+            column: task[field]
+            for field, column in RANKED_FIELDS.items()
+            if field in task
+        }
+        if "relevance_score" in columns:
+            # Match the graph ordering, which treats a missing score as 0.0
+            columns["relevance_score"] = columns["relevance_score"] or 0.0
+        return columns
+
+    @classmethod
+    async def upsert_tasks(cls, user_id: str, tasks: List[Dict[str, Any]]) -> None:
+        """
+        Insert or refresh the ranking rows of a user's tasks
+
+        Args:
+            user_id: The ID of the user
+            tasks: Tasks with TaskResponse fields and messageId
+        """
+        rows = [cls(user_id=str(user_id), **cls._columns(task)) for task in tasks]
+        if rows:
+            await cls.bulk_create(
+                rows,
+                on_conflict=["user_id", "task_id"],
+                update_fields=[c for c in RANKED_FIELDS.values() if c != "task_id"]
+                + ["updated_at"],
+            )
+
+    @classmethod
+    async def update_task(cls, task_id: str, changes: Dict[str, Any]) -> int:
+        """
+        Apply changed task fields to every ranking row of the task
+
+        Args:
+            task_id: The ID of the task
+            changes: Changed fields, keyed as in TaskResponse
+
+        Returns:
+            int: Number of rows updated
+        """
+        columns = cls._columns(changes)
+        columns.pop("task_id", None)
+        if not columns:
+            return 0
+        return await cls.filter(task_id=task_id).update(
+            **columns, updated_at=timezone.now()
+        )
+
+    @classmethod
+    async def remove_task(cls, task_id: str) -> int:
+        """Remove a task from every ranking; returns the number of rows deleted."""
+        return await cls.filter(task_id=task_id).delete()
+
+    @classmethod
+    async def users_of_task(cls, task_id: str) -> List[str]:
+        """Return the IDs of the users whose ranking holds the task."""
+        return await cls.filter(task_id=task_id).values_list("user_id", flat=True)
+
+    @classmethod
+    async def get_page(
+        cls,
+        user_id: str,
+        limit: Optional[int] = None,
+        classification: Optional[str] = None,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of a user's tasks, most relevant first
+
+        Same ordering and keyset semantics as GraphRepository.get_task_page.
+
+        Args:
+            user_id: The ID of the user
+            limit: Maximum number of tasks; None returns all of them
+            classification: Only return tasks with this classification
+            after: (relevance_score, task_id) of the last task already seen
+
+        Returns:
+            List[Dict[str, Any]]: Tasks with TaskResponse fields and messageId
+        """
+        query = cls.filter(user_id=str(user_id))
+        if classification is not None:
+            query = query.filter(classification=classification)
+        if after is not None:
+            score, task_id = after
+            query = query.filter(
+                Q(relevance_score__lt=score)
+                | Q(relevance_score=score, task_id__gt=task_id)
+            )
+        query = query.order_by("-relevance_score", "task_id")
+        if limit is not None:
+            query = query.limit(limit)
+        rows = await query.values(*RANKED_FIELDS.values())
+        return [
+            {field: row[column] for field, column in RANKED_FIELDS.items()}
+            for row in rows
+        ]
+
+    @classmethod
+    async def merge_user(
+        cls, user_id: str, tasks: List[Dict[str, Any]], read_at: datetime
+    ) -> None:
+        """
+        Merge tasks read from the graph into a user's ranking
+
+        Rows written after `read_at` came from task writes that raced the
+        graph read and are newer than it, so they are kept as they are. Older
+        rows are refreshed from the graph, or dropped when the graph no longer
+        has the task.
+
+        Args:
+            user_id: The ID of the user
+            tasks: All of the user's tasks with TaskResponse fields and messageId
+            read_at: When the graph read started
+        """
+        user_id = str(user_id)
+        async with in_transaction() as connection:
+            written = await (
+                cls.filter(user_id=user_id)
+                .using_db(connection)
+                .values_list("task_id", "updated_at")
+            )
+            fresh = {task_id for task_id, updated in written if updated >= read_at}
+            graph_ids = {task["task_id"] for task in tasks}
+            stale = [
+                task_id
+                for task_id, _ in written
+                if task_id not in fresh and task_id not in graph_ids
+            ]
+            for start in range(0, len(stale), 1000):
+                await cls.filter(
+                    user_id=user_id, task_id__in=stale[start : start + 1000]
+                ).using_db(connection).delete()
+            rows = [
+                cls(user_id=user_id, **cls._columns(task))
+                for task in tasks
+                if task["task_id"] not in fresh
+            ]
+            if rows:
+                await cls.bulk_create(
+                    rows,
+                    batch_size=1000,
+                    on_conflict=["user_id", "task_id"],
+                    update_fields=[c for c in RANKED_FIELDS.values() if c != "task_id"]
+                    + ["updated_at"],
+                    using_db=connection,
+                )
+            await TaskRankingState.update_or_create(
+                user_id=user_id, using_db=connection
+            )
+
+
+class TaskRankingState(models.Model):
+    """
+    Users whose ranking has been built from the graph.
+
+    Rankings are built lazily on a user's first read; until then the user's
+    rows may be partial (only tasks written since the ranking was deployed).
+    """
+
+    user_id = fields.CharField(max_length=64, pk=True)
+    built_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "task_ranking_state"
+
+    def __str__(self):
+        return f"Ranking of user {self.user_id} built at {self.built_at}"
+
+    @classmethod
+    async def is_built(cls, user_id: str) -> bool:
+        """Check whether the user's ranking has been built."""
+        return await cls.exists(user_id=str(user_id))
+
+    @classmethod
+    async def invalidate(cls, user_ids: List[str]) -> int:
+        """Mark rankings as unbuilt so the next read rebuilds them."""
+        return await cls.filter(user_id__in=[str(u) for u in user_ids]).delete()
@@ -1,5 +1,5 @@
 """
-Task scoring model using SGDRegressor for continuous learning
+Task scoring model using per-user linear models for continuous learning
 """
 
 from sklearn.linear_model import SGDRegressor
@@ -7,6 +7,10 @@ import numpy as np
 from datetime import datetime
 from typing import Dict, Any, Tuple, Optional, List
 from src.models.user import UserModel
+from src.models.model_cache import model_cache
+from src.models.linear_model import LinearRegressor
+from src.models.feedback_buffer import FeedbackBuffer
+from src.models.feature_vectorizer import FeatureVectorizer, parse_dependency_count
 from src.modules.tasks.service import TaskService
 from pathlib import Path
 import joblib
@@ -52,62 +56,41 @@ class TaskScoringModel:
             "interruptibility": {"high": 1.0, "low": 0.0},
         }
 
+        # Fixed column order: mapped features first, then the numeric feature the
+        # extractor returns on top of them; the widths are the models' input sizes
+        self.utility_vectorizer = FeatureVectorizer(
+            self.utility_mappings, extra_columns=("deadline_time",)
+        )
+        self.cost_vectorizer = FeatureVectorizer(
+            self.cost_mappings,
+            extra_columns=("time_required",),
+            fallbacks={"location_dependencies": parse_dependency_count},
+        )
+
+        # Reorder feedback is buffered per user and applied in mini-batches
+        self.feedback_buffer = FeedbackBuffer(self.partial_fit_batch)
+
     def _encode_priority(self, priority: str) -> float:
         """Convert priority string to numerical value"""
         priority_map = {"low": 0.0, "medium": 0.5, "high": 1.0}
         return priority_map.get(priority.lower(), 0.5)
 
-    def _get_feature_value(self, feature: str, value: str, mappings: Dict) -> float:
-        """Get numerical value for a feature using appropriate mapping"""
-        if feature == "location_dependencies":
-            if value == "none":
-                return 0.0
-            try:
-                count = int(value)
-                return min(0.5, count * 0.1)  # Cap at 0.5
-            except ValueError:
-                return 0.1
-        elif feature in mappings and value.lower() in mappings[feature]:
-            return mappings[feature][value.lower()]
-        return 0.0
-
-    def _convert_features_to_array(self, features: Dict, mappings: Dict) -> np.ndarray:
-        """Convert feature dictionary to numerical array"""
-        feature_values = []
-        for feature, value in features.items():
-            if isinstance(value, (int, float)):
-                feature_values.append(float(value))
-            elif isinstance(value, str):
-                feature_values.append(self._get_feature_value(feature, value, mappings))
-        return np.array(feature_values)
-
     def extract_features(
         self, task_data: Dict[str, Any]
     ) -> Tuple[np.ndarray, np.ndarray]:
         """Convert task data into separate utility and cost feature arrays"""
-        # Extract common features
-        # priority = self._encode_priority(task_data.get('priority', 'medium'))
-        # deadline = self._get_days_to_deadline(task_data.get('deadline'))
-
-        # Convert utility features to array
-        utility_features = self._convert_features_to_array(
-            task_data.get("utility_features", {}), self.utility_mappings
-        )
-        # Reshape to 2D array for model input
-        utility_features = utility_features.reshape(1, -1)
-
-        # Convert cost features to array
-        cost_features = self._convert_features_to_array(
-            task_data.get("cost_features", {}), self.cost_mappings
-        )
-        # Reshape to 2D array for model input
-        cost_features = cost_features.reshape(1, -1)
+        utility_features = self.utility_vectorizer.vectorize(
+            task_data.get("utility_features", {})
+        ).reshape(1, -1)
+        cost_features = self.cost_vectorizer.vectorize(
+            task_data.get("cost_features", {})
+        ).reshape(1, -1)
 
         return utility_features, cost_features
 
     async def load_user_models(self, user_id: str) -> bool:
         """
-        Load user-specific models from the database
+        Load user-specific models, serving them from the in-process cache when possible
 
         Args:
             user_id: The ID of the user
@@ -115,11 +98,25 @@ class TaskScoringModel:
         Returns:
             bool: True if models were loaded successfully, False otherwise
         """
+        cached = model_cache.get(user_id)
+        if cached:
+            return cached
+
         try:
             user_model = await UserModel.get_or_create(user_id)
             if user_model:
                 utility_model = await user_model.get_utility_model()
                 cost_model = await user_model.get_cost_model()
+                if user_model.has_legacy_models():
+                    # Lazily migrate pickled SGDRegressors to the compact format
+                    await user_model.set_models(utility_model, cost_model)
+                model_cache.put(
+                    user_id,
+                    utility_model,
+                    cost_model,
+                    nbytes=len(user_model.utility_model or b"")
+                    + len(user_model.cost_model or b""),
+                )
                 return utility_model, cost_model
             else:
                 print(f"No models found for user {user_id}, using default models")
@@ -144,9 +141,19 @@ class TaskScoringModel:
 
             # Set the models on the instance
             await user_model.set_models(utility_model, cost_model)
+
+            # Write through so the next scoring call skips the DB round-trip
+            model_cache.put(
+                user_id,
+                utility_model,
+                cost_model,
+                nbytes=len(user_model.utility_model) + len(user_model.cost_model),
+            )
             return True
         except Exception as e:
             print(f"Error saving models for user {user_id}: {str(e)}")
+            # The cached models may have been mutated by partial_fit
+            model_cache.invalidate(user_id)
             return False
 
     async def create_initial_models(self, user_id: str) -> bool:
@@ -169,8 +176,12 @@ class TaskScoringModel:
             # Try to load pre-trained models
             if utility_model_path.exists() and cost_model_path.exists():
                 try:
-                    utility_model = joblib.load(utility_model_path)
-                    cost_model = joblib.load(cost_model_path)
+                    utility_model = LinearRegressor.from_sklearn(
+                        joblib.load(utility_model_path)
+                    )
+                    cost_model = LinearRegressor.from_sklearn(
+                        joblib.load(cost_model_path)
+                    )
                 except Exception as e:
                     print(f"Error loading pre-trained models: {str(e)}")
                     # Fall back to creating default models
@@ -199,7 +210,7 @@ class TaskScoringModel:
         Create default untrained models when pre-trained models aren't available
 
         Returns:
-            Tuple[SGDRegressor, SGDRegressor]: Default utility and cost models
+            Tuple[LinearRegressor, LinearRegressor]: Default utility and cost models
         """
         # Initialize default models
         utility_model = SGDRegressor(
@@ -210,18 +221,17 @@ class TaskScoringModel:
             loss="squared_error", penalty="l2", alpha=0.001, learning_rate="adaptive"
         )
 
-        n_utility_features = 12  # 11 from utility_mappings + priority + deadline
-        n_cost_features = 6  # 5 from cost_mappings + priority + deadline
-        X_utility = np.full(
-            (1, n_utility_features), 0.5
-        )  # Match expected utility features
-        X_cost = np.full((1, n_cost_features), 0.5)  # Match expected cost features
+        X_utility = np.full((1, self.utility_vectorizer.width), 0.5)
+        X_cost = np.full((1, self.cost_vectorizer.width), 0.5)
         y = np.array([0.5])
 
         utility_model.fit(X_utility, y)
         cost_model.fit(X_cost, y)
 
-        return utility_model, cost_model
+        return (
+            LinearRegressor.from_sklearn(utility_model),
+            LinearRegressor.from_sklearn(cost_model),
+        )
 
     async def partial_fit(
         self,
@@ -237,18 +247,39 @@ class TaskScoringModel:
             y: Dictionary with 'utility' and 'cost' values
             user_id: Optional user ID to save models to database
         """
-        utility_features, cost_features = features
-
-        # Load user models if user_id is provided and models aren't already loaded
         if user_id:
-            utility_model, cost_model = await self.load_user_models(user_id)
-            if utility_model and cost_model:
-                utility_model.partial_fit(utility_features, [y["utility"]])
-                cost_model.partial_fit(cost_features, [y["cost"]])
+            await self.partial_fit_batch([features], [y], user_id)
 
-        # Save updated models to database if user_id is provided
-        if user_id:
-            await self.save_user_models(user_id, utility_model, cost_model)
+    async def partial_fit_batch(
+        self,
+        features_list: List[Tuple[np.ndarray, np.ndarray]],
+        y_list: List[Dict[str, float]],
+        user_id: str,
+    ) -> bool:
+        """
+        Update a user's models with a mini-batch of samples and save them once
+
+        Args:
+            features_list: List of (utility_features, cost_features) tuples
+            y_list: List of dictionaries with 'utility' and 'cost' values
+            user_id: The ID of the user
+
+        Returns:
+            bool: True if the updated models were saved, False otherwise
+        """
+        if not features_list:
+            return False
+
+        utility_model, cost_model = await self.load_user_models(user_id)
+        if not (utility_model and cost_model):
+            return False
+
+        utility_matrix = np.vstack([features[0] for features in features_list])
+        cost_matrix = np.vstack([features[1] for features in features_list])
+        utility_model.partial_fit(utility_matrix, [y["utility"] for y in y_list])
+        cost_model.partial_fit(cost_matrix, [y["cost"] for y in y_list])
+
+        return await self.save_user_models(user_id, utility_model, cost_model)
 
     async def predict_utility(
         self, features: Tuple[np.ndarray, np.ndarray], user_id: Optional[str] = None
@@ -267,22 +298,11 @@ class TaskScoringModel:
 
         # Always try to load user models if user_id is provided
         if user_id:
-            utility_model, cost_model = await self.load_user_models(user_id)
-            # Ensure we only use the expected number of features (12)
-            expected_features = 12
-            if utility_features.shape[1] > expected_features:
-                print(
-                    f"WARNING: Utility features have {utility_features.shape[1]} dimensions, but model expects {expected_features}. Slicing to first {expected_features} features."
-                )
-                utility_features = utility_features[:, :expected_features]
-            elif utility_features.shape[1] < expected_features:
-                print(
-                    f"ERROR: Utility features have only {utility_features.shape[1]} dimensions, but model expects {expected_features}."
-                )
-                return 0.5  # Return default score if not enough features
-
-            prediction = float(utility_model.predict(utility_features)[0])
-            return max(0.0, min(1.0, prediction))  # Ensure score is between 0 and 1
+            utility_model, _ = await self.load_user_models(user_id)
+            matrix, valid = self.stack_features(
+                [utility_features], self.utility_vectorizer.width
+            )
+            return float(self._predict_matrix(utility_model, matrix, valid)[0])
         else:
             return 0.5
 
@@ -303,25 +323,104 @@ class TaskScoringModel:
 
         # Always try to load user models if user_id is provided
         if user_id:
-            utility_model, cost_model = await self.load_user_models(user_id)
-            # Ensure we only use the expected number of features (6)
-            expected_features = 6
-            if cost_features.shape[1] > expected_features:
-                print(
-                    f"WARNING: Cost features have {cost_features.shape[1]} dimensions, but model expects {expected_features}. Slicing to first {expected_features} features."
-                )
-                cost_features = cost_features[:, :expected_features]
-            elif cost_features.shape[1] < expected_features:
-                print(
-                    f"ERROR: Cost features have only {cost_features.shape[1]} dimensions, but model expects {expected_features}."
-                )
-                return 0.5  # Return default score if not enough features
-
-            prediction = float(cost_model.predict(cost_features)[0])
-            return max(0.0, min(1.0, prediction))  # Ensure score is between 0 and 1
+            _, cost_model = await self.load_user_models(user_id)
+            matrix, valid = self.stack_features(
+                [cost_features], self.cost_vectorizer.width
+            )
+            return float(self._predict_matrix(cost_model, matrix, valid)[0])
         else:
             return 0.5
 
+    def stack_features(
+        self, features_list: List[np.ndarray], expected_features: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stack per-task feature rows into a single (N, expected_features) matrix
+
+        Rows that are wider than expected are sliced, rows that are narrower are
+        left as zeros and flagged as invalid so they can fall back to the default score.
+
+        Args:
+            features_list: List of (1, n) feature arrays
+            expected_features: Number of columns the model expects, i.e. the
+                width of the vectorizer that encoded the rows
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Feature matrix and boolean mask of valid rows
+        """
+        matrix = np.zeros((len(features_list), expected_features))
+        valid = np.ones(len(features_list), dtype=bool)
+
+        for i, row in enumerate(features_list):
+            row = np.asarray(row).reshape(-1)
+            if row.shape[0] < expected_features:
+                valid[i] = False
+                continue
+            matrix[i] = row[:expected_features]
+
+        invalid_count = int((~valid).sum())
+        if invalid_count:
+            print(
+                f"ERROR: {invalid_count} feature rows have fewer than {expected_features} dimensions, using default score."
+            )
+        return matrix, valid
+
+    def _predict_matrix(
+        self, model, matrix: np.ndarray, valid: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Run a single predict over a feature matrix and clip the scores to [0, 1]
+
+        Args:
+            model: Fitted regressor
+            matrix: (N, n_features) feature matrix
+            valid: Optional boolean mask of rows to predict, other rows get 0.5
+
+        Returns:
+            np.ndarray: Scores between 0 and 1
+        """
+        scores = np.full(matrix.shape[0], 0.5)
+        if valid is None:
+            valid = np.ones(matrix.shape[0], dtype=bool)
+        if valid.any():
+            scores[valid] = np.clip(model.predict(matrix[valid]), 0.0, 1.0)
+        return scores
+
+    async def batch_score(
+        self,
+        utility_matrix: np.ndarray,
+        cost_matrix: np.ndarray,
+        user_id: Optional[str] = None,
+        utility_valid: Optional[np.ndarray] = None,
+        cost_valid: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score a whole batch of tasks with one predict call per model
+
+        Args:
+            utility_matrix: (N, utility_vectorizer.width) utility feature matrix
+            cost_matrix: (N, cost_vectorizer.width) cost feature matrix
+            user_id: Optional user ID to load models from database
+            utility_valid: Optional boolean mask of usable utility rows
+            cost_valid: Optional boolean mask of usable cost rows
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Relevance, utility and cost scores
+        """
+        num_tasks = utility_matrix.shape[0]
+        if not user_id or num_tasks == 0:
+            utility_scores = np.full(num_tasks, 0.5)
+            cost_scores = np.full(num_tasks, 0.5)
+        else:
+            utility_model, cost_model = await self.load_user_models(user_id)
+            utility_scores = self._predict_matrix(
+                utility_model, utility_matrix, utility_valid
+            )
+            cost_scores = self._predict_matrix(cost_model, cost_matrix, cost_valid)
+
+        relevance_scores = self.batch_calculate_relevance(utility_scores, cost_scores)
+        return relevance_scores, utility_scores, cost_scores
+
     async def batch_predict_utility(
         self,
         features_list: List[Tuple[np.ndarray, np.ndarray]],
@@ -337,42 +436,16 @@ class TaskScoringModel:
         Returns:
             List[float]: List of utility scores between 0 and 1
         """
-        # Extract only utility features from each tuple
-        utility_features_list = [features[0] for features in features_list]
-
-        # Load models only once
-        if user_id:
-            utility_model, _ = await self.load_user_models(user_id)
-
-            # Process all utility features at once
-            expected_features = 12
-            predictions = []
-
-            for utility_features in utility_features_list:
-                # Ensure we only use the expected number of features
-                if utility_features.shape[1] > expected_features:
-                    print(
-                        f"WARNING: Utility features have {utility_features.shape[1]} dimensions, but model expects {expected_features}. Slicing."
-                    )
-                    utility_features = utility_features[:, :expected_features]
-                elif utility_features.shape[1] < expected_features:
-                    print(
-                        f"ERROR: Utility features have only {utility_features.shape[1]} dimensions, but model expects {expected_features}."
-                    )
-                    predictions.append(0.5)  # Add default score
-                    continue
-
-                # Make prediction
-                prediction = float(utility_model.predict(utility_features)[0])
-                # Ensure score is between 0 and 1
-                prediction = max(0.0, min(1.0, prediction))
-                predictions.append(prediction)
-
-            return predictions
-        else:
+        if not user_id or not features_list:
             # Return default scores if no user_id
             return [0.5] * len(features_list)
 
+        utility_model, _ = await self.load_user_models(user_id)
+        matrix, valid = self.stack_features(
+            [features[0] for features in features_list], self.utility_vectorizer.width
+        )
+        return self._predict_matrix(utility_model, matrix, valid).tolist()
+
     async def batch_predict_cost(
         self,
         features_list: List[Tuple[np.ndarray, np.ndarray]],
@@ -388,47 +461,28 @@ class TaskScoringModel:
         Returns:
             List[float]: List of cost scores between 0 and 1
         """
-        # Extract only cost features from each tuple
-        cost_features_list = [features[1] for features in features_list]
-
-        # Load models only once
-        if user_id:
-            _, cost_model = await self.load_user_models(user_id)
-
-            # Process all cost features at once
-            expected_features = 6
-            predictions = []
-
-            for cost_features in cost_features_list:
-                # Ensure we only use the expected number of features
-                if cost_features.shape[1] > expected_features:
-                    print(
-                        f"WARNING: Cost features have {cost_features.shape[1]} dimensions, but model expects {expected_features}. Slicing."
-                    )
-                    cost_features = cost_features[:, :expected_features]
-                elif cost_features.shape[1] < expected_features:
-                    print(
-                        f"ERROR: Cost features have only {cost_features.shape[1]} dimensions, but model expects {expected_features}."
-                    )
-                    predictions.append(0.5)  # Add default score
-                    continue
-
-                # Make prediction
-                prediction = float(cost_model.predict(cost_features)[0])
-                # Ensure score is between 0 and 1
-                prediction = max(0.0, min(1.0, prediction))
-                predictions.append(prediction)
-
-            return predictions
-        else:
+        if not user_id or not features_list:
             # Return default scores if no user_id
             return [0.5] * len(features_list)
 
+        _, cost_model = await self.load_user_models(user_id)
+        matrix, valid = self.stack_features(
+            [features[1] for features in features_list], self.cost_vectorizer.width
+        )
+        return self._predict_matrix(cost_model, matrix, valid).tolist()
+
     def calculate_relevance(self, utility_score: float, cost_score: float) -> float:
         """Calculate relevance score from utility and cost scores"""
         relevance = utility_score * self.alpha - self.beta * cost_score
         return float(max(0.0, min(1.0, relevance)))  # Ensure score is between 0 and 1
 
+    def batch_calculate_relevance(
+        self, utility_scores: np.ndarray, cost_scores: np.ndarray
+    ) -> np.ndarray:
+        """Calculate relevance scores for arrays of utility and cost scores"""
+        relevance = self.alpha * utility_scores - self.beta * cost_scores
+        return np.clip(relevance, 0.0, 1.0)
+
     async def process_reorder_feedback(
         self,
         task: Any,
@@ -489,13 +543,14 @@ class TaskScoringModel:
             # Extract features from task data
             features = self.extract_features(task_data)
 
-            # Update model with feedback
-            await self.partial_fit(
-                features, {"utility": target_utility, "cost": target_cost}, user_id
-            )
+            # Buffer the feedback; the model is updated once per batch of drags
+            if user_id:
+                await self.feedback_buffer.add(
+                    user_id, features, {"utility": target_utility, "cost": target_cost}
+                )
 
             print(
-                f"Model updated with reorder feedback using stored features: utility={target_utility}, cost={target_cost}"
+                f"Reorder feedback queued using stored features: utility={target_utility}, cost={target_cost}"
             )
 
             # Get updated predictions
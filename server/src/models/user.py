@@ -1,6 +1,9 @@
 from tortoise import fields, models
+from tortoise.expressions import Q
 import bcrypt
 from src.utils.encryption import encryption
+from src.models.model_cache import model_cache
+from src.models.linear_model import LinearRegressor
 from io import BytesIO
 import joblib
 from sklearn.linear_model import SGDRegressor
@@ -26,6 +29,12 @@ class User(models.Model):
     personality = fields.JSONField(null=True, default=list)
     nylas_email = fields.CharField(max_length=255, null=True)
     nylas_grant_id = fields.TextField(null=True, description="Encrypted Nylas grant ID")
+    nylas_grant_index = fields.CharField(
+        max_length=64,
+        null=True,
+        index=True,
+        description="Blind index (keyed HMAC) of the Nylas grant ID",
+    )
     onboarding = fields.BooleanField(default=False)
     domain_inf = fields.CharField(max_length=255, null=True)
     task_gen = fields.BooleanField(default=False)
@@ -36,17 +45,21 @@ class User(models.Model):
     user_model: fields.OneToOneRelation["UserModel"]
 
     async def set_nylas_grant_id(self, grant_id: str) -> None:
-        """Encrypt and store Nylas grant ID."""
+        """Encrypt and store Nylas grant ID along with its blind index."""
         if grant_id:
             self.nylas_grant_id = encryption.encrypt(grant_id)
+            self.nylas_grant_index = encryption.blind_index(grant_id)
 
     def get_nylas_grant_id(self) -> str | None:
         """Decrypt and return Nylas grant ID."""
         return encryption.decrypt(self.nylas_grant_id) if self.nylas_grant_id else None
 
-    async def get_all_users_by_grant_id(self, grant_id: str):
-        users = await User.filter(nylas_grant_id__not_isnull=True).all()
-        return [user for user in users if user.get_nylas_grant_id() == grant_id]
+    @staticmethod
+    async def get_all_users_by_grant_id(grant_id: str) -> List["User"]:
+        """Get all users connected to a Nylas grant ID."""
+        if not grant_id:
+            return []
+        return await User.filter(nylas_grant_index=encryption.blind_index(grant_id))
 
     def verify_password(self, password: str) -> bool:
         """Verify a password against its hash."""
@@ -64,10 +77,11 @@ class User(models.Model):
     @staticmethod
     async def get_by_grant_id(grant_id: str):
         """Get user by Nylas grant ID."""
-        users = await User.filter(nylas_grant_id__not_isnull=True).all()
-        return next(
-            (user for user in users if user.get_nylas_grant_id() == grant_id), None
-        )
+        if not grant_id:
+            return None
+        return await User.filter(
+            nylas_grant_index=encryption.blind_index(grant_id)
+        ).first()
 
     class Meta:
         table = "users"
@@ -82,7 +96,9 @@ class User(models.Model):
 class UserModel(models.Model):
     """
     UserModel model that represents the user_models table in the database.
-    Stores serialized SGDRegressor models for utility and cost predictions.
+    Stores compact linear models for utility and cost predictions. Rows written
+    before the compact format hold joblib-pickled SGDRegressors, which are still
+    readable and get rewritten on the next save.
     """
 
     user = fields.OneToOneField(
@@ -107,35 +123,39 @@ class UserModel(models.Model):
     # Serialization/Deserialization Helpers
     @staticmethod
     def _serialize_model(model) -> bytes:
-        """Serialize an SGDRegressor model to bytes."""
-        buffer = BytesIO()
-        joblib.dump(model, buffer)
-
-        return buffer.getvalue()
+        """Serialize a linear model (or a fitted SGDRegressor) to the compact format."""
+        return LinearRegressor.from_sklearn(model).to_bytes()
 
     @staticmethod
-    def _deserialize_model(model_bytes: bytes) -> SGDRegressor:
-        """Deserialize bytes back into an SGDRegressor model."""
+    def _deserialize_model(model_bytes: bytes) -> LinearRegressor:
+        """Deserialize bytes back into a linear model, converting legacy pickles."""
         if not model_bytes:
             # Create a default model and ensure it's fitted with minimal data
             model = SGDRegressor()
             model.fit(np.array([[0.5]]), np.array([0.5]))  # Fit with minimal data
-            return model
+            return LinearRegressor.from_sklearn(model)
+        if LinearRegressor.is_compact(model_bytes):
+            return LinearRegressor.from_bytes(model_bytes)
         buffer = BytesIO(model_bytes)
-        return joblib.load(buffer)
+        return LinearRegressor.from_sklearn(joblib.load(buffer))
+
+    def has_legacy_models(self) -> bool:
+        """Check whether either model is still stored as a pickled SGDRegressor."""
+        return any(
+            blob and not LinearRegressor.is_compact(blob)
+            for blob in (self.utility_model, self.cost_model)
+        )
 
     # Instance Methods
-    async def get_utility_model(self) -> SGDRegressor:
+    async def get_utility_model(self) -> LinearRegressor:
         """Retrieve and deserialize the utility model."""
         return self._deserialize_model(self.utility_model)
 
-    async def get_cost_model(self) -> SGDRegressor:
+    async def get_cost_model(self) -> LinearRegressor:
         """Retrieve and deserialize the cost model."""
         return self._deserialize_model(self.cost_model)
 
-    async def set_models(
-        self, utility_model: SGDRegressor, cost_model: SGDRegressor
-    ) -> None:
+    async def set_models(self, utility_model, cost_model) -> None:
         """Serialize and set the utility and cost models."""
         if not hasattr(utility_model, "coef_"):
             utility_model.fit(np.array([[0.5]]), np.array([0.5]))
@@ -145,6 +165,35 @@ class UserModel(models.Model):
         self.utility_model = self._serialize_model(utility_model)
         self.cost_model = self._serialize_model(cost_model)
         await self.save()
+        # Cached copies are now stale
+        model_cache.invalidate(self.user_id)
+
+    @classmethod
+    async def migrate_legacy_models(cls) -> int:
+        """
+        Rewrite every pickled model row in the compact format
+
+        Returns:
+            int: Number of rows converted
+        """
+        converted = 0
+        rows = await cls.filter(
+            Q(utility_model__not_isnull=True) | Q(cost_model__not_isnull=True)
+        ).all()
+        for user_model in rows:
+            if not user_model.has_legacy_models():
+                continue
+            try:
+                await user_model.set_models(
+                    await user_model.get_utility_model(),
+                    await user_model.get_cost_model(),
+                )
+                converted += 1
+            except Exception as e:
+                print(
+                    f"Error converting models for user {user_model.user_id}: {str(e)}"
+                )
+        return converted
 
     @classmethod
     async def get_or_create(cls, user_id: str) -> "UserModel":
@@ -392,6 +441,41 @@ class Features(models.Model):
 
         return features
 
+    @classmethod
+    async def bulk_create_features(
+        cls,
+        user_id: str,
+        task_ids: List[str],
+        utility_features_list: List[dict],
+        cost_features_list: List[dict],
+    ) -> List["Features"]:
+        """
+        Create features records for many tasks of one user in a single insert
+
+        Args:
+            user_id: The ID of the user
+            task_ids: The IDs of the tasks
+            utility_features_list: Utility features, one dictionary per task
+            cost_features_list: Cost features, one dictionary per task
+
+        Returns:
+            List[Features]: The created features records
+        """
+        features = [
+            cls(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                task_id=task_id,
+                features=utility_features,
+                cost=cost_features,
+            )
+            for task_id, utility_features, cost_features in zip(
+                task_ids, utility_features_list, cost_features_list
+            )
+        ]
+        await cls.bulk_create(features)
+        return features
+
     @classmethod
     async def get_by_task_id(cls, task_id: str) -> Optional["Features"]:
         """
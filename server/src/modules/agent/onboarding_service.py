@@ -13,6 +13,9 @@ from src.agents.personality_summarizer import PersonalitySummarizer
 from src.agents.content_classifier import ContentClassifier
 from src.agents.questions_generator import DomainInferenceAgent
 from src.agents.content_summarizer import ContentSummarizer
+from src.agents.llm_scheduler import LLMPriority, with_llm_priority
+from src.exceptions.llm import LLMException
+from src.config import settings
 from src.models.user import User
 from src.modules.agent.service import AgentService
 from src.modules.nylas.service import NylasService
@@ -25,7 +28,7 @@ import datetime
 from ...agents.task_cost_features_extractor import CostFeaturesExtractor
 from ...agents.task_utility_features_extractor import UtilityFeaturesExtractor
 from ...utils.get_text_from_html import get_text_from_html
-from src.models.graph.nodes import UserNode, EmailNode
+from src.models.graph.repository import graph
 from src.models.user import EmailModel
 
 
@@ -118,10 +121,12 @@ class OnboardingAgentService:
                         email_body, user_context
                     )
                     return (email, is_spam.lower() == "spam")
+                except LLMException:
+                    raise
                 except Exception:
                     return (email, False)
 
-            process_limit = min(20, len(emails))
+            process_limit = min(settings.ONBOARDING_MAX_EMAILS, len(emails))
 
             tasks = [classify_email(email) for email in emails[:process_limit]]
             results = await asyncio.gather(*tasks)
@@ -136,6 +141,8 @@ class OnboardingAgentService:
 
             return {"spam": spam_emails, "non_spam": non_spam_emails}
 
+        except LLMException:
+            raise
         except Exception as e:
             import traceback
 
@@ -147,8 +154,8 @@ class OnboardingAgentService:
         """
         Fetch recent emails received by the user for onboarding analysis.
 
-        Retrieves up to 200 emails received in the last 10 days to use for
-        onboarding processing and analysis.
+        Retrieves up to ONBOARDING_MAX_EMAILS emails received in the last 10
+        days to use for onboarding processing and analysis.
 
         Args:
             grant_id: The Nylas Grant ID of the user
@@ -160,7 +167,7 @@ class OnboardingAgentService:
             emails = await self.nylas_service.fetch_last_two_weeks_emails(
                 days=10,
                 grant_id=grant_id,
-                limit=200,
+                limit=settings.ONBOARDING_MAX_EMAILS,
             )
             if not emails:
                 print("[DEBUG] No emails found, returning empty list")
@@ -219,6 +226,7 @@ class OnboardingAgentService:
         await user.save()
         return personality_task
 
+    @with_llm_priority(LLMPriority.BACKFILL)
     async def start_onboarding(
         self, grant_id: str, user_id: str, nylas_email: str
     ) -> None:
@@ -238,31 +246,40 @@ class OnboardingAgentService:
             nylas_email: The user's email address
 
         Raises:
-            Exception: If the onboarding process fails at any stage
+            LLMException: If the LLM is unavailable, so onboarding can be retried
+            Exception: If the onboarding process fails at any other stage
         """
         try:
-            emails_raw = await self.fetch_last_ten_emails_sent_to_user(grant_id)
-            if not emails_raw:
-                raise Exception("No emails found for the last week")
+            fetched = 0
+            non_spam_emails = []
 
-            emails = []
-            for email in emails_raw:
-                parsed_email_body = get_text_from_html(email.get("body", ""))
-                emails.append(
-                    EmailData(
-                        id=email.get("id"),
-                        body=parsed_email_body,
-                        subject=email.get("subject"),
-                        from_=email.get("from"),
+            # Classify each page while the next one is still downloading
+            async for page in self.nylas_service.iter_recent_emails(
+                grant_id,
+                days=10,
+                folders=["INBOX"],
+                max_messages=settings.ONBOARDING_MAX_EMAILS,
+            ):
+                fetched += len(page)
+                emails = []
+                for email in page:
+                    parsed_email_body = get_text_from_html(email.get("body", ""))
+                    emails.append(
+                        EmailData(
+                            id=email.get("id"),
+                            body=parsed_email_body,
+                            subject=email.get("subject"),
+                            from_=email.get("from"),
+                        )
                     )
-                )
 
-            try:
+                # classify_spams treats unreadable emails as non-spam itself; an
+                # LLM outage is raised so the emails are not all taken as non-spam
                 classified_emails = await self.classify_spams(emails, user_id)
-            except Exception:
-                classified_emails = {"spam": [], "non_spam": emails}
+                non_spam_emails.extend(classified_emails.get("non_spam", []))
 
-            non_spam_emails = classified_emails.get("non_spam", [])
+            if not fetched:
+                raise Exception("No emails found for the last week")
 
             if not non_spam_emails:
                 return
@@ -333,25 +350,13 @@ class OnboardingAgentService:
 
                     # Save classification and snippet to Neo4j email node
                     try:
-                        email_node = EmailNode.nodes.get_or_none(messageId=email_obj.id)
-                        if not email_node:
-                            email_node = EmailNode(messageId=email_obj.id).save()
-
-                        email_node.snippet = email_summary
-                        email_node.subject = email_obj.subject or "No subject"
-                        email_node.classification = email_classification
-                        email_node.save()
-
-                        # Connect to user node if needed
-                        try:
-                            user_node = UserNode.nodes.get_or_none(userid=user_id)
-                            if user_node and not user_node.emails.is_connected(
-                                email_node
-                            ):
-                                user_node.emails.connect(email_node)
-                        except Exception as e:
-                            print(f"Error connecting email node to user node: {str(e)}")
-
+                        await graph.merge_email(
+                            user_id,
+                            email_obj.id,
+                            snippet=email_summary,
+                            subject=email_obj.subject or "No subject",
+                            classification=email_classification,
+                        )
                     except Exception as e:
                         print(
                             f"Error saving classification to Neo4j for email {email_obj.id}: {str(e)}"
@@ -387,6 +392,9 @@ class OnboardingAgentService:
             user.task_gen = False
             await user.save()
 
+        except LLMException as e:
+            print(f"LLM unavailable during onboarding: {str(e)}")
+            raise
         except Exception as e:
             print(f"Error in start_onboarding: {str(e)}")
             traceback.print_exc()
@@ -22,6 +22,8 @@ from fastapi import (
 from src.modules.agent.service import AgentService
 
 from src.modules.agent.onboarding_service import OnboardingAgentService
+from src.jobs.handlers import WEBHOOK_JOB
+from src.jobs.queue import job_queue
 
 from src.modules.agent.schemas import (
     DomainInferenceRequest,
@@ -68,25 +70,23 @@ async def webhook_challenge(request: Request):
 
 
 @router.post("/webhook")
-async def nylas_webhook(request: Request, background_tasks: BackgroundTasks):
+async def nylas_webhook(request: Request):
     """
     Process Nylas webhook events.
 
     This endpoint handles webhook notifications from Nylas when a user receives an email.
-    It processes the events in the background to handle new email messages, extract tasks,
-    and classify content.
+    The event is put on the job queue and processed by a job worker, which handles new
+    email messages, extracts tasks, and classifies content.
 
     Args:
         request: The incoming HTTP request containing webhook data
-        background_tasks: FastAPI background task handler
 
     Returns:
         dict: Processing status message
     """
     try:
         webhook_data = await request.json()
-        agent_service = AgentService()
-        background_tasks.add_task(agent_service.handle_webhook_event, webhook_data)
+        await job_queue.enqueue(WEBHOOK_JOB, webhook_data)
 
         return "Webhook processed successfully"
     except Exception as e:
@@ -5,8 +5,15 @@ This module contains Pydantic models for validating and structuring data related
 email processing, content classification, and user onboarding.
 """
 
-from pydantic import BaseModel, Field, root_validator
-from typing import List, Optional, Dict
+from pydantic import (
+    BaseModel,
+    Field,
+    StrictFloat,
+    StrictInt,
+    StrictStr,
+    root_validator,
+)
+from typing import List, Optional, Dict, Union
 
 
 class EmailData(BaseModel):
@@ -345,3 +352,59 @@ class DomainInferenceResponse(BaseModel):
     message: str
     questions: List[QuestionWithOptions]
     summary: str
+
+
+FeatureValue = Union[StrictStr, StrictInt, StrictFloat]
+
+
+class ExtractedUtilityFeatures(BaseModel):
+    """
+    Utility features returned inline by the single-pass task extractor.
+
+    deadline_time is not part of the LLM output; it is computed locally.
+    """
+
+    priority: FeatureValue
+    intrinsic_interest: FeatureValue
+    user_emphasis: FeatureValue
+    task_type_relevance: FeatureValue
+    emotional_salience: FeatureValue
+    domain_relevance: FeatureValue
+    novel_task: FeatureValue
+    reward_pathways: FeatureValue
+    time_of_day_alignment: FeatureValue
+    learning_opportunity: FeatureValue
+    urgency: FeatureValue
+
+
+class ExtractedCostFeatures(BaseModel):
+    """
+    Cost features returned inline by the single-pass task extractor.
+    """
+
+    task_complexity: FeatureValue
+    time_required: FeatureValue
+    emotional_stress_factor: FeatureValue
+    location_dependencies: FeatureValue
+    resource_requirements: FeatureValue
+    interruptibility: FeatureValue
+
+
+class ExtractedTaskWithFeatures(BaseModel):
+    """
+    A task extracted from an email together with its scoring features.
+    """
+
+    title: StrictStr
+    due_date: Optional[StrictStr] = None
+    priority: StrictStr = "medium"
+    utility_features: ExtractedUtilityFeatures
+    cost_features: ExtractedCostFeatures
+
+
+class SinglePassExtractionResult(BaseModel):
+    """
+    Validated output of the single-pass task extractor.
+    """
+
+    tasks: List[ExtractedTaskWithFeatures]
@@ -6,23 +6,29 @@ extracting tasks, and managing email-related agent operations. It provides servi
 spam detection, task extraction and scoring, and content processing.
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from src.agents.spam_classifier import SpamClassifier
 from src.agents.task_extractor import TaskExtractor
 from src.agents.personality_summarizer import PersonalitySummarizer
 from src.agents.content_classifier import ContentClassifier
 from src.agents.questions_generator import DomainInferenceAgent
 from src.agents.content_summarizer import ContentSummarizer
+from src.agents.llm_scheduler import LLMPriority, with_llm_priority
+from src.exceptions.llm import LLMException
 from src.models.user import User, EmailModel
 from src.modules.tasks.service import TaskService
 from src.modules.tasks.schemas import TaskCreate
 from src.modules.nylas.service import NylasService
-from src.models.graph.nodes import UserNode, EmailNode
+from src.models.graph.repository import graph
+from src.jobs.idempotency import idempotency_key, webhook_dedup
 from .schemas import EmailData
 import asyncio
 import datetime
 from ...agents.task_cost_features_extractor import CostFeaturesExtractor
 from ...agents.task_utility_features_extractor import UtilityFeaturesExtractor
+from ...agents.task_features_extractor import TaskFeaturesExtractor
+from ...agents.single_pass_task_extractor import SinglePassTaskExtractor
+from src.config import settings
 from ...utils.get_text_from_html import get_text_from_html
 from ...utils.get_task_scores import calculate_task_scores, batch_calculate_task_scores
 
@@ -33,6 +39,48 @@ from ...utils.get_task_scores import calculate_task_scores, batch_calculate_task
 #
 
 
+class SharedMessageStages:
+    """
+    Per-message pipeline results that do not depend on the user.
+
+    When several users share a grant, every one of them receives the same
+    webhook messages. Parsing, summarization and base task extraction only
+    depend on the message, so they run once per message and every user's
+    pipeline awaits the same result; only spam context, content
+    classification and scoring are computed per user.
+    """
+
+    def __init__(self, agent_service: "AgentService"):
+        self.agent_service = agent_service
+        self._results: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def _once(
+        self, stage: str, message_id: str, factory: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Future:
+        key = (stage, message_id)
+        if key not in self._results:
+            self._results[key] = asyncio.ensure_future(factory())
+        return self._results[key]
+
+    async def extraction(
+        self, email: EmailData
+    ) -> Tuple[List[Dict[str, Any]], List[EmailData]]:
+        """Return extract_tasks_with_features for one email, without personality."""
+        return await self._once(
+            "extraction",
+            email.id,
+            lambda: self.agent_service.extract_tasks_with_features([email], ""),
+        )
+
+    async def summary(self, email: EmailData) -> dict:
+        """Return the content summary of one email."""
+        return await self._once(
+            "summary",
+            email.id,
+            lambda: self.agent_service.content_summarizer.process_content(email.body),
+        )
+
+
 class AgentService:
     """
     Service for handling agent-related operations.
@@ -53,6 +101,8 @@ class AgentService:
         self.personality_summarizer = PersonalitySummarizer()
         self.utility_features_extractor = UtilityFeaturesExtractor()
         self.cost_features = CostFeaturesExtractor()
+        self.task_features_extractor = TaskFeaturesExtractor()
+        self.single_pass_extractor = SinglePassTaskExtractor()
         self.content_classifier = ContentClassifier()
         self.domain_inference_agent = DomainInferenceAgent()
         self.content_summarizer = ContentSummarizer()
@@ -119,13 +169,19 @@ class AgentService:
 
                     is_spam = await self.spam_classifier.process(email_body, domain_inf)
                     return (email, is_spam.lower() == "spam")
+                except LLMException:
+                    raise
                 except Exception:
                     return (email, False)
 
-            process_limit = min(20, len(emails))
-
-            tasks = [classify_email(email) for email in emails[:process_limit]]
-            results = await asyncio.gather(*tasks)
+            # Every email is classified, SPAM_CLASSIFICATION_CHUNK_SIZE at a time
+            chunk_size = max(1, settings.SPAM_CLASSIFICATION_CHUNK_SIZE)
+            results = []
+            for start in range(0, len(emails), chunk_size):
+                chunk = emails[start : start + chunk_size]
+                results.extend(
+                    await asyncio.gather(*(classify_email(email) for email in chunk))
+                )
 
             spam_emails = []
             non_spam_emails = []
@@ -137,6 +193,8 @@ class AgentService:
 
             return {"spam": spam_emails, "non_spam": non_spam_emails}
 
+        except LLMException:
+            raise
         except Exception as e:
             import traceback
 
@@ -165,6 +223,83 @@ class AgentService:
 
         return tasks_json
 
+    async def extract_email_tasks(
+        self, email_body: str, user_personality: str = None
+    ) -> List[dict]:
+        """
+        Extract the list of tasks from an email.
+
+        With SINGLE_PASS_EXTRACTION enabled the tasks come back with their
+        utility and cost features inline, so no per-task feature calls are
+        needed. If that response fails schema validation, the regular task
+        extractor is used and features are extracted per task.
+
+        Args:
+            email_body: The content of the email
+            user_personality: Optional user personality context
+
+        Returns:
+            List[dict]: Extracted tasks, possibly carrying "utility_features"
+                and "cost_features"
+        """
+        if settings.SINGLE_PASS_EXTRACTION:
+            tasks = await self.single_pass_extractor.process(
+                get_text_from_html(email_body), user_personality
+            )
+            if tasks is not None:
+                return tasks
+            print("Falling back to per-task feature extraction")
+
+        task_items = await self.extract_tasks(email_body, user_personality)
+        return task_items.get("tasks", [])
+
+    async def get_task_features(
+        self, task: dict, task_context: str
+    ) -> Tuple[dict, dict]:
+        """
+        Return the features of an extracted task, extracting them if needed.
+
+        Args:
+            task: Task as returned by extract_email_tasks
+            task_context: User personality, email content and the task
+
+        Returns:
+            Tuple[dict, dict]: (utility_features, cost_features)
+        """
+        if "utility_features" in task and "cost_features" in task:
+            return task["utility_features"], task["cost_features"]
+        return await self.extract_task_features(task_context, task.get("due_date"))
+
+    async def extract_task_features(
+        self, task_context: str, due_date: str = None
+    ) -> Tuple[dict, dict]:
+        """
+        Extract utility and cost features for a single task.
+
+        With COMBINED_FEATURE_EXTRACTION enabled this is one LLM call returning
+        both feature sets, with the deadline utility computed locally. Otherwise
+        the separate utility and cost extractors are called in parallel.
+
+        Args:
+            task_context: User personality, email content and the task
+            due_date: Optional task due date in YYYY-MM-DD format
+
+        Returns:
+            Tuple[dict, dict]: (utility_features, cost_features)
+        """
+        if settings.COMBINED_FEATURE_EXTRACTION:
+            result = await self.task_features_extractor.process(task_context, due_date)
+            return result["utility_features"], result["cost_features"]
+
+        utility_result, cost_result = await asyncio.gather(
+            self.utility_features_extractor.process(task_context),
+            self.cost_features.process(task_context),
+        )
+        return (
+            utility_result.get("utility_features", {}),
+            cost_result.get("cost_features", {}),
+        )
+
     async def extract_and_save_tasks(
         self, user_id: str, email, user_personality: str = None, email_node=None
     ):
@@ -197,8 +332,7 @@ class AgentService:
         # We need the full original content for task extraction, not the summary
         # If we're processing from webhook, email_body might already be a summary
         # In this case, we should use the original body from the parsed_body variable if available
-        task_items = await self.extract_tasks(email_body, user_personality)
-        tasks = task_items.get("tasks", [])
+        tasks = await self.extract_email_tasks(email_body, user_personality)
 
         if len(tasks) == 0:
             return False
@@ -212,20 +346,10 @@ class AgentService:
         for item in tasks:
             task_context = context + f"\ntask: {item}"
 
-            utility_task_features_coroutine = self.utility_features_extractor.process(
-                task_context
-            )
-            cost_task_features_coroutine = self.cost_features.process(task_context)
-
-            # Gather results
-            utility_result, cost_result = await asyncio.gather(
-                utility_task_features_coroutine,
-                cost_task_features_coroutine,
+            utility_features, cost_features = await self.get_task_features(
+                item, task_context
             )
 
-            utility_features = utility_result.get("utility_features", {})
-            cost_features = cost_result.get("cost_features", {})
-
             # Use the new scoring model to calculate scores with user-specific models
             relevance_score, utility_score, cost_score = await calculate_task_scores(
                 utility_features=utility_features,
@@ -272,30 +396,65 @@ class AgentService:
             - bool: True if tasks were successfully extracted from any email
             - List: Emails that didn't yield any tasks
         """
+        extracted_tasks, emails_without_tasks = await self.extract_tasks_with_features(
+            emails, user_personality
+        )
+
+        if not extracted_tasks:
+            print("No tasks extracted from any emails")
+            return False, emails
+
+        await self.save_extracted_tasks(user_id, extracted_tasks)
+        return True, emails_without_tasks
+
+    async def extract_tasks_with_features(
+        self, emails: List, user_personality: str = None
+    ) -> Tuple[List[Dict[str, Any]], List]:
+        """
+        Extract tasks and their utility/cost features from emails.
+
+        This stage does not touch the user's scoring model or the database, so
+        with user_personality=None its result can be shared by every user that
+        received the same emails.
+
+        Args:
+            emails: List of email objects containing id, subject, body, etc.
+                   Can be either dictionaries or EmailData objects
+            user_personality: Optional user persona information
+
+        Returns:
+            Tuple containing:
+            - List: Extracted tasks as dicts with task, message_id, utility and cost
+            - List: Emails that didn't yield any tasks
+        """
         # Container for emails that didn't yield tasks
         emails_without_tasks = []
 
         # Extract tasks from all emails
         all_extracted_tasks = []
-        task_to_email_map = {}
 
+        parsed_emails = []
         for email in emails:
             # Extract email body and ID
             if hasattr(email, "body") and hasattr(email, "id"):
-                email_body = email.body
-                email_id = email.id
+                parsed_emails.append((email, email.body, email.id))
             elif isinstance(email, dict):
-                email_body = email.get("body", "")
-                email_id = email.get("id", "")
+                parsed_emails.append(
+                    (email, email.get("body", ""), email.get("id", ""))
+                )
             else:
                 print(f"Warning: Unsupported email type: {type(email)}")
                 emails_without_tasks.append(email)
-                continue
 
-            # Extract tasks
-            task_items = await self.extract_tasks(email_body, user_personality)
-            tasks = task_items.get("tasks", [])
+        # Extract tasks from all emails in parallel
+        extracted = await asyncio.gather(
+            *(
+                self.extract_email_tasks(email_body, user_personality)
+                for _, email_body, _ in parsed_emails
+            )
+        )
 
+        for (email, email_body, email_id), tasks in zip(parsed_emails, extracted):
             if len(tasks) == 0:
                 emails_without_tasks.append(email)
             else:
@@ -310,51 +469,51 @@ class AgentService:
                 # Track tasks with their source email
                 for task in tasks:
                     # Include the email context with each task
-                    task_with_context = {
-                        "task": task,
-                        "context": email_context + f"\ntask: {task}",
-                    }
-                    all_extracted_tasks.append(task_with_context)
-                    task_to_email_map[len(all_extracted_tasks) - 1] = email_id
+                    all_extracted_tasks.append(
+                        {
+                            "task": task,
+                            "context": email_context + f"\ntask: {task}",
+                            "message_id": email_id,
+                        }
+                    )
 
         if not all_extracted_tasks:
-            print("No tasks extracted from any emails")
-            return False, emails
+            return [], emails_without_tasks
 
         # Extract features in parallel for all tasks
-        utility_coroutines = [
-            self.utility_features_extractor.process(task_info["context"])
-            for task_info in all_extracted_tasks
-        ]
-
-        cost_coroutines = [
-            self.cost_features.process(task_info["context"])
-            for task_info in all_extracted_tasks
-        ]
-
-        # Gather all results
         print(f"Extracting features for {len(all_extracted_tasks)} tasks in parallel")
-        utility_results, cost_results = await asyncio.gather(
-            asyncio.gather(*utility_coroutines), asyncio.gather(*cost_coroutines)
+        feature_results = await asyncio.gather(
+            *(
+                self.get_task_features(task_info["task"], task_info["context"])
+                for task_info in all_extracted_tasks
+            )
         )
+        for task_info, (utility, cost) in zip(all_extracted_tasks, feature_results):
+            task_info["utility"] = utility
+            task_info["cost"] = cost
 
+        return all_extracted_tasks, emails_without_tasks
+
+    async def save_extracted_tasks(
+        self, user_id: str, extracted_tasks: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Score extracted tasks with the user's models and save them in batch.
+
+        Args:
+            user_id: The ID of the user
+            extracted_tasks: Tasks returned by extract_tasks_with_features
+        """
         # Prepare inputs for batch score calculation
         priorities = [
-            task_info["task"].get("priority", "medium")
-            for task_info in all_extracted_tasks
+            task_info["task"].get("priority", "medium") for task_info in extracted_tasks
         ]
 
-        deadlines = [
-            task_info["task"].get("due_date") for task_info in all_extracted_tasks
-        ]
+        deadlines = [task_info["task"].get("due_date") for task_info in extracted_tasks]
 
-        utility_features_list = [
-            result.get("utility_features", {}) for result in utility_results
-        ]
+        utility_features_list = [task_info["utility"] for task_info in extracted_tasks]
 
-        cost_features_list = [
-            result.get("cost_features", {}) for result in cost_results
-        ]
+        cost_features_list = [task_info["cost"] for task_info in extracted_tasks]
 
         # Calculate scores in batch
         print("Calculating scores in batch")
@@ -368,7 +527,7 @@ class AgentService:
 
         # Create task objects for batch creation
         task_create_objects = []
-        for i, task_info in enumerate(all_extracted_tasks):
+        for i, task_info in enumerate(extracted_tasks):
             task = task_info["task"]
             relevance_score, utility_score, cost_score = all_scores[i]
 
@@ -376,7 +535,7 @@ class AgentService:
                 task=task.get("title"),
                 deadline=task.get("due_date"),
                 priority=task.get("priority"),
-                messageId=task_to_email_map[i],
+                messageId=task_info["message_id"],
                 relevance_score=relevance_score,
                 utility_score=utility_score,
                 cost_score=cost_score,
@@ -393,8 +552,7 @@ class AgentService:
             cost_features_list=cost_features_list,
         )
 
-        return True, emails_without_tasks
-
+    @with_llm_priority(LLMPriority.REALTIME)
     async def handle_webhook_event(self, webhook_data: Dict[str, Any]) -> bool:
         """
         Handle webhook events from Nylas.
@@ -408,136 +566,299 @@ class AgentService:
         Returns:
             bool: True if the webhook was processed successfully, False otherwise
         """
-        try:
-            # Check if this is a message.created event
-            if webhook_data.get("type") == "message.created":
-
-                message_data = webhook_data.get("data", {}).get("object", {})
-                if not message_data:
-                    raise Exception("Message data not found in webhook data")
-
-                message_id = message_data.get("id")
-                body = message_data.get("body", "")
-                parsed_body = get_text_from_html(body)
-                subject = message_data.get("subject", "")
-                from_data = message_data.get("from", [{}])
-                grant_id = message_data.get("grant_id")
-
-                email_node = EmailNode.nodes.get_or_none(messageId=message_id)
-                if email_node:
-                    return True
-                else:
-                    email_node = EmailNode(messageId=message_id).save()
+        results = await self.handle_webhook_batch([webhook_data])
+        return results[0]
+
+    @with_llm_priority(LLMPriority.REALTIME)
+    async def handle_webhook_batch(self, events: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Handle a batch of webhook events from Nylas.
+
+        New messages are grouped by grant, so each user is looked up once and
+        their messages go through spam classification and task extraction
+        together instead of one pipeline per message. When a grant has several
+        users, the user-independent stages run once per message and are shared
+        (see SharedMessageStages).
+
+        Args:
+            events: Webhook payloads from Nylas, typically for the same grant
+
+        Returns:
+            List[bool]: For each event, True if it was processed (or needs no
+                processing), False if it failed and should be retried
+        """
+        results = [True] * len(events)
+        claimed_keys = {}
+        event_indexes = {}
+        emails_by_grant: Dict[str, List[EmailData]] = {}
+
+        for index, webhook_data in enumerate(events):
+            # Only message.created events are processed
+            if webhook_data.get("type") != "message.created":
+                continue
+
+            message_data = webhook_data.get("data", {}).get("object", {})
+            if not message_data:
+                print(
+                    "Error processing webhook: Message data not found in webhook data"
+                )
+                results[index] = False
+                continue
 
-                if not message_id or not body:
-                    raise Exception("Message ID or body not found in webhook data")
+            message_id = message_data.get("id")
+            body = message_data.get("body", "")
+            grant_id = message_data.get("grant_id")
+            if not message_id or not body:
+                print("Error processing webhook: Message ID or body not found")
+                results[index] = False
+                continue
+
+            # Skip deliveries of an event or message that was already claimed
+            keys = [idempotency_key("message", grant_id, message_id)]
+            if webhook_data.get("id"):
+                keys.append(idempotency_key("event", webhook_data["id"]))
+            try:
+                if not await webhook_dedup.claim(keys):
+                    continue
+            except Exception as e:
+                print(f"Error processing webhook: {str(e)}")
+                results[index] = False
+                continue
 
+            claimed_keys[message_id] = keys
+            event_indexes[message_id] = index
+            emails_by_grant.setdefault(grant_id, []).append(
+                EmailData(
+                    id=message_id,
+                    body=get_text_from_html(body),
+                    subject=message_data.get("subject", ""),
+                    from_=message_data.get("from", [{}]),
+                )
+            )
+
+        for grant_id, emails in emails_by_grant.items():
+            try:
                 users = await User.get_all_users_by_grant_id(grant_id)
                 if len(users) == 0:
                     raise Exception("User not found for the provided grant_id")
 
-                email = EmailData(
-                    id=message_id, body=parsed_body, subject=subject, from_=from_data
-                )
-
-                # Process for each user
-                for user in users:
-                    classification_result = await self.classify_spams([email], user.id)
-                    non_spam_emails = classification_result.get("non_spam", [])
-                    if len(non_spam_emails) == 0:
-                        print(
-                            f"Email {message_id} classified as spam for user {user.id}, skipping processing"
+                shared = SharedMessageStages(self)
+                outcomes = await asyncio.gather(
+                    *(
+                        self._process_claimed_webhook_emails(
+                            user, emails, shared, personalised=len(users) == 1
                         )
-                        continue
+                        for user in users
+                    ),
+                    return_exceptions=True,
+                )
+                for outcome in outcomes:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+            except Exception as e:
+                if isinstance(e, LLMException):
+                    print(f"LLM unavailable while processing webhook: {str(e)}")
+                else:
+                    print(f"Error processing webhook: {str(e)}")
+                # Release the claims so a redelivery of these webhooks is processed;
+                # users that already succeeded keep their per-user claims
+                for email in emails:
+                    try:
+                        await webhook_dedup.release(claimed_keys[email.id])
+                    except Exception as release_error:
+                        print(f"Error releasing webhook claim: {str(release_error)}")
+                    results[event_indexes[email.id]] = False
+
+        return results
+
+    async def _process_claimed_webhook_emails(
+        self,
+        user: User,
+        emails: List[EmailData],
+        shared: SharedMessageStages,
+        personalised: bool = True,
+    ) -> None:
+        """
+        Claim webhook emails for one user and run them through the pipeline.
 
-                    user_personality = None
-                    if user.personality and isinstance(user.personality, list):
-                        user_personality = user.personality[:-1]
-                        user_personality = "\n".join(user_personality)
+        Each (user, message) pair is claimed separately, so when a redelivery
+        follows a partial failure on a shared grant, only the users whose
+        processing failed see the messages again. On failure only the claims
+        of emails that did not finish are released: a redelivery must not
+        create the tasks of an email a second time.
 
-                    # Create email object with the original parsed body
+        Args:
+            user: The user the emails were delivered to
+            emails: Parsed emails from the webhook events
+            shared: User-independent results shared with other users of the grant
+            personalised: Passed through to _process_webhook_emails
+
+        Raises:
+            Exception: If processing failed; claims of unfinished emails are
+                released
+        """
+        claimed = {}
+        completed: Set[str] = set()
+        try:
+            for email in emails:
+                keys = [idempotency_key("user_message", user.id, email.id)]
+                if await webhook_dedup.claim(keys):
+                    claimed[email.id] = keys
+            pending = [email for email in emails if email.id in claimed]
+            if pending:
+                await self._process_webhook_emails(
+                    user, pending, shared, personalised, completed
+                )
+        except Exception:
+            for message_id, keys in claimed.items():
+                if message_id in completed:
+                    continue
+                try:
+                    await webhook_dedup.release(keys)
+                except Exception as release_error:
+                    print(f"Error releasing webhook claim: {str(release_error)}")
+            raise
+
+    async def _process_webhook_emails(
+        self,
+        user: User,
+        emails: List[EmailData],
+        shared: Optional[SharedMessageStages] = None,
+        personalised: bool = True,
+        completed: Optional[Set[str]] = None,
+    ) -> None:
+        """
+        Run new webhook emails through the pipeline for one user.
 
-                    email_for_tasks = EmailData(
-                        id=message_id,
-                        body=parsed_body,
-                        subject=subject,
-                        from_=from_data,
-                    )
+        Args:
+            user: The user the emails were delivered to
+            emails: Parsed emails from the webhook events
+            shared: User-independent results shared with other users of the grant
+            personalised: Extract tasks with the user's personality instead of
+                reusing the shared extraction
+            completed: Filled with the IDs of emails whose processing finished,
+                including their saved tasks, even if a later step fails
+        """
+        if shared is None:
+            shared = SharedMessageStages(self)
+        if completed is None:
+            completed = set()
+
+        classification_result = await self.classify_spams(emails, user.id)
+        non_spam_emails = classification_result.get("non_spam", [])
+        for email in classification_result.get("spam", []):
+            print(
+                f"Email {email.id} classified as spam for user {user.id}, skipping processing"
+            )
+            completed.add(email.id)
+        if len(non_spam_emails) == 0:
+            return
+
+        user_personality = None
+        if user.personality and isinstance(user.personality, list):
+            user_personality = user.personality[:-1]
+            user_personality = "\n".join(user_personality)
+
+        if personalised:
+            success, emails_without_tasks = await self.batch_extract_and_save_tasks(
+                user.id, non_spam_emails, user_personality
+            )
+        else:
+            extractions = await asyncio.gather(
+                *(shared.extraction(email) for email in non_spam_emails)
+            )
+            extracted_tasks = [
+                task_info for tasks, _ in extractions for task_info in tasks
+            ]
+            emails_without_tasks = [
+                email
+                for email, (tasks, _) in zip(non_spam_emails, extractions)
+                if not tasks
+            ]
+            if extracted_tasks:
+                await self.save_extracted_tasks(user.id, extracted_tasks)
+
+        without_tasks = {email.id for email in emails_without_tasks}
+        completed.update(
+            email.id for email in non_spam_emails if email.id not in without_tasks
+        )
 
-                    success, emails_without_tasks = (
-                        await self.batch_extract_and_save_tasks(
-                            user.id, [email_for_tasks], user_personality
-                        )
-                    )
+        async def save_email(email: EmailData) -> None:
+            await self._save_webhook_email(user, email, user_personality, shared)
+            completed.add(email.id)
 
-                    if not success or emails_without_tasks:
-                        print(
-                            f"No tasks extracted from email {message_id}, processing as regular email"
-                        )
+        # Let every email finish before failing, so `completed` is accurate
+        outcomes = await asyncio.gather(
+            *(save_email(email) for email in emails_without_tasks),
+            return_exceptions=True,
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+    async def _save_webhook_email(
+        self,
+        user: User,
+        email: EmailData,
+        user_personality: str,
+        shared: Optional[SharedMessageStages] = None,
+    ) -> None:
+        """
+        Classify, summarize and store a webhook email that yielded no tasks.
 
-                        personality_context = f"User personality: {user_personality}\n\nEmail content: {parsed_body}"
+        Args:
+            user: The user the email was delivered to
+            email: The parsed email
+            user_personality: User personality context
+            shared: User-independent results shared with other users of the grant
+        """
+        if shared is None:
+            shared = SharedMessageStages(self)
+        message_id = email.id
+        print(
+            f"No tasks extracted from email {message_id}, processing as regular email"
+        )
 
-                        classification_coroutine = self.classify_content(
-                            personality_context
-                        )
-                        summary_coroutine = self.content_summarizer.process_content(
-                            parsed_body
-                        )
+        personality_context = (
+            f"User personality: {user_personality}\n\nEmail content: {email.body}"
+        )
 
-                        content_classification, summary_result = await asyncio.gather(
-                            classification_coroutine, summary_coroutine
-                        )
+        content_classification, summary_result = await asyncio.gather(
+            self.classify_content(personality_context),
+            shared.summary(email),
+        )
 
-                        email_classification = content_classification.get(
-                            "type", "drawer"
-                        ).lower()
-                        email_summary = summary_result.get(
-                            "summary", "No summary available"
-                        )
+        email_classification = content_classification.get("type", "drawer").lower()
+        email_summary = summary_result.get("summary", "No summary available")
 
-                        # Update the email node
-                        try:
-
-                            email_node.snippet = email_summary
-                            email_node.subject = subject
-                            email_node.classification = email_classification
-                            email_node.save()
-
-                            try:
-                                user_node = UserNode.nodes.get(userid=user.id)
-                            except UserNode.DoesNotExist:
-                                user_node = UserNode(userid=user.id).save()
-
-                            if not user_node.emails.is_connected(email_node):
-                                user_node.emails.connect(email_node)
-                        except Exception as e:
-                            print(f"Error updating Neo4j email node: {str(e)}")
-
-                        try:
-                            await EmailModel.create_email(
-                                user_id=user.id,
-                                email_data={
-                                    "id": message_id,
-                                    "body": email_summary,  # Store summary in the body field
-                                    "subject": subject,
-                                    "from": from_data,
-                                    "classification": email_classification,
-                                },
-                            )
-                            print(
-                                f"Email {message_id} saved to PostgreSQL with summary and classification: {email_classification}"
-                            )
-                        except Exception as e:
-                            print(f"Error saving email to PostgreSQL: {str(e)}")
-                    else:
-                        print(
-                            f"Tasks extracted from email {message_id}, skipping email save"
-                        )
+        # Create or update the email node
+        try:
+            await graph.merge_email(
+                user.id,
+                message_id,
+                snippet=email_summary,
+                subject=email.subject,
+                classification=email_classification,
+            )
+        except Exception as e:
+            print(f"Error updating Neo4j email node: {str(e)}")
 
-                return True
+        try:
+            await EmailModel.create_email(
+                user_id=user.id,
+                email_data={
+                    "id": message_id,
+                    "body": email_summary,  # Store summary in the body field
+                    "subject": email.subject,
+                    "from": email.from_,
+                    "classification": email_classification,
+                },
+            )
+            print(
+                f"Email {message_id} saved to PostgreSQL with summary and classification: {email_classification}"
+            )
         except Exception as e:
-            print(f"Error processing webhook: {str(e)}")
-            return False
+            print(f"Error saving email to PostgreSQL: {str(e)}")
 
     async def classify_content(self, content: str) -> dict:
         """
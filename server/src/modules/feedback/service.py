@@ -1,7 +1,10 @@
+import asyncio
 from fastapi import Depends, HTTPException
 from src.modules.feedback.schemas import TaskReorderRequest, TaskReorderResponse
 from typing import Optional, List, Dict
 from src.models.graph.nodes import TaskNode
+from src.models.graph.repository import graph
+from src.modules.tasks.ranking import task_ranking
 from src.models.task_scoring import scoring_model
 from src.agents.feedback_learning_agent import FeedbackLearningAgent
 from src.models.user import User
@@ -17,17 +20,10 @@ class FeedbackService:
         """
         Process task reordering feedback and update task scores
         """
-        task = self._get_task(request.task_id, request.classification)
-
-        task_above = (
-            self._get_task(request.task_above_id, request.classification)
-            if request.task_above_id
-            else None
-        )
-        task_below = (
-            self._get_task(request.task_below_id, request.classification)
-            if request.task_below_id
-            else None
+        task, task_above, task_below = await asyncio.gather(
+            self._get_task(request.task_id, request.classification),
+            self._get_task(request.task_above_id, request.classification),
+            self._get_task(request.task_below_id, request.classification),
         )
 
         print(task)
@@ -59,7 +55,8 @@ class FeedbackService:
             if "relevance_score" in updated_scores:
                 task.relevance_score = updated_scores.get("relevance_score")
 
-        task.save()
+        await graph.save_task(task)
+        await task_ranking.record_updated(task)
 
         # Update user personality based on the reordering
         await self.update_user_personality(
@@ -73,15 +70,16 @@ class FeedbackService:
             cost_score=task.cost_score,
         )
 
-    def _get_task(self, task_id: str, classification: str) -> Optional[TaskNode]:
+    async def _get_task(
+        self, task_id: Optional[str], classification: str
+    ) -> Optional[TaskNode]:
         """Fetch the task node by ID and validate its classification."""
-        try:
-            task = TaskNode.nodes.get(task_id=task_id)
-            if task.classification != classification:
-                return None
-            return task
-        except TaskNode.DoesNotExist:
+        if not task_id:
+            return None
+        task = await graph.get_task(task_id)
+        if task is None or task.classification != classification:
             return None
+        return task
 
     def _calculate_new_score(
         self, task, task_above, task_below, direction, adjustment_factor
@@ -0,0 +1,34 @@
+"""
+Bounded thread pool for calls into the synchronous Nylas SDK
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+from src.config import settings
+
+T = TypeVar("T")
+
+# The Nylas SDK blocks on HTTP, so its calls run here instead of on the event loop
+nylas_executor = ThreadPoolExecutor(
+    max_workers=settings.NYLAS_MAX_WORKERS, thread_name_prefix="nylas"
+)
+
+
+async def run_in_nylas_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Nylas SDK call without blocking the event loop
+
+    Args:
+        func: The SDK method to call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The return value of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        nylas_executor, functools.partial(func, *args, **kwargs)
+    )
@@ -0,0 +1,79 @@
+"""
+Per-grant cache of Nylas folder IDs
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.config import settings
+
+
+def build_folder_index(folders: Iterable) -> Dict[str, str]:
+    """
+    Map folder names, IDs and system attributes to folder IDs
+
+    Keys are upper-cased so "INBOX", "Inbox" and a "\\Inbox" attribute all
+    resolve to the provider's ID for that folder.
+
+    Args:
+        folders: Folder objects as returned by the Nylas folders API
+
+    Returns:
+        Dict[str, str]: Upper-cased lookup key -> folder ID
+    """
+    index = {}
+    for folder in folders:
+        folder_id = getattr(folder, "id", None)
+        if not folder_id:
+            continue
+        attributes = getattr(folder, "attributes", None) or []
+        if isinstance(attributes, str):
+            attributes = [attributes]
+        keys = [folder_id, getattr(folder, "name", None) or ""]
+        keys.extend(attribute.lstrip("\\") for attribute in attributes)
+        for key in keys:
+            if key:
+                index.setdefault(key.upper(), folder_id)
+    return index
+
+
+class FolderCache:
+    """
+    In-process cache of folder indexes keyed by grant ID, with a TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = settings.NYLAS_FOLDER_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[Dict[str, str], float]] = {}
+
+    def get(self, grant_id: str) -> Optional[Dict[str, str]]:
+        """Return the cached folder index for a grant, if fresh."""
+        entry = self._entries.get(grant_id)
+        if entry is None:
+            return None
+        index, stored_at = entry
+        if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[grant_id]
+            return None
+        return index
+
+    def put(self, grant_id: str, index: Dict[str, str]) -> None:
+        """Store the folder index for a grant."""
+        self._entries[grant_id] = (index, time.monotonic())
+
+    def invalidate(self, grant_id: str) -> None:
+        """Drop the cached folder index for a grant, if any."""
+        self._entries.pop(grant_id, None)
+
+
+def resolve_folders(index: Dict[str, str], folders: Iterable[str]) -> List[str]:
+    """
+    Translate folder names to IDs, keeping unknown names as given
+
+    Google uses the system names ("INBOX", "SENT") as IDs, so passing an
+    unresolved name through still works there.
+    """
+    return [index.get(folder.upper(), folder) for folder in folders]
+
+
+# Create singleton instance
+folder_cache = FolderCache()
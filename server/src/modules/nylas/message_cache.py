@@ -0,0 +1,125 @@
+"""
+In-process read-through cache of Nylas messages
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from src.config import settings
+from src.utils.lru_cache import BoundedLRUCache
+
+
+class MessageCache(BoundedLRUCache):
+    """
+    Bounded LRU cache of full message dicts keyed by (grant_id, message_id).
+
+    Messages are stored as zlib-compressed JSON, since HTML bodies dominate
+    their size and compress well; the byte budget counts compressed bytes.
+    Entries expire after a TTL so flag and folder changes made in the mail
+    client eventually show up.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.NYLAS_MESSAGE_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.NYLAS_MESSAGE_CACHE_MAX_BYTES,
+        ttl_seconds: float = settings.NYLAS_MESSAGE_CACHE_TTL_SECONDS,
+    ):
+        super().__init__(max_entries, max_bytes, ttl_seconds)
+
+    def get(self, grant_id: str, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached message
+
+        Args:
+            grant_id: The grant the message belongs to
+            message_id: The ID of the message
+
+        Returns:
+            Optional[Dict[str, Any]]: A fresh copy of the message, or None on a miss
+        """
+        compressed = self._lookup((grant_id, message_id))
+        if compressed is None:
+            return None
+        return json.loads(zlib.decompress(compressed))
+
+    def put(self, grant_id: str, message: Dict[str, Any]) -> None:
+        """
+        Store a message, evicting least recently used entries if needed
+
+        Args:
+            grant_id: The grant the message belongs to
+            message: Full message dict as returned by Nylas
+        """
+        message_id = message.get("id")
+        if not message_id:
+            return
+        try:
+            compressed = zlib.compress(json.dumps(message).encode("utf-8"))
+        except (TypeError, ValueError):
+            return
+        self._store((grant_id, message_id), compressed, len(compressed))
+
+    def invalidate(self, grant_id: str, message_id: str) -> None:
+        """Drop a cached message, if any."""
+        self._discard((grant_id, message_id))
+
+
+class PageCache(BoundedLRUCache):
+    """
+    Bounded LRU cache of listing pages keyed by grant and query parameters.
+
+    A page is the response of one messages.list call, so a repeat listing of
+    the same window, cursor included, is served without calling Nylas. Pages
+    are stored as zlib-compressed JSON like messages; the TTL is short because
+    new mail shows up at the head of a listing.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.NYLAS_PAGE_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.NYLAS_PAGE_CACHE_MAX_BYTES,
+        ttl_seconds: float = settings.NYLAS_PAGE_CACHE_TTL_SECONDS,
+    ):
+        super().__init__(max_entries, max_bytes, ttl_seconds)
+
+    @staticmethod
+    def _key(grant_id: str, params: Dict[str, Any]) -> Tuple[str, str]:
+        """Normalize query parameters so equal queries share an entry."""
+        return grant_id, json.dumps(params, sort_keys=True, default=str)
+
+    def get(self, grant_id: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached listing page
+
+        Args:
+            grant_id: The grant the page belongs to
+            params: Query parameters the page was listed with
+
+        Returns:
+            Optional[Dict[str, Any]]: A fresh copy of {"data", "next_cursor"}, or None on a miss
+        """
+        compressed = self._lookup(self._key(grant_id, params))
+        if compressed is None:
+            return None
+        return json.loads(zlib.decompress(compressed))
+
+    def put(self, grant_id: str, params: Dict[str, Any], page: Dict[str, Any]) -> None:
+        """
+        Store a listing page, evicting least recently used entries if needed
+
+        Args:
+            grant_id: The grant the page belongs to
+            params: Query parameters the page was listed with
+            page: Dict with the page's "data" and "next_cursor"
+        """
+        try:
+            compressed = zlib.compress(json.dumps(page).encode("utf-8"))
+        except (TypeError, ValueError):
+            return
+        self._store(self._key(grant_id, params), compressed, len(compressed))
+
+
+# Create singleton instance
+message_cache = MessageCache()
+page_cache = PageCache()
@@ -1,9 +1,16 @@
 """Nylas service implementation."""
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import time
+import weakref
+from typing import AsyncIterator, Optional, Dict, Any, List, Sequence, Union
 from nylas import Client
 from nylas.models.auth import CodeExchangeRequest, CodeExchangeResponse
 from .schemas import EmailData
+from .executor import run_in_nylas_executor
+from .folders import build_folder_index, folder_cache, resolve_folders
+from .message_cache import message_cache, page_cache
+from src.models.mailbox import MailboxSyncState, SyncedMessage, grant_sync_key
 from ...utils.get_text_from_html import get_text_from_html
 from src.models.user import User
 from src.config.settings import (
@@ -11,9 +18,49 @@ from src.config.settings import (
     NYLAS_API_KEY,
     NYLAS_API_URI,
     NYLAS_CALLBACK_URI,
+    NYLAS_PAGE_SIZE,
+    NYLAS_PREFETCH_PAGES,
+    NYLAS_SYNC_LOOKBACK_DAYS,
+    NYLAS_SYNC_MAX_MESSAGES,
+    NYLAS_SYNC_MIN_INTERVAL_SECONDS,
+    NYLAS_SYNC_RETENTION_DAYS,
 )
 import datetime
 
+# Message fields the email pipeline reads; grant_id is required by the SDK
+MESSAGE_FIELDS = (
+    "id",
+    "grant_id",
+    "thread_id",
+    "subject",
+    "from",
+    "to",
+    "cc",
+    "reply_to",
+    "date",
+    "folders",
+    "body",
+    "attachments",
+)
+
+# Folders copied into the local store by sync_since_last
+SYNC_FOLDERS = ["INBOX", "SENT"]
+
+# One sync at a time per grant; concurrent callers wait and reuse its result.
+# Callers hold the lock while syncing or waiting, so an entry disappears once
+# no sync for the grant is running.
+_sync_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _sync_lock(key: str) -> asyncio.Lock:
+    """Get the sync lock of a grant, creating it if no one holds it."""
+    lock = _sync_locks.get(key)
+    if lock is None:
+        lock = _sync_locks[key] = asyncio.Lock()
+    return lock
+
 
 class NylasService:
     """Service for handling Nylas operations."""
@@ -68,7 +115,9 @@ class NylasService:
                 }
             )
 
-            exchange = self.client.auth.exchange_code_for_token(exchange_request)
+            exchange = await run_in_nylas_executor(
+                self.client.auth.exchange_code_for_token, exchange_request
+            )
             return exchange
         except Exception as e:
             raise ValueError(f"Failed to exchange code: {str(e)}")
@@ -103,21 +152,10 @@ class NylasService:
             if query_params:
                 params.update(query_params)
             try:
-                messages = self.client.messages.list(
-                    identifier=grant_id, query_params=params
-                )
+                return await self._list_page(grant_id, params)
             except Exception as e:
                 return {"data": [], "next_cursor": None}
 
-            if not messages or not hasattr(messages, "data"):
-                return {"data": [], "next_cursor": None}
-
-            response = {
-                "data": [message.to_dict() for message in messages.data],
-                "next_cursor": messages.next_cursor,
-            }
-            return response
-
         except Exception as e:
             print(f"[DEBUG] Error in get_messages: {str(e)}")
             import traceback
@@ -125,9 +163,158 @@ class NylasService:
             print(f"[DEBUG] Traceback: {traceback.format_exc()}")
             return {"data": [], "next_cursor": None}
 
+    async def iter_messages(
+        self,
+        grant_id: str,
+        since: Optional[Union[datetime.datetime, int]] = None,
+        folders: Optional[List[str]] = None,
+        page_size: int = NYLAS_PAGE_SIZE,
+        prefetch: int = NYLAS_PREFETCH_PAGES,
+        max_messages: Optional[int] = None,
+        query_params: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = MESSAGE_FIELDS,
+        raise_errors: bool = False,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream messages for a grant page by page, following next_cursor.
+
+        Up to `prefetch` pages are downloaded ahead of the consumer, so the
+        caller can process one page while the next ones are in flight. Leaving
+        the loop early stops the download. Folder filtering and field
+        selection are done by Nylas, so only matching messages and the
+        requested fields are transferred.
+
+        Args:
+            grant_id: The grant ID to get messages for
+            since: Only return messages received after this time (datetime or unix timestamp)
+            folders: Only return messages in these folders (names or IDs)
+            page_size: Number of messages to request per page
+            prefetch: Number of pages to download ahead of the consumer
+            max_messages: Stop after yielding this many messages
+            query_params: Additional query parameters for filtering messages
+            fields: Message fields to return, or None for all fields
+            raise_errors: Raise if a page fails to download instead of
+                ending the stream early
+
+        Yields:
+            List of message dicts for each page
+        """
+        params = dict(query_params or {})
+        if since is not None:
+            if isinstance(since, datetime.datetime):
+                since = int(since.timestamp())
+            params["received_after"] = since
+        if folders:
+            params["in"] = await self.resolve_folder_ids(grant_id, folders)
+        if fields:
+            params["select"] = ",".join(fields)
+
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+        errors: List[Exception] = []
+
+        async def download():
+            page_params = dict(params, limit=page_size)
+            try:
+                while True:
+                    response = await self._list_page(grant_id, dict(page_params))
+                    await pages.put(response["data"])
+                    if not response["next_cursor"]:
+                        break
+                    page_params["page_token"] = response["next_cursor"]
+            except Exception as e:
+                print(f"[DEBUG] Error in iter_messages: {str(e)}")
+                errors.append(e)
+            # End of stream marker
+            await pages.put(None)
+
+        downloader = asyncio.create_task(download())
+        yielded = 0
+        try:
+            while True:
+                messages = await pages.get()
+                if messages is None:
+                    if errors and raise_errors:
+                        raise errors[0]
+                    break
+                if max_messages is not None:
+                    messages = messages[: max_messages - yielded]
+                if messages:
+                    yielded += len(messages)
+                    yield messages
+                if max_messages is not None and yielded >= max_messages:
+                    break
+        finally:
+            downloader.cancel()
+
+    async def _list_page(self, grant_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        List one page of messages, from the page cache when possible.
+
+        Pages listed without a field selection hold full messages, which are
+        also written to the message cache for later get_message calls.
+
+        Args:
+            grant_id: The grant ID to list messages for
+            params: Query parameters for messages.list
+
+        Returns:
+            Dict containing the page's messages and next cursor
+
+        Raises:
+            Exception: If the SDK call fails
+        """
+        cached = page_cache.get(grant_id, params)
+        if cached is not None:
+            return cached
+
+        messages = await run_in_nylas_executor(
+            self.client.messages.list,
+            identifier=grant_id,
+            query_params=dict(params),
+        )
+        if not messages or not hasattr(messages, "data"):
+            return {"data": [], "next_cursor": None}
+
+        response = {
+            "data": [message.to_dict() for message in messages.data],
+            "next_cursor": messages.next_cursor,
+        }
+        page_cache.put(grant_id, params, response)
+        if "select" not in params:
+            for message in response["data"]:
+                message_cache.put(grant_id, message)
+        return response
+
+    async def resolve_folder_ids(self, grant_id: str, folders: List[str]) -> List[str]:
+        """
+        Translate folder names such as "INBOX" to the grant's folder IDs.
+
+        The folder list is fetched once per grant and cached. If it cannot be
+        fetched, the names are returned unchanged.
+
+        Args:
+            grant_id: The grant ID the folders belong to
+            folders: Folder names, system attributes or IDs
+
+        Returns:
+            List of folder IDs to pass as the "in" filter
+        """
+        index = folder_cache.get(grant_id)
+        if index is None:
+            try:
+                response = await run_in_nylas_executor(
+                    self.client.folders.list, identifier=grant_id
+                )
+                index = build_folder_index(response.data)
+                folder_cache.put(grant_id, index)
+            except Exception as e:
+                print(f"[DEBUG] Error listing folders: {str(e)}")
+                index = {}
+        return resolve_folders(index, folders)
+
     async def get_message(self, grant_id: str, message_id: str) -> Dict[str, Any]:
         """
-        Get a specific message.
+        Get a specific message, from the message cache when possible.
         Args:
             grant_id: The grant ID to get the message for
             message_id: The ID of the message to get
@@ -136,50 +323,262 @@ class NylasService:
         Raises:
             Exception: If fetching the message fails
         """
+        cached = message_cache.get(grant_id, message_id)
+        if cached is not None:
+            return cached
         try:
-            message = self.client.messages.find(
-                identifier=grant_id, message_id=message_id
+            message = await run_in_nylas_executor(
+                self.client.messages.find,
+                identifier=grant_id,
+                message_id=message_id,
             )
-            return message.data.to_dict()
+            result = message.data.to_dict()
+            message_cache.put(grant_id, result)
+            return result
         except Exception as e:
             raise Exception(f"{str(e)}")
 
-    async def fetch_last_two_weeks_emails_sent_by_user(
+    async def sync_since_last(
         self,
         grant_id: str,
+        since: Optional[Union[datetime.datetime, int]] = None,
+        max_messages: int = NYLAS_SYNC_MAX_MESSAGES,
+    ) -> int:
+        """
+        Copy messages received since the last sync into the local store.
+
+        Only messages after the grant's high-water mark are requested, plus a
+        backfill when `since` is older than anything synced so far. Calls made
+        within NYLAS_SYNC_MIN_INTERVAL_SECONDS of the previous sync reuse it,
+        so back-to-back fetches for the same grant share one sync. Each new
+        sync purges messages older than NYLAS_SYNC_RETENTION_DAYS.
+
+        Args:
+            grant_id: The grant ID to sync
+            since: Oldest receive time that must be covered; the sync always
+                covers at least the last NYLAS_SYNC_LOOKBACK_DAYS days and
+                never goes past the retention window
+            max_messages: Maximum number of messages to pull per window
+
+        Returns:
+            Number of messages fetched from Nylas
+        """
+        now = int(time.time())
+        lookback = now - NYLAS_SYNC_LOOKBACK_DAYS * 24 * 60 * 60
+        retention_days = max(NYLAS_SYNC_RETENTION_DAYS, NYLAS_SYNC_LOOKBACK_DAYS)
+        retention = now - retention_days * 24 * 60 * 60
+        if isinstance(since, datetime.datetime):
+            since = int(since.timestamp())
+        since = lookback if since is None else max(min(int(since), lookback), retention)
+        key = grant_sync_key(grant_id)
+
+        async with _sync_lock(key):
+            state = await MailboxSyncState.get_or_none(grant_key=key)
+            if state is None:
+                fetched, newest, oldest = await self._sync_window(
+                    grant_id, key, since, None, max_messages
+                )
+                await MailboxSyncState.create(
+                    grant_key=key,
+                    synced_from=oldest if fetched >= max_messages else since,
+                    synced_until=newest or since,
+                    last_synced_at=now,
+                )
+                return fetched
+
+            fetched = 0
+            if since < state.synced_from:
+                count, _, oldest = await self._sync_window(
+                    grant_id, key, since, state.synced_from, max_messages
+                )
+                fetched += count
+                state.synced_from = oldest if count >= max_messages else since
+
+            if now - state.last_synced_at >= NYLAS_SYNC_MIN_INTERVAL_SECONDS:
+                # Re-read the boundary second; already synced messages are skipped
+                count, newest, oldest = await self._sync_window(
+                    grant_id, key, state.synced_until - 1, None, max_messages
+                )
+                fetched += count
+                if count >= max_messages:
+                    # Too many new messages: coverage restarts at the oldest one
+                    state.synced_from = oldest
+                if newest:
+                    state.synced_until = max(state.synced_until, newest)
+                state.last_synced_at = now
+
+                # Drop messages that aged out of the retention window
+                await SyncedMessage.purge_before(key, retention)
+                state.synced_from = max(state.synced_from, retention)
+
+            await state.save()
+            return fetched
+
+    async def _sync_window(
+        self,
+        grant_id: str,
+        key: str,
+        received_after: int,
+        received_before: Optional[int],
+        max_messages: int,
+    ) -> tuple:
+        """
+        Stream one receive-time window into the local store.
+
+        Returns:
+            Tuple of (messages fetched, newest received_at, oldest received_at)
+        """
+        query_params = {"received_before": received_before} if received_before else None
+        fetched, newest, oldest = 0, None, None
+        async for page in self.iter_messages(
+            grant_id,
+            since=received_after,
+            folders=SYNC_FOLDERS,
+            max_messages=max_messages,
+            query_params=query_params,
+            raise_errors=True,
+        ):
+            await SyncedMessage.store_page(key, page)
+            fetched += len(page)
+            for message in page:
+                date = int(message.get("date") or 0)
+                newest = date if newest is None else max(newest, date)
+                oldest = date if oldest is None else min(oldest, date)
+        return fetched, newest, oldest
+
+    async def fetch_recent_emails(
+        self,
+        grant_id: str,
+        days: int,
+        folders: List[str],
         limit: int = 100,
         query_params: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Fetch emails from the last two weeks.
+        Fetch recent emails in the given folders, newest first.
+
+        Served from the local store after an incremental sync. Requests with
+        extra query parameters, or when the store is unavailable, go to Nylas
+        directly.
 
         Args:
             grant_id: The GrantID of the user
-            limit: Maximum number of emails to fetch
+            days: How many days back to look
+            folders: Folder names to include, e.g. ["INBOX"]
+            limit: Maximum number of emails to return
             query_params: Additional query parameters
 
         Returns:
             List of email objects
         """
+        since = int(
+            (datetime.datetime.now() - datetime.timedelta(days=days)).timestamp()
+        )
+
+        if not query_params:
+            try:
+                await self.sync_since_last(grant_id, since=since)
+                folder_ids = await self.resolve_folder_ids(grant_id, folders)
+                return await SyncedMessage.get_recent(
+                    grant_sync_key(grant_id), since, folder_ids, limit
+                )
+            except Exception as e:
+                print(f"[DEBUG] Mailbox sync failed, fetching directly: {str(e)}")
+
+        emails = []
+        async for page in self.iter_messages(
+            grant_id,
+            since=since,
+            folders=folders,
+            page_size=min(limit, NYLAS_PAGE_SIZE),
+            max_messages=limit,
+            query_params=query_params,
+        ):
+            emails.extend(page)
+        return emails
+
+    async def iter_recent_emails(
+        self,
+        grant_id: str,
+        days: int,
+        folders: List[str],
+        max_messages: int,
+        page_size: int = NYLAS_PAGE_SIZE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream recent emails in the given folders page by page, newest first.
+
+        When a sync made within NYLAS_SYNC_MIN_INTERVAL_SECONDS covers the
+        window, pages come from the local store. Otherwise they are streamed
+        from Nylas with iter_messages, so the caller processes each page while
+        the next ones download instead of waiting for a full sync.
+
+        Args:
+            grant_id: The GrantID of the user
+            days: How many days back to look
+            folders: Folder names to include, e.g. ["INBOX"]
+            max_messages: Stop after yielding this many messages
+            page_size: Number of messages per page
+
+        Yields:
+            List of message dicts for each page
+        """
+        now = int(time.time())
+        since = now - days * 24 * 60 * 60
+        key = grant_sync_key(grant_id)
         try:
-            two_weeks_ago = int(
-                (datetime.datetime.now() - datetime.timedelta(days=21)).timestamp()
+            state = await MailboxSyncState.get_or_none(grant_key=key)
+        except Exception as e:
+            print(f"[DEBUG] Mailbox sync state unavailable: {str(e)}")
+            state = None
+
+        if (
+            state is not None
+            and state.synced_from <= since
+            and now - state.last_synced_at < NYLAS_SYNC_MIN_INTERVAL_SECONDS
+        ):
+            folder_ids = await self.resolve_folder_ids(grant_id, folders)
+            emails = await SyncedMessage.get_recent(
+                key, since, folder_ids, max_messages
             )
+            for start in range(0, len(emails), page_size):
+                yield emails[start : start + page_size]
+            return
+
+        async for page in self.iter_messages(
+            grant_id,
+            since=since,
+            folders=folders,
+            page_size=page_size,
+            max_messages=max_messages,
+        ):
+            yield page
 
-            params = {"received_after": two_weeks_ago, "limit": limit, "in": "SENT"}
+    async def fetch_last_two_weeks_emails_sent_by_user(
+        self,
+        grant_id: str,
+        limit: int = 100,
+        query_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch emails from the last two weeks.
 
-            if query_params:
-                params.update(query_params)
+        Args:
+            grant_id: The GrantID of the user
+            limit: Maximum number of emails to fetch
+            query_params: Additional query parameters
 
-            emails = await self.get_messages(
-                grant_id=grant_id, limit=limit, query_params=params
+        Returns:
+            List of email objects
+        """
+        try:
+            return await self.fetch_recent_emails(
+                grant_id,
+                days=21,
+                folders=["SENT"],
+                limit=limit,
+                query_params=query_params,
             )
-            all_emails = emails.get("data", [])
-            sent_emails = [
-                email for email in all_emails if "SENT" in email.get("folders", [])
-            ]
-            return sent_emails
-
         except Exception as e:
             print(
                 f"[DEBUG] Error in fetch_last_two_weeks_emails_sent_by_user: {str(e)}"
@@ -207,29 +606,14 @@ class NylasService:
         Returns:
             List of email objects
         """
-        two_weeks_ago = int(
-            (datetime.datetime.now() - datetime.timedelta(days=days)).timestamp()
+        return await self.fetch_recent_emails(
+            grant_id,
+            days=days,
+            folders=["INBOX"],
+            limit=limit,
+            query_params=query_params,
         )
 
-        # Prepare query parameters
-        params = {
-            "received_after": two_weeks_ago,
-            "limit": limit,
-        }
-
-        if query_params:
-            params.update(query_params)
-        # Fetch emails
-        emails = await self.get_messages(
-            grant_id=grant_id, limit=limit, query_params=params
-        )
-
-        all_emails = emails.get("data", [])
-        inbox_emails = [
-            email for email in all_emails if "INBOX" in email.get("folders", [])
-        ]
-        return inbox_emails
-
     async def get_filtered_onboarding_messages(
         self,
         grant_id: str,
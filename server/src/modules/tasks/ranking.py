@@ -0,0 +1,172 @@
+"""
+Per-user task ranking kept next to the graph.
+
+TaskService and FeedbackService record every task write here, and ordered
+task lists are read from the task_rankings table instead of the graph. A
+user's ranking is built from the graph on their first read.
+
+Rebuild rankings from the graph (all users, or one) from the server directory:
+    python -m src.modules.tasks.ranking [--user USER_ID]
+"""
+
+import argparse
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from tortoise import timezone
+from src.config import settings
+from src.models.graph.nodes import TaskNode
+from src.models.graph.repository import TASK_PAGE_FIELDS, graph
+from src.models.ranking import TaskRanking, TaskRankingState
+
+
+def task_fields(task: TaskNode) -> Dict[str, Any]:
+    """Return the ranked fields of a task node."""
+    fields = {field: getattr(task, field, None) for field in TASK_PAGE_FIELDS}
+    fields["messageId"] = getattr(task, "messageId", None)
+    return fields
+
+
+class TaskRankingIndex:
+    """
+    Keeps task_rankings in step with task writes and serves ordered pages.
+
+    Write hooks never fail the graph write they follow: errors are logged and
+    the affected users' rankings are marked unbuilt, so their next read
+    rebuilds from the graph. Concurrent first reads of a user share one build.
+    """
+
+    def __init__(self, enabled: bool = settings.TASK_RANKING_ENABLED):
+        self.enabled = enabled
+        # user_id -> [lock, number of readers holding or waiting for it]
+        self._build_locks: Dict[str, List[Any]] = {}
+
+    async def _invalidate(
+        self, user_ids: Optional[List[str]] = None, task_id: Optional[str] = None
+    ) -> None:
+        """Mark rankings unbuilt after a failed write hook."""
+        try:
+            if user_ids is None:
+                user_ids = await TaskRanking.users_of_task(task_id)
+            await TaskRankingState.invalidate(user_ids)
+        except Exception as e:
+            print(f"Error invalidating task ranking: {str(e)}")
+
+    async def record_created(self, user_id: str, tasks: List[TaskNode]) -> None:
+        """Add newly created tasks to the user's ranking."""
+        if not self.enabled or not tasks:
+            return
+        try:
+            await TaskRanking.upsert_tasks(user_id, [task_fields(t) for t in tasks])
+        except Exception as e:
+            print(f"Error updating task ranking for user {user_id}: {str(e)}")
+            await self._invalidate(user_ids=[user_id])
+
+    async def record_updated(self, task: TaskNode) -> None:
+        """Apply a task's current fields to its ranking rows."""
+        if not self.enabled:
+            return
+        try:
+            changes = task_fields(task)
+            # The email link does not change on update and is not loaded here
+            changes.pop("messageId")
+            await TaskRanking.update_task(task.task_id, changes)
+        except Exception as e:
+            print(f"Error updating task ranking for task {task.task_id}: {str(e)}")
+            await self._invalidate(task_id=task.task_id)
+
+    async def record_deleted(self, task_id: str) -> None:
+        """Remove a deleted task from every ranking."""
+        if not self.enabled:
+            return
+        try:
+            await TaskRanking.remove_task(task_id)
+        except Exception as e:
+            print(f"Error updating task ranking for task {task_id}: {str(e)}")
+            await self._invalidate(task_id=task_id)
+
+    async def rebuild(self, user_id: str) -> int:
+        """
+        Rebuild a user's ranking from the graph
+
+        The graph read is merged into the ranking, so tasks created or
+        updated while it runs keep the rows their write hooks recorded.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            int: Number of ranked tasks
+        """
+        read_at = timezone.now()
+        tasks = await graph.get_task_page(str(user_id))
+        await TaskRanking.merge_user(str(user_id), tasks, read_at)
+        return len(tasks)
+
+    async def get_page(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        classification: Optional[str] = None,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of a user's tasks from the ranking, building it if needed
+
+        Args:
+            user_id: The ID of the user
+            limit: Maximum number of tasks; None returns all of them
+            classification: Only return tasks with this classification
+            after: (relevance_score, task_id) of the last task already seen
+
+        Returns:
+            List[Dict[str, Any]]: Tasks with TaskResponse fields and messageId
+        """
+        user_id = str(user_id)
+        if not await TaskRankingState.is_built(user_id):
+            entry = self._build_locks.setdefault(user_id, [asyncio.Lock(), 0])
+            entry[1] += 1
+            try:
+                async with entry[0]:
+                    if not await TaskRankingState.is_built(user_id):
+                        await self.rebuild(user_id)
+            finally:
+                # Drop the lock once no reader holds or waits for it
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._build_locks.pop(user_id, None)
+        return await TaskRanking.get_page(user_id, limit, classification, after)
+
+
+# Create singleton instance
+task_ranking = TaskRankingIndex()
+
+
+async def main(user_id: Optional[str]) -> None:
+    """Rebuild the ranking of one user, or of every user."""
+    from src.database import init_db, close_db
+    from src.models.user import User
+
+    await init_db()
+    try:
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = [
+                str(uid) for uid in await User.all().values_list("id", flat=True)
+            ]
+        for uid in user_ids:
+            try:
+                count = await task_ranking.rebuild(uid)
+                print(f"Rebuilt ranking of user {uid}: {count} tasks")
+            except Exception as e:
+                print(f"Error rebuilding ranking of user {uid}: {str(e)}")
+    finally:
+        await graph.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--user", help="Only rebuild this user's ranking")
+    args = parser.parse_args()
+    asyncio.run(main(args.user))
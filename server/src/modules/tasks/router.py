@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from typing import List, Optional
 from .schemas import TaskCreate, TaskUpdate, TaskResponse
 from .service import TaskService
 from src.dependencies import get_current_user
@@ -43,9 +43,28 @@ async def get_task_by_message_id(message_id: str):
 
 
 @router.get("/user/{user_id}", response_model=List[TaskResponse])
-async def get_user_tasks(user_id: str):
-    """Get all tasks for a specific user"""
-    tasks = await TaskService.get_tasks_by_user(user_id)
+async def get_user_tasks(
+    user_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    classification: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """
+    Get the tasks of a user, most relevant first
+
+    Without `limit` all tasks are returned. With it, the top `limit` tasks
+    are returned and, if there are more, the X-Next-Cursor response header
+    holds the `cursor` for the next page.
+    """
+    try:
+        tasks, next_cursor = await TaskService.get_tasks_by_user(
+            user_id, limit=limit, classification=classification, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return tasks
 
 
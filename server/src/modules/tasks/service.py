@@ -1,14 +1,34 @@
 from datetime import datetime, UTC
 from typing import List, Optional, Dict, Any, Tuple
-from src.models.graph.nodes import TaskNode, EmailNode, UserNode
+from src.models.graph.nodes import TaskNode, EmailNode
+from src.models.graph.repository import graph
 from src.models.user import Features, User
 from .schemas import TaskCreate, TaskUpdate
+from .ranking import task_ranking
 import uuid
-from neomodel import db
+import base64
+import json
 from src.models.user import EmailModel
 
 
+def encode_task_cursor(relevance_score: Optional[float], task_id: str) -> str:
+    """Encode the position after a task as an opaque page cursor."""
+    raw = json.dumps([relevance_score or 0.0, task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_task_cursor(cursor: str) -> Tuple[float, str]:
+    """Decode a page cursor into (relevance_score, task_id)."""
+    try:
+        score, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(score), str(task_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
 class TaskService:
+    # Tasks written per UNWIND statement in batch_create_tasks
+    BULK_WRITE_BATCH_SIZE = 500
 
     @staticmethod
     async def create_task(
@@ -29,9 +49,6 @@ class TaskService:
         Returns:
             TaskNode: The created task node
         """
-        # First get the email node
-        email = TaskService.ensure_graph_nodes(user_id, task_data.messageId)
-
         # Create task node with classification included
         print("creating tasks")
         task = TaskNode(
@@ -43,12 +60,13 @@ class TaskService:
             cost_score=task_data.cost_score,
             relevance_score=task_data.relevance_score,
             classification=task_data.classification,
-        ).save()
-
-        # Connect task to email
-        email.tasks.connect(task)
+        )
         task.messageId = task_data.messageId
 
+        # Create the task under its email (and the email under the user)
+        await graph.create_tasks(user_id, [task])
+        await task_ranking.record_created(user_id, [task])
+
         # Save features if provided
         if utility_features and cost_features:
             try:
@@ -75,6 +93,9 @@ class TaskService:
         """
         Create multiple tasks at once and connect them to their respective emails
 
+        Graph nodes are written with one UNWIND statement per
+        BULK_WRITE_BATCH_SIZE tasks and features with one bulk insert.
+
         Args:
             task_data_list: List of task data to create
             user_id: The ID of the user
@@ -85,8 +106,6 @@ class TaskService:
         Returns:
             List[TaskNode]: The created task nodes
         """
-        created_tasks = []
-
         # Validate input
         if message_ids and len(message_ids) != len(task_data_list):
             raise ValueError("message_ids must have the same length as task_data_list")
@@ -101,157 +120,160 @@ class TaskService:
                 "cost_features_list must have the same length as task_data_list"
             )
 
-        # For each task, create the task and connect it to the email
+        # Build the task nodes in memory; they are written below in bulk
+        tasks = []
         for i, task_data in enumerate(task_data_list):
+            task = TaskNode(
+                task_id=str(uuid.uuid4()),
+                task=task_data.task,
+                priority=task_data.priority,
+                deadline=task_data.deadline if task_data.deadline else "No Deadline",
+                utility_score=task_data.utility_score,
+                cost_score=task_data.cost_score,
+                relevance_score=task_data.relevance_score,
+                classification=task_data.classification,
+            )
+            task.messageId = message_ids[i] if message_ids else task_data.messageId
+            tasks.append(task)
+
+        created_tasks = []
+        created_indexes = []
+        for start in range(0, len(tasks), TaskService.BULK_WRITE_BATCH_SIZE):
+            chunk = tasks[start : start + TaskService.BULK_WRITE_BATCH_SIZE]
             try:
-                # Determine message ID
-                message_id = message_ids[i] if message_ids else task_data.messageId
-
-                # Get or create email node
-                email = TaskService.ensure_graph_nodes(user_id, message_id)
-
-                # Create task node
-                task = TaskNode(
-                    task_id=str(uuid.uuid4()),
-                    task=task_data.task,
-                    priority=task_data.priority,
-                    deadline=(
-                        task_data.deadline if task_data.deadline else "No Deadline"
-                    ),
-                    utility_score=task_data.utility_score,
-                    cost_score=task_data.cost_score,
-                    relevance_score=task_data.relevance_score,
-                    classification=task_data.classification,
-                ).save()
-
-                # Connect task to email
-                email.tasks.connect(task)
-                task.messageId = message_id
-
-                # Save features if provided
-                if utility_features_list and cost_features_list:
-                    try:
-                        await Features.create_features(
-                            user_id=user_id,
-                            task_id=task.task_id,
-                            utility_features=utility_features_list[i],
-                            cost_features=cost_features_list[i],
-                        )
-                    except Exception as e:
-                        print(
-                            f"Error saving features for task {task.task_id}: {str(e)}"
-                        )
-
-                created_tasks.append(task)
+                await graph.create_tasks(user_id, chunk)
             except Exception as e:
-                print(f"Error creating task {i}: {str(e)}")
-                # Continue with next task instead of failing the entire batch
+                print(
+                    f"Error creating tasks {start}-{start + len(chunk) - 1}: {str(e)}"
+                )
+                continue
+            created_tasks.extend(chunk)
+            created_indexes.extend(range(start, start + len(chunk)))
+
+        await task_ranking.record_created(user_id, created_tasks)
+
+        # Save features if provided
+        if utility_features_list and cost_features_list and created_tasks:
+            try:
+                await Features.bulk_create_features(
+                    user_id=user_id,
+                    task_ids=[task.task_id for task in created_tasks],
+                    utility_features_list=[
+                        utility_features_list[i] for i in created_indexes
+                    ],
+                    cost_features_list=[cost_features_list[i] for i in created_indexes],
+                )
+            except Exception as e:
+                print(f"Error saving features for {len(created_tasks)} tasks: {str(e)}")
 
         return created_tasks
 
     @staticmethod
-    def ensure_graph_nodes(user_id: str, message_id: str) -> EmailNode:
+    async def ensure_graph_nodes(user_id: str, message_id: str) -> EmailNode:
         """
         Ensure User and Email nodes exist in the graph database
         Returns the EmailNode (creates if doesn't exist)
         """
-        # Ensure user node exists
-        try:
-            user_node = UserNode.nodes.get(userid=str(user_id))
-        except UserNode.DoesNotExist:
-            user_node = UserNode(userid=user_id).save()
-
-        # Ensure email node exists and is connected to user
-        try:
-            email_node = EmailNode.nodes.get(messageId=message_id)
-        except EmailNode.DoesNotExist:
-            email_node = EmailNode(messageId=message_id).save()
-            user_node.emails.connect(email_node)
-
-        return email_node
+        return await graph.merge_email(user_id, message_id)
 
     @staticmethod
     async def get_task(task_id: str) -> Optional[TaskNode]:
         """Get a task by task_id"""
-        try:
-            task = TaskNode.nodes.get(task_id=task_id)
-            return task
-        except TaskNode.DoesNotExist:
-            return None
+        return await graph.get_task(task_id)
 
     @staticmethod
     async def get_task_by_message_id(message_id: str) -> List[TaskNode]:
         """Get all tasks associated with a message ID"""
-        query = """
-        MATCH (e:EmailNode {messageId: $message_id})-[:CONTAINS_TASK]->(t:TaskNode)
-        RETURN t
-        """
-        results, _ = db.cypher_query(query, {"message_id": message_id})
-        return [TaskNode.inflate(row[0]) for row in results]
+        return await graph.get_tasks_by_message_id(message_id)
 
     @staticmethod
-    async def get_tasks_by_user(user_id: str) -> List[TaskNode]:
-        """Get all tasks for a specific user through the user->email->task relationship"""
-        query = """
-        MATCH (u:UserNode {userid: $user_id})-[:HAS_EMAIL]->(e:EmailNode)-[:CONTAINS_TASK]->(t:TaskNode)
-        RETURN t
-        ORDER BY t.relevance_score DESC
+    async def get_tasks_by_user(
+        user_id: str,
+        limit: Optional[int] = None,
+        classification: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        try:
-            results, _ = db.cypher_query(query, {"user_id": user_id})
-            return [TaskNode.inflate(row[0]) for row in results]
-        except Exception as e:
-            print(f"Error getting tasks for user {user_id}: {str(e)}")
-            return []
+        Get a page of tasks for a user, read from the task ranking
+
+        Falls back to the user->email->task traversal in the graph when the
+        ranking is disabled or unavailable.
+
+        Args:
+            user_id: The ID of the user
+            limit: Maximum number of tasks (top-K); None returns all of them
+            classification: Only return tasks with this classification
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            Tuple containing:
+            - List: Tasks ordered by relevance, with TaskResponse fields
+            - Optional[str]: Cursor of the next page, None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_task_cursor(cursor) if cursor else None
+        # Fetch one extra task to learn whether another page exists
+        page = {
+            "limit": limit + 1 if limit is not None else None,
+            "classification": classification,
+            "after": after,
+        }
+        tasks = None
+        if task_ranking.enabled:
+            try:
+                tasks = await task_ranking.get_page(user_id, **page)
+            except Exception as e:
+                print(f"Error reading task ranking for user {user_id}: {str(e)}")
+        if tasks is None:
+            try:
+                tasks = await graph.get_task_page(user_id, **page)
+            except Exception as e:
+                print(f"Error getting tasks for user {user_id}: {str(e)}")
+                return [], None
+
+        if limit is None or len(tasks) <= limit:
+            return tasks, None
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        return tasks, encode_task_cursor(last.get("relevance_score"), last["task_id"])
 
     @staticmethod
     async def update_task(task_id: str, task_data: TaskUpdate) -> Optional[TaskNode]:
         """Update a task by task_id"""
-        try:
-            task = TaskNode.nodes.get(task_id=task_id)
+        task = await graph.get_task(task_id)
+        if task is None:
+            return None
 
-            update_data = task_data.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(task, key, value)
+        update_data = task_data.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(task, key, value)
 
-            task.updatedAt = datetime.now(UTC)
-            task.save()
-            return task
-        except TaskNode.DoesNotExist:
+        task.updatedAt = datetime.now(UTC)
+        if not await graph.save_task(task):
             return None
+        await task_ranking.record_updated(task)
+        return task
 
     @staticmethod
     async def delete_task(task_id: str) -> bool:
         """Delete a task by task_id"""
-        try:
-            task = TaskNode.nodes.get(task_id=task_id)
-            # This will also remove all relationships
-            task.delete()
-            return True
-        except TaskNode.DoesNotExist:
-            return False
+        # This will also remove all relationships
+        deleted = await graph.delete_task(task_id)
+        if deleted:
+            await task_ranking.record_deleted(task_id)
+        return deleted
 
     @staticmethod
     async def add_task_dependency(task_id: str, depends_on_task_id: str) -> bool:
         """Add a dependency relationship between tasks"""
-        try:
-            task = TaskNode.nodes.get(task_id=task_id)
-            depends_on_task = TaskNode.nodes.get(task_id=depends_on_task_id)
-
-            task.depends_on.connect(depends_on_task)
-            return True
-        except TaskNode.DoesNotExist:
-            return False
+        return await graph.add_task_dependency(task_id, depends_on_task_id)
 
     @staticmethod
     async def get_task_dependencies(task_id: str) -> List[TaskNode]:
         """Get all tasks that this task depends on"""
-        query = """
-        MATCH (t:Task {task_id: $task_id})-[:DEPENDS_ON]->(d:Task)
-        RETURN d
-        """
-        results, _ = db.cypher_query(query, {"task_id": task_id})
-        return [TaskNode.inflate(row[0]) for row in results]
+        return await graph.get_task_dependencies(task_id)
 
     @staticmethod
     async def get_task_features(task_id: str) -> Optional[Dict[str, Any]]:
@@ -303,23 +325,16 @@ class TaskService:
         Returns:
             List[Dict[str, Any]]: List of email nodes with the specified classification
         """
-        query = """
-        MATCH (u:UserNode {userid: $user_id})-[:HAS_EMAIL]->(e:EmailNode)
-        WHERE e.classification = $classification
-        RETURN e
-        """
         try:
-            results, _ = db.cypher_query(
-                query, {"user_id": str(user_id), "classification": classification}
-            )
+            emails = await graph.get_emails_by_classification(user_id, classification)
             return [
                 {
-                    "messageId": row[0].get("messageId"),
-                    "snippet": row[0].get("snippet"),
-                    "subject": row[0].get("subject"),
-                    "classification": row[0].get("classification"),
+                    "messageId": email.get("messageId"),
+                    "snippet": email.get("snippet"),
+                    "subject": email.get("subject"),
+                    "classification": email.get("classification"),
                 }
-                for row in results
+                for email in emails
             ]
         except Exception as e:
             print(f"Error getting {classification} emails for user {user_id}: {str(e)}")
@@ -1,7 +1,9 @@
 """Utility for encryption and decryption of sensitive data."""
 
+import hashlib
+import hmac
 from cryptography.fernet import Fernet
-from src.config.settings import SECRET_KEY
+from src.config.settings import SECRET_KEY, BLIND_INDEX_KEY
 
 
 class Encryption:
@@ -12,6 +14,10 @@ class Encryption:
 
         key = base64.urlsafe_b64encode(SECRET_KEY.encode().ljust(32)[:32])
         self.cipher = Fernet(key)
+        # Derived separately so the index key never doubles as the cipher key
+        self.index_key = hmac.new(
+            BLIND_INDEX_KEY.encode(), b"blind-index", hashlib.sha256
+        ).digest()
 
     def encrypt(self, data: str) -> str:
         """
@@ -39,5 +45,21 @@ class Encryption:
         decrypted_data = self.cipher.decrypt(encrypted_data.encode())
         return decrypted_data.decode()
 
+    def blind_index(self, data: str) -> str:
+        """
+        Compute a deterministic, keyed index for a value stored encrypted.
+
+        Fernet ciphertexts are randomized, so encrypted columns cannot be
+        searched; the HMAC can be stored next to them and queried by equality
+        without revealing the value.
+        Args:
+            data: Plain-text value
+        Returns:
+            str: Hex-encoded HMAC-SHA256 of the value
+        """
+        if not data:
+            return None
+        return hmac.new(self.index_key, data.encode(), hashlib.sha256).hexdigest()
+
 
 encryption = Encryption()
@@ -83,26 +83,24 @@ async def batch_calculate_task_scores(
     elif len(deadlines) != num_tasks:
         raise ValueError("deadlines must have the same length as feature lists")
 
-    all_features = []
-    for i in range(num_tasks):
-        task_data = {
-            "utility_features": utility_features[i],
-            "cost_features": cost_features[i],
-            "priority": priorities[i],
-            "deadline": deadlines[i],
-        }
-        features = scoring_model.extract_features(task_data)
-        all_features.append(features)
-
-    utility_scores = await scoring_model.batch_predict_utility(all_features, user_id)
-    cost_scores = await scoring_model.batch_predict_cost(all_features, user_id)
-
-    relevance_scores = [
-        scoring_model.calculate_relevance(utility_scores[i], cost_scores[i])
-        for i in range(num_tasks)
-    ]
-
-    return [
-        (relevance_scores[i], utility_scores[i], cost_scores[i])
-        for i in range(num_tasks)
-    ]
+    if num_tasks == 0:
+        return []
+
+    # Build one (N, 12) utility matrix and one (N, 6) cost matrix so each model
+    # runs a single predict for the whole batch
+    utility_matrix = scoring_model.utility_vectorizer.vectorize_many(utility_features)
+    cost_matrix = scoring_model.cost_vectorizer.vectorize_many(cost_features)
+
+    relevance_scores, utility_scores, cost_scores = await scoring_model.batch_score(
+        utility_matrix,
+        cost_matrix,
+        user_id=user_id,
+    )
+
+    return list(
+        zip(
+            relevance_scores.tolist(),
+            utility_scores.tolist(),
+            cost_scores.tolist(),
+        )
+    )
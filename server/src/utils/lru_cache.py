@@ -0,0 +1,87 @@
+"""
+Bounded in-process LRU cache with a byte budget and a TTL
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class BoundedLRUCache:
+    """
+    Base class for in-process LRU caches.
+
+    Entries are evicted least-recently-used first once either the entry count
+    or the byte budget is exceeded, and expire `ttl_seconds` after they were
+    stored. Subclasses expose typed `get`/`put` methods built on `_lookup`
+    and `_store`; the size of an entry is whatever the subclass reports.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable) -> Optional[Any]:
+        """Return the stored value if present and fresh, counting hits and misses."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, _, stored_at = entry
+        if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+            self._discard(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _store(self, key: Hashable, value: Any, nbytes: int = 0) -> None:
+        """Store a value, evicting least recently used entries if needed."""
+        self._discard(key)
+
+        # An entry bigger than the whole budget would evict everything else
+        if self.max_bytes and nbytes > self.max_bytes:
+            return
+
+        self._entries[key] = (value, nbytes, time.monotonic())
+        self._total_bytes += nbytes
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._total_bytes > self.max_bytes)
+        ):
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _discard(self, key: Hashable) -> None:
+        """Drop an entry and its bytes, if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,10 +1,14 @@
 import pytest
 from src.agents.base_agent import BaseAgent
+from src.agents.retry_policy import RetryPolicy
+from src.exceptions.llm import LLMException
 
 @pytest.fixture
 def base_agent():
     """Fixture to create a BaseAgent instance"""
-    return BaseAgent()
+    return BaseAgent(
+        retry_policy=RetryPolicy(max_attempts=2, base_delay=0.1, deadline_seconds=10)
+    )
 
 @pytest.mark.asyncio
 async def test_base_agent_initialization(base_agent):
@@ -18,10 +22,13 @@ async def test_base_agent_execute_basic(base_agent):
     system_prompt = "You are a helpful assistant."
     user_input = "Say 'Hello, World!'"
     
-    response = await base_agent.execute(
-        system_prompt=system_prompt,
-        user_input=user_input
-    )
+    try:
+        response = await base_agent.execute(
+            system_prompt=system_prompt,
+            user_input=user_input
+        )
+    except LLMException as e:
+        pytest.skip(f"LLM API unavailable: {e}")
     
     assert isinstance(response, str)
     assert len(response) > 0
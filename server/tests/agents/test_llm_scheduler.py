@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from src.agents.llm_scheduler import (
+    LLMPriority,
+    LLMScheduler,
+    TokenBucket,
+    current_priority,
+    with_llm_priority,
+)
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_is_enforced():
+    """Test that no more than max_concurrency requests run at once"""
+    scheduler = LLMScheduler(
+        max_concurrency=2, requests_per_minute=0, tokens_per_minute=0
+    )
+    running = []
+    peak = []
+
+    async def request():
+        async with scheduler.slot():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert max(peak) == 2
+    assert scheduler.stats()["admitted"] == 6
+    assert scheduler.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_is_admitted_first():
+    """Test that queued realtime requests overtake queued backfill requests"""
+    scheduler = LLMScheduler(
+        max_concurrency=1, requests_per_minute=0, tokens_per_minute=0
+    )
+    order = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async def request(name, priority):
+        async with scheduler.slot(priority=priority):
+            order.append(name)
+
+    blocking = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(request("backfill", LLMPriority.BACKFILL)),
+        asyncio.create_task(request("realtime", LLMPriority.REALTIME)),
+    ]
+    await asyncio.sleep(0)
+
+    stats = scheduler.stats()
+    assert stats["queued"] == 2
+    assert stats["queued_by_priority"]["backfill"] == 1
+
+    release.set()
+    await asyncio.gather(blocking, *waiters)
+    assert order == ["realtime", "backfill"]
+
+
+def test_token_bucket_wait_time():
+    """Test that an empty bucket reports the refill delay"""
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(60) == 0.0
+    bucket.take(60)
+    assert 0.9 < bucket.wait_time(1) <= 1.0
+    assert TokenBucket(0).wait_time(10**6) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_with_llm_priority_sets_context():
+    """Test that the decorator scopes the priority to the call"""
+
+    @with_llm_priority(LLMPriority.BACKFILL)
+    async def onboarding():
+        return current_priority.get()
+
+    assert await onboarding() == LLMPriority.BACKFILL
+    assert current_priority.get() == LLMPriority.DEFAULT
@@ -0,0 +1,34 @@
+import pytest
+from types import SimpleNamespace
+from src.exceptions.llm import LLMFatalError, LLMException
+from src.modules.agent import onboarding_service as onboarding_module
+from src.modules.agent.onboarding_service import OnboardingAgentService
+
+
+@pytest.mark.asyncio
+async def test_llm_outage_is_not_read_as_non_spam(monkeypatch):
+    """Test that onboarding stops instead of extracting tasks from every email"""
+    service = OnboardingAgentService()
+    extracted = []
+
+    async def iter_recent_emails(grant_id, days, folders, max_messages):
+        yield [{"id": "m1", "body": "<p>Win a prize</p>", "subject": "Hi"}]
+
+    async def classify_email(body, user_context=None):
+        raise LLMFatalError("down")
+
+    async def get_user(id):
+        return SimpleNamespace(id=id, domain_inf=None, personality=None)
+
+    async def batch_extract_and_save_tasks(user_id, emails, user_personality=None):
+        extracted.append(emails)
+        return True, []
+
+    monkeypatch.setattr(onboarding_module.User, "get", get_user)
+    service.nylas_service.iter_recent_emails = iter_recent_emails
+    service.spam_classifier.process = classify_email
+    service.agent.batch_extract_and_save_tasks = batch_extract_and_save_tasks
+
+    with pytest.raises(LLMException):
+        await service.start_onboarding("grant-1", "user-1", "user@example.com")
+    assert extracted == []
@@ -0,0 +1,81 @@
+import pytest
+from types import SimpleNamespace
+from src.agents import base_agent as base_agent_module
+from src.agents import response_cache as response_cache_module
+from src.agents.base_agent import BaseAgent
+from src.agents.response_cache import (
+    MemoryResponseCache,
+    SqliteResponseCache,
+    make_cache_key,
+)
+
+
+def test_make_cache_key_is_stable():
+    """Test that identical requests share a key and different ones don't"""
+    key = make_cache_key("gpt-4o", "system", "input", "json", [])
+    assert key == make_cache_key("gpt-4o", "system", "input", "json", [])
+    assert key != make_cache_key("gpt-4o", "system", "other", "json", [])
+    assert key != make_cache_key("gpt-4o-mini", "system", "input", "json", [])
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_lru_and_copies():
+    """Test LRU eviction and that hits return independent copies"""
+    cache = MemoryResponseCache(max_entries=2, ttl_seconds=0)
+    await cache.set("a", {"tasks": []})
+    await cache.set("b", "spam")
+    (await cache.get("a"))["tasks"].append("mutated")
+    await cache.set("c", "not_spam")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == {"tasks": []}
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_persists(tmp_path, monkeypatch):
+    """Test that the sqlite backend survives reopening and bounds its size"""
+    path = str(tmp_path / "llm_cache.sqlite3")
+    cache = SqliteResponseCache(path=path, max_entries=2, ttl_seconds=0)
+    await cache.set("a", {"context_guess": "Finance"})
+    await cache.set("b", "spam")
+    await cache.set("c", "not_spam")
+
+    reopened = SqliteResponseCache(path=path, max_entries=2, ttl_seconds=0)
+    assert len(reopened) == 2
+
+    offloaded = []
+
+    async def to_thread(func, *args):
+        offloaded.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr(response_cache_module.asyncio, "to_thread", to_thread)
+    assert await reopened.get("c") == "not_spam"
+    assert offloaded == ["_load_row"]
+
+
+@pytest.mark.asyncio
+async def test_execute_serves_repeated_requests_from_cache(monkeypatch):
+    """Test that an identical request costs a single LLM round-trip"""
+    cache = MemoryResponseCache(max_entries=10, ttl_seconds=0)
+    monkeypatch.setattr(base_agent_module, "response_cache", cache)
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content='{"label": "spam"}', tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    class CachedAgent(BaseAgent):
+        cache_responses = True
+
+    agent = CachedAgent()
+    monkeypatch.setattr(agent.client.chat.completions, "create", create)
+
+    first = await agent.execute("system", "input", response_format="json")
+    second = await agent.execute("system", "input", response_format="json")
+
+    assert first == second == {"label": "spam"}
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
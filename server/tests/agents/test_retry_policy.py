@@ -0,0 +1,169 @@
+import asyncio
+import httpx
+import openai
+import pytest
+from types import SimpleNamespace
+from src.agents.base_agent import BaseAgent
+from src.agents.retry_policy import RetryPolicy, is_retryable, retry_after_seconds
+from src.exceptions.llm import LLMFatalError, LLMRetriesExhaustedError
+
+
+def _status_error(error_class, status_code, headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, request=request, headers=headers or {})
+    return error_class("error", response=response, body=None)
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(
+        max_attempts=3, base_delay=0.001, max_delay=0.01, deadline_seconds=5
+    )
+
+
+def test_error_classification():
+    """Test that rate limits and 5xx are retryable and client errors are fatal"""
+    assert is_retryable(_status_error(openai.RateLimitError, 429))
+    assert is_retryable(_status_error(openai.InternalServerError, 503))
+    assert not is_retryable(_status_error(openai.BadRequestError, 400))
+    assert not is_retryable(_status_error(openai.AuthenticationError, 401))
+    assert not is_retryable(ValueError("bad input"))
+
+
+def test_retry_after_header():
+    """Test that Retry-After and retry-after-ms are parsed"""
+    assert (
+        retry_after_seconds(
+            _status_error(openai.RateLimitError, 429, {"retry-after": "2"})
+        )
+        == 2.0
+    )
+    assert (
+        retry_after_seconds(
+            _status_error(openai.RateLimitError, 429, {"retry-after-ms": "250"})
+        )
+        == 0.25
+    )
+    assert retry_after_seconds(_status_error(openai.RateLimitError, 429)) is None
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors(policy):
+    """Test that a transient failure is retried until it succeeds"""
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _status_error(openai.RateLimitError, 429)
+        return "ok"
+
+    assert await policy.run(flaky) == "ok"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_fatal_errors_are_not_retried(policy):
+    """Test that a fatal error fails on the first attempt"""
+    calls = []
+
+    async def rejected():
+        calls.append(1)
+        raise _status_error(openai.BadRequestError, 400)
+
+    with pytest.raises(LLMFatalError):
+        await policy.run(rejected)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_raise_typed_error(policy):
+    """Test that persistent transient errors end in LLMRetriesExhaustedError"""
+
+    async def overloaded():
+        raise _status_error(openai.InternalServerError, 503)
+
+    with pytest.raises(LLMRetriesExhaustedError) as exc_info:
+        await policy.run(overloaded)
+    assert exc_info.value.attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_after_beyond_deadline_fails_fast():
+    """Test that a Retry-After past the deadline is not waited for"""
+    policy = RetryPolicy(max_attempts=5, base_delay=0.001, deadline_seconds=1)
+
+    async def throttled():
+        raise _status_error(openai.RateLimitError, 429, {"retry-after": "30"})
+
+    with pytest.raises(LLMRetriesExhaustedError) as exc_info:
+        await policy.run(throttled)
+    assert exc_info.value.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_raises_instead_of_returning_error(policy, monkeypatch):
+    """Test that execute surfaces exhausted retries to the caller"""
+    agent = BaseAgent(retry_policy=policy)
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise _status_error(openai.RateLimitError, 429)
+        message = SimpleNamespace(content='{"tasks": []}', tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(agent.client.chat.completions, "create", create)
+    assert await agent.execute("system", "retry me", response_format="json") == {
+        "tasks": []
+    }
+
+    async def down(**kwargs):
+        raise _status_error(openai.InternalServerError, 500)
+
+    monkeypatch.setattr(agent.client.chat.completions, "create", down)
+    with pytest.raises(LLMRetriesExhaustedError):
+        await agent.execute("system", "fail me", response_format="json")
+
+
+def _timeout_error():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.APITimeoutError(request=request)
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_retried_only_while_time_remains():
+    """Test that a timeout at the deadline ends the retries"""
+    policy = RetryPolicy(max_attempts=5, base_delay=0.001, deadline_seconds=0.05)
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        if len(calls) == 1:
+            raise _timeout_error()
+        await asyncio.sleep(0.06)
+        raise _timeout_error()
+
+    with pytest.raises(LLMRetriesExhaustedError) as exc_info:
+        await policy.run(slow)
+    assert exc_info.value.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_bounds_each_request_by_the_deadline(policy, monkeypatch):
+    """Test that completions get the time left until the shared deadline"""
+    agent = BaseAgent(retry_policy=policy)
+    timeouts = []
+
+    async def create(**kwargs):
+        timeouts.append(kwargs["timeout"])
+        if len(timeouts) == 1:
+            raise _timeout_error()
+        message = SimpleNamespace(content="done", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(agent.client.chat.completions, "create", create)
+
+    assert await agent.execute("system", "time me") == "done"
+    assert 0 < timeouts[1] <= timeouts[0] <= policy.deadline_seconds
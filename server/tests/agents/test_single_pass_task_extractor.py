@@ -0,0 +1,113 @@
+import pytest
+from src.agents.single_pass_task_extractor import SinglePassTaskExtractor
+from src.config import settings
+from src.modules.agent.service import AgentService
+
+VALID_RESPONSE = {
+    "tasks": [
+        {
+            "title": "Finalize budget",
+            "due_date": None,
+            "priority": "high",
+            "utility_features": {
+                "priority": "high",
+                "intrinsic_interest": "moderate",
+                "user_emphasis": "low",
+                "task_type_relevance": "high",
+                "emotional_salience": "weak",
+                "domain_relevance": "high",
+                "novel_task": "low",
+                "reward_pathways": "no",
+                "time_of_day_alignment": "appropriate",
+                "learning_opportunity": "low",
+                "urgency": "medium",
+            },
+            "cost_features": {
+                "task_complexity": 2,
+                "time_required": 0.5,
+                "emotional_stress_factor": "low",
+                "location_dependencies": "none",
+                "resource_requirements": "1",
+                "interruptibility": "high",
+            },
+        }
+    ]
+}
+
+
+def _extractor_returning(monkeypatch, response):
+    extractor = SinglePassTaskExtractor()
+
+    async def execute(*args, **kwargs):
+        return response
+
+    monkeypatch.setattr(extractor, "execute", execute)
+    return extractor
+
+
+@pytest.mark.asyncio
+async def test_valid_response_returns_tasks_with_features(monkeypatch):
+    """Test that a schema-valid response yields tasks with inline features"""
+    extractor = _extractor_returning(monkeypatch, VALID_RESPONSE)
+
+    tasks = await extractor.process("Finalize the budget for the review.")
+
+    assert len(tasks) == 1
+    assert tasks[0]["title"] == "Finalize budget"
+    assert tasks[0]["utility_features"]["deadline_time"] == 0
+    assert tasks[0]["cost_features"]["time_required"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_invalid_response_returns_none(monkeypatch):
+    """Test that a response missing features fails validation"""
+    extractor = _extractor_returning(
+        monkeypatch, {"tasks": [{"title": "Finalize budget", "priority": "high"}]}
+    )
+    assert await extractor.process("Finalize the budget.") is None
+
+
+@pytest.mark.asyncio
+async def test_agent_service_falls_back_on_invalid_response(monkeypatch):
+    """Test that AgentService uses the per-task path when validation fails"""
+    monkeypatch.setattr(settings, "SINGLE_PASS_EXTRACTION", True)
+    service = AgentService()
+    service.single_pass_extractor = _extractor_returning(monkeypatch, {"tasks": "x"})
+    feature_calls = []
+
+    async def extract_tasks(email_body, user_personality=None):
+        return {"tasks": [{"title": "Finalize budget", "priority": "high"}]}
+
+    async def extract_task_features(task_context, due_date=None):
+        feature_calls.append(task_context)
+        return {"priority": "high"}, {"task_complexity": 2}
+
+    monkeypatch.setattr(service, "extract_tasks", extract_tasks)
+    monkeypatch.setattr(service, "extract_task_features", extract_task_features)
+
+    tasks = await service.extract_email_tasks("Finalize the budget.")
+    features = [await service.get_task_features(task, "context") for task in tasks]
+
+    assert tasks == [{"title": "Finalize budget", "priority": "high"}]
+    assert features == [({"priority": "high"}, {"task_complexity": 2})]
+    assert len(feature_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_agent_service_single_pass_skips_feature_calls(monkeypatch):
+    """Test that inline features are used without further LLM calls"""
+    monkeypatch.setattr(settings, "SINGLE_PASS_EXTRACTION", True)
+    service = AgentService()
+    service.single_pass_extractor = _extractor_returning(monkeypatch, VALID_RESPONSE)
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("per-task extraction should not be called")
+
+    monkeypatch.setattr(service, "extract_tasks", unexpected)
+    monkeypatch.setattr(service, "extract_task_features", unexpected)
+
+    tasks = await service.extract_email_tasks("Finalize the budget.")
+    utility, cost = await service.get_task_features(tasks[0], "context")
+
+    assert utility["urgency"] == "medium"
+    assert cost["interruptibility"] == "high"
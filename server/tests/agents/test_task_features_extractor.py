@@ -0,0 +1,62 @@
+import datetime
+import pytest
+from src.agents.task_features_extractor import TaskFeaturesExtractor
+from src.config import settings
+from src.modules.agent.service import AgentService
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    extractor = TaskFeaturesExtractor()
+    calls = []
+
+    async def execute(system_prompt, user_input, response_format="string", **kwargs):
+        calls.append(user_input)
+        return {
+            "utility_features": {"priority": "high", "urgency": "medium"},
+            "cost_features": {"task_complexity": 2, "time_required": 1.5},
+        }
+
+    monkeypatch.setattr(extractor, "execute", execute)
+    extractor.calls = calls
+    return extractor
+
+
+@pytest.mark.asyncio
+async def test_process_returns_both_feature_sets(extractor):
+    """Test that one call yields utility and cost features with a local deadline"""
+    due_date = (datetime.date.today() + datetime.timedelta(days=3)).isoformat()
+
+    result = await extractor.process("task: send report", due_date)
+
+    assert len(extractor.calls) == 1
+    assert result["cost_features"]["time_required"] == 1.5
+    assert result["utility_features"]["priority"] == "high"
+    assert result["utility_features"]["deadline_time"] == pytest.approx(1 - 3 / 7)
+
+
+@pytest.mark.asyncio
+async def test_process_without_due_date(extractor):
+    """Test that a task without a due date gets a zero deadline utility"""
+    result = await extractor.process("task: read newsletter")
+    assert result["utility_features"]["deadline_time"] == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_service_uses_combined_extractor(extractor, monkeypatch):
+    """Test that AgentService makes a single feature call per task"""
+    monkeypatch.setattr(settings, "COMBINED_FEATURE_EXTRACTION", True)
+    service = AgentService()
+    service.task_features_extractor = extractor
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("separate extractors should not be called")
+
+    monkeypatch.setattr(service.utility_features_extractor, "process", unexpected)
+    monkeypatch.setattr(service.cost_features, "process", unexpected)
+
+    utility, cost = await service.extract_task_features("task: send report")
+
+    assert len(extractor.calls) == 1
+    assert "deadline_time" in utility
+    assert cost["task_complexity"] == 2
@@ -0,0 +1,313 @@
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+from tortoise import Tortoise
+from src.agents import base_agent
+from src.config import settings
+from src.exceptions.llm import LLMFatalError
+from src.jobs.idempotency import IdempotencyStore, idempotency_key
+from src.modules.agent import service as service_module
+from src.modules.agent.service import AgentService
+
+
+def _event(message_id, grant_id="grant-1", event_id=None):
+    return {
+        "id": event_id or f"event-{message_id}",
+        "type": "message.created",
+        "data": {
+            "object": {
+                "id": message_id,
+                "grant_id": grant_id,
+                "body": f"<p>body {message_id}</p>",
+                "subject": "Subject",
+            }
+        },
+    }
+
+
+@pytest_asyncio.fixture
+async def agent_service(monkeypatch):
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": ["src.models.idempotency"]}
+    )
+    await Tortoise.generate_schemas()
+    monkeypatch.setattr(service_module, "webhook_dedup", IdempotencyStore())
+
+    lookups = []
+
+    async def get_all_users_by_grant_id(grant_id):
+        lookups.append(grant_id)
+        return [SimpleNamespace(id=f"user-{grant_id}", personality=None)]
+
+    monkeypatch.setattr(
+        service_module.User, "get_all_users_by_grant_id", get_all_users_by_grant_id
+    )
+
+    service = AgentService()
+    service.calls = {"lookups": lookups, "spam": [], "extract": [], "saved": []}
+
+    async def classify_spams(emails, user_id):
+        service.calls["spam"].append([email.id for email in emails])
+        return {"spam": [], "non_spam": emails}
+
+    async def batch_extract_and_save_tasks(user_id, emails, user_personality=None):
+        service.calls["extract"].append([email.id for email in emails])
+        return True, [email for email in emails if email.id.endswith("no-task")]
+
+    async def save_webhook_email(user, email, user_personality, shared=None):
+        service.calls["saved"].append(email.id)
+
+    service.classify_spams = classify_spams
+    service.batch_extract_and_save_tasks = batch_extract_and_save_tasks
+    service._save_webhook_email = save_webhook_email
+    yield service
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_one_pipeline_per_grant(agent_service):
+    """Test that a grant's events go through spam and task extraction together"""
+    events = [_event("m1"), _event("m2-no-task"), _event("m3"), _event("m1")]
+
+    results = await agent_service.handle_webhook_batch(events)
+
+    assert results == [True, True, True, True]
+    assert agent_service.calls["lookups"] == ["grant-1"]
+    assert agent_service.calls["spam"] == [["m1", "m2-no-task", "m3"]]
+    assert agent_service.calls["extract"] == [["m1", "m2-no-task", "m3"]]
+    assert agent_service.calls["saved"] == ["m2-no-task"]
+
+
+@pytest.mark.asyncio
+async def test_redeliveries_are_skipped(agent_service):
+    """Test that a redelivered event or message is not reprocessed"""
+    await agent_service.handle_webhook_batch([_event("m1")])
+
+    results = await agent_service.handle_webhook_batch(
+        [_event("m1"), _event("m1", event_id="event-new"), _event("m2")]
+    )
+
+    assert results == [True, True, True]
+    assert agent_service.calls["spam"] == [["m1"], ["m2"]]
+
+
+@pytest.mark.asyncio
+async def test_invalid_events_are_not_claimed(agent_service):
+    """Test that validation happens before anything is recorded"""
+    event = _event("m1")
+    event["data"]["object"]["body"] = ""
+
+    assert await agent_service.handle_webhook_batch([event]) == [False]
+    assert await service_module.webhook_dedup.claim(
+        [idempotency_key("message", "grant-1", "m1")]
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_failure_marks_batch_for_retry(agent_service):
+    """Test that an LLM outage fails the grant's events and drops dedup markers"""
+
+    async def classify_spams(emails, user_id):
+        raise LLMFatalError("down")
+
+    agent_service.classify_spams = classify_spams
+    events = [_event("m1"), _event("m2"), _event("m3", grant_id="grant-2")]
+
+    results = await agent_service.handle_webhook_batch(events)
+
+    assert results == [False, False, False]
+    agent_service.classify_spams = lambda emails, user_id: _non_spam(emails)
+    assert await agent_service.handle_webhook_batch(events) == [True, True, True]
+    assert agent_service.calls["extract"] == [["m1", "m2"], ["m3"]]
+
+
+@pytest.mark.asyncio
+async def test_any_failure_releases_claims(agent_service):
+    """Test that a non-LLM failure also leaves the events open for redelivery"""
+
+    async def classify_spams(emails, user_id):
+        raise RuntimeError("database unavailable")
+
+    agent_service.classify_spams = classify_spams
+
+    assert await agent_service.handle_webhook_batch([_event("m1")]) == [False]
+    agent_service.classify_spams = lambda emails, user_id: _non_spam(emails)
+    assert await agent_service.handle_webhook_batch([_event("m1")]) == [True]
+    assert agent_service.calls["extract"] == [["m1"]]
+
+
+@pytest.mark.asyncio
+async def test_redelivery_retries_only_failed_users(agent_service, monkeypatch):
+    """Test that users who processed a shared message do not get it twice"""
+    users = [SimpleNamespace(id=f"user-{n}", personality=None) for n in range(2)]
+
+    async def get_all_users_by_grant_id(grant_id):
+        return users
+
+    monkeypatch.setattr(
+        service_module.User, "get_all_users_by_grant_id", get_all_users_by_grant_id
+    )
+    processed = []
+    failing = {"user-1"}
+
+    async def process_webhook_emails(user, emails, shared, personalised, completed):
+        if user.id in failing:
+            raise RuntimeError("scoring failed")
+        processed.append((user.id, [email.id for email in emails]))
+
+    agent_service._process_webhook_emails = process_webhook_emails
+
+    assert await agent_service.handle_webhook_batch([_event("m1")]) == [False]
+    failing.clear()
+    assert await agent_service.handle_webhook_batch([_event("m1")]) == [True]
+    assert processed == [("user-0", ["m1"]), ("user-1", ["m1"])]
+
+
+@pytest.mark.asyncio
+async def test_redelivery_skips_emails_whose_tasks_were_saved(agent_service):
+    """Test that a failed summary does not make saved tasks be created twice"""
+    failures = ["summary unavailable"]
+
+    async def save_webhook_email(user, email, user_personality, shared=None):
+        if failures:
+            raise LLMFatalError(failures.pop())
+        agent_service.calls["saved"].append(email.id)
+
+    agent_service._save_webhook_email = save_webhook_email
+    events = [_event("m1"), _event("m2-no-task")]
+
+    assert await agent_service.handle_webhook_batch(events) == [False, False]
+    assert await agent_service.handle_webhook_batch(events) == [True, True]
+    assert agent_service.calls["extract"] == [["m1", "m2-no-task"], ["m2-no-task"]]
+    assert agent_service.calls["saved"] == ["m2-no-task"]
+
+
+async def _non_spam(emails):
+    return {"spam": [], "non_spam": emails}
+
+
+@pytest.mark.asyncio
+async def test_users_of_a_grant_share_message_stages(agent_service, monkeypatch):
+    """Test that extraction and summaries run once per message, scoring per user"""
+    users = [SimpleNamespace(id=f"user-{n}", personality=None) for n in range(3)]
+
+    async def get_all_users_by_grant_id(grant_id):
+        return users
+
+    monkeypatch.setattr(
+        service_module.User, "get_all_users_by_grant_id", get_all_users_by_grant_id
+    )
+    calls = {"extract": [], "summary": [], "scored": [], "saved": []}
+
+    async def extract_tasks_with_features(emails, user_personality=None):
+        calls["extract"].append([email.id for email in emails])
+        if emails[0].id.endswith("no-task"):
+            return [], emails
+        return [{"task": {"title": "t"}, "message_id": emails[0].id}], []
+
+    async def save_extracted_tasks(user_id, extracted_tasks):
+        calls["scored"].append((user_id, [t["message_id"] for t in extracted_tasks]))
+
+    async def process_content(body):
+        calls["summary"].append(body)
+        return {"summary": "summary"}
+
+    async def save_webhook_email(user, email, user_personality, shared):
+        await shared.summary(email)
+        calls["saved"].append((user.id, email.id))
+
+    agent_service.extract_tasks_with_features = extract_tasks_with_features
+    agent_service.save_extracted_tasks = save_extracted_tasks
+    agent_service.content_summarizer.process_content = process_content
+    agent_service._save_webhook_email = save_webhook_email
+
+    results = await agent_service.handle_webhook_batch(
+        [_event("m1"), _event("m2-no-task")]
+    )
+
+    assert results == [True, True]
+    assert sorted(calls["extract"]) == [["m1"], ["m2-no-task"]]
+    assert calls["summary"] == ["body m2-no-task"]
+    assert sorted(calls["scored"]) == [(user.id, ["m1"]) for user in users]
+    assert sorted(calls["saved"]) == [(user.id, "m2-no-task") for user in users]
+    assert agent_service.calls["extract"] == []
+
+
+class FakeLLM:
+    """Chat completions client answering task extraction and feature prompts"""
+
+    def __init__(self, extractor_prompt):
+        self.extractor_prompt = extractor_prompt
+        self.extractions = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        if kwargs["messages"][0]["content"].startswith(self.extractor_prompt[:200]):
+            self.extractions += 1
+            content = {"tasks": [{"title": "Reply", "priority": "high"}]}
+        else:
+            content = {"utility_features": {"urgency": "high"}, "cost_features": {}}
+        message = SimpleNamespace(content=json.dumps(content), tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.mark.asyncio
+async def test_shared_extraction_runs_the_real_extractor(agent_service, monkeypatch):
+    """Test that a multi-user grant extracts through the agents, LLM stubbed"""
+    users = [SimpleNamespace(id=f"user-{n}", personality=None) for n in range(2)]
+
+    async def get_all_users_by_grant_id(grant_id):
+        return users
+
+    monkeypatch.setattr(
+        service_module.User, "get_all_users_by_grant_id", get_all_users_by_grant_id
+    )
+    monkeypatch.setattr(settings, "SINGLE_PASS_EXTRACTION", False)
+    monkeypatch.setattr(settings, "COMBINED_FEATURE_EXTRACTION", True)
+    monkeypatch.setattr(base_agent, "response_cache", None)
+    llm = FakeLLM(agent_service.task_extractor.system_prompt)
+    agent_service.task_extractor.client = llm
+    agent_service.task_features_extractor.client = llm
+    saved = []
+
+    async def save_extracted_tasks(user_id, extracted_tasks):
+        saved.append((user_id, [t["task"]["title"] for t in extracted_tasks]))
+
+    agent_service.save_extracted_tasks = save_extracted_tasks
+
+    results = await agent_service.handle_webhook_batch([_event("m1")])
+
+    assert results == [True]
+    assert llm.extractions == 1
+    assert sorted(saved) == [("user-0", ["Reply"]), ("user-1", ["Reply"])]
+
+
+@pytest.mark.asyncio
+async def test_classify_spams_covers_batches_past_one_chunk(monkeypatch):
+    """Test that every email of a large batch is classified, a chunk at a time"""
+
+    async def get_user(id):
+        return SimpleNamespace(id=id, domain_inf=None, personality=None)
+
+    monkeypatch.setattr(service_module.User, "get", get_user)
+    monkeypatch.setattr(settings, "SPAM_CLASSIFICATION_CHUNK_SIZE", 20)
+    service = AgentService()
+    running = {"now": 0, "max": 0}
+
+    async def process(body, context=None):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0)
+        running["now"] -= 1
+        return "spam" if body.endswith("0") else "not spam"
+
+    service.spam_classifier.process = process
+    emails = [SimpleNamespace(id=str(n), body=f"body {n}") for n in range(45)]
+
+    result = await service.classify_spams(emails, "user-1")
+
+    assert len(result["spam"]) + len(result["non_spam"]) == 45
+    assert [email.id for email in result["spam"]] == ["0", "10", "20", "30", "40"]
+    assert running["max"] == 20
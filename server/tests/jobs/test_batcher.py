@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from src.jobs.batcher import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_items_are_coalesced_per_key():
+    """Test that concurrent items for a key go to process_batch together"""
+    batches = []
+
+    async def process_batch(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(process_batch, max_items=3, window_seconds=0.05)
+    results = await asyncio.gather(
+        batcher.add("a", 1),
+        batcher.add("b", 2),
+        batcher.add("a", 3),
+        batcher.add("a", 4),
+        batcher.add("a", 5),
+    )
+
+    assert results == [10, 20, 30, 40, 50]
+    assert sorted(batches) == [[1, 3, 4], [2], [5]]
+
+
+@pytest.mark.asyncio
+async def test_window_bounds_latency():
+    """Test that a partial batch is flushed once the window elapses"""
+
+    async def process_batch(items):
+        return items
+
+    batcher = MicroBatcher(process_batch, max_items=100, window_seconds=0.02)
+    result = await asyncio.wait_for(batcher.add("a", "x"), timeout=1)
+
+    assert result == "x"
+    assert batcher.batches == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    """Test that a failing batch raises in each waiting caller"""
+
+    async def process_batch(items):
+        raise RuntimeError("down")
+
+    batcher = MicroBatcher(process_batch, max_items=2, window_seconds=1)
+    results = await asyncio.gather(
+        batcher.add("a", 1), batcher.add("a", 2), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
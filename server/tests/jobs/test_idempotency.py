@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from tortoise import Tortoise
+from src.jobs.idempotency import IdempotencyStore, idempotency_key
+from src.models.idempotency import IdempotencyKey
+
+
+@pytest_asyncio.fixture
+async def db():
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": ["src.models.idempotency"]}
+    )
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_have_one_winner(db):
+    """Test that only one of several concurrent deliveries claims a key"""
+    store = IdempotencyStore()
+    key = idempotency_key("message", "grant-1", "msg-1")
+
+    results = await asyncio.gather(*(store.claim([key]) for _ in range(5)))
+
+    assert results.count(True) == 1
+    assert store.duplicates == 4
+
+
+@pytest.mark.asyncio
+async def test_claims_are_shared_through_the_database(db):
+    """Test that another process (empty LRU) sees the persisted claim"""
+    key = idempotency_key("event", "event-1")
+    assert await IdempotencyStore().claim([key])
+
+    other_process = IdempotencyStore()
+    assert not await other_process.claim([key])
+    assert not await other_process.claim([idempotency_key("event", "event-2"), key])
+    assert await IdempotencyKey.all().count() == 1
+
+
+@pytest.mark.asyncio
+async def test_release_allows_reprocessing(db):
+    """Test that released keys can be claimed again"""
+    store = IdempotencyStore()
+    keys = [idempotency_key("message", "grant-1", "msg-1")]
+    assert await store.claim(keys)
+
+    await store.release(keys)
+
+    assert await IdempotencyStore().claim(keys)
+
+
+@pytest.mark.asyncio
+async def test_duplicates_are_not_cached_by_other_processes(db):
+    """Test that a release lets a process that saw the duplicate claim again"""
+    owner, other_process = IdempotencyStore(), IdempotencyStore()
+    message_key = idempotency_key("message", "grant-1", "msg-1")
+    assert await owner.claim([message_key])
+    assert not await other_process.claim([message_key])
+    assert not await other_process.claim(
+        [message_key, idempotency_key("event", "event-2")]
+    )
+
+    await owner.release([message_key])
+
+    assert await other_process.claim([message_key, idempotency_key("event", "event-2")])
+    assert not await other_process.claim([message_key])
@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from src.jobs import queue as queue_module
+from src.jobs.handlers import WEBHOOK_JOB, process_webhook
+from src.jobs.queue import MemoryJobQueue, PermanentJobError, PostgresJobQueue
+from src.jobs.worker import JobWorker
+
+
+def _queue(max_attempts=3):
+    return MemoryJobQueue(
+        max_attempts=max_attempts, retry_base_delay=0.01, retry_max_delay=0.01
+    )
+
+
+async def _drain(queue, worker, timeout=2.0):
+    worker.start()
+    try:
+        async with asyncio.timeout(timeout):
+            while await queue.pending() or worker._tasks:
+                await asyncio.sleep(0.01)
+    finally:
+        await worker.stop()
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_acked_once_handled():
+    """Test that every enqueued job is handled and acknowledged"""
+    queue = _queue()
+    handled = []
+
+    async def handler(payload):
+        handled.append(payload["n"])
+
+    for n in range(5):
+        await queue.enqueue("test", {"n": n})
+    await _drain(queue, JobWorker(queue, {"test": handler}, poll_interval=0.01))
+
+    assert sorted(handled) == [0, 1, 2, 3, 4]
+    stats = await queue.stats()
+    assert stats["completed"] == 5
+    assert stats["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried_until_max_attempts():
+    """Test that raising or returning False retries, then the job is buried"""
+    queue = _queue(max_attempts=3)
+    calls = {"flaky": 0, "broken": 0}
+
+    async def flaky(payload):
+        calls["flaky"] += 1
+        if calls["flaky"] < 2:
+            raise RuntimeError("temporary")
+
+    async def broken(payload):
+        calls["broken"] += 1
+        return False
+
+    await queue.enqueue("flaky", {})
+    await queue.enqueue("broken", {})
+    await queue.enqueue("unknown", {})
+    worker = JobWorker(queue, {"flaky": flaky, "broken": broken}, poll_interval=0.01)
+    await _drain(queue, worker)
+
+    assert calls == {"flaky": 2, "broken": 3}
+    stats = await queue.stats()
+    assert stats["completed"] == 1
+    assert stats["dead"] == 2
+    assert stats["retried"] == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_bounds_concurrency():
+    """Test that no more than `concurrency` jobs run at once"""
+    queue = _queue()
+    running = 0
+    peak = 0
+
+    async def handler(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    for n in range(10):
+        await queue.enqueue("test", {"n": n})
+    await _drain(
+        queue, JobWorker(queue, {"test": handler}, concurrency=3, poll_interval=0.01)
+    )
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_permanent_failures_are_not_retried():
+    """Test that PermanentJobError and malformed webhooks are buried at once"""
+    queue = _queue(max_attempts=3)
+    calls = []
+
+    async def invalid(payload):
+        calls.append(payload)
+        raise PermanentJobError("bad payload")
+
+    await queue.enqueue("invalid", {})
+    await queue.enqueue(WEBHOOK_JOB, {"type": "message.created", "data": {}})
+    worker = JobWorker(
+        queue, {"invalid": invalid, WEBHOOK_JOB: process_webhook}, poll_interval=0.01
+    )
+    await _drain(queue, worker)
+
+    assert calls == [{}]
+    stats = await queue.stats()
+    assert stats["dead"] == 2
+    assert stats["retried"] == 0
+
+
+class FakeConnection:
+    """Answers the sweep with one stuck job and finds nothing to claim"""
+
+    def __init__(self):
+        self.queries = []
+
+    async def execute_query_dict(self, query, values):
+        self.queries.append(query)
+        return [{"id": 7}] if query == PostgresJobQueue.SWEEP_SQL else []
+
+
+@pytest.mark.asyncio
+async def test_stuck_jobs_without_attempts_are_swept(monkeypatch):
+    """Test that the Postgres queue buries jobs CLAIM_SQL can never reclaim"""
+    connection = FakeConnection()
+    monkeypatch.setattr(
+        queue_module, "connections", SimpleNamespace(get=lambda name: connection)
+    )
+    queue = PostgresJobQueue(poll_interval=0.01, sweep_interval=60)
+
+    assert await queue.dequeue(timeout=0) is None
+    assert await queue.dequeue(timeout=0) is None
+
+    assert connection.queries.count(PostgresJobQueue.SWEEP_SQL) == 1
+    assert queue.dead == 1
@@ -0,0 +1,55 @@
+import numpy as np
+from src.models.task_scoring import TaskScoringModel
+
+
+class TestFeatureVectorizer:
+    def test_column_order_is_fixed(self):
+        """Test that key order in the input does not change the encoded row"""
+        vectorizer = TaskScoringModel().utility_vectorizer
+        features = {
+            "priority": "high",
+            "deadline_time": 0.75,
+            "intrinsic_interest": "moderate",
+            "urgency": "low",
+        }
+        reordered = dict(reversed(list(features.items())))
+
+        row = vectorizer.vectorize(features)
+
+        assert np.array_equal(row, vectorizer.vectorize(reordered))
+        assert row[vectorizer.columns.index("priority")] == 1.0
+        assert row[vectorizer.columns.index("intrinsic_interest")] == 0.5
+        assert row[vectorizer.columns.index("urgency")] == 0.1
+        assert row[vectorizer.columns.index("deadline_time")] == 0.75
+
+    def test_encodes_in_schema_order(self):
+        """Test that numbers pass through and codes map through their tables"""
+        scoring_model = TaskScoringModel()
+        vectorizer = scoring_model.cost_vectorizer
+        features = {
+            "task_complexity": 3,
+            "emotional_stress_factor": "Medium",
+            "location_dependencies": "2",
+            "resource_requirements": "3 or more",
+            "interruptibility": "high",
+            "time_required": 1.5,
+        }
+
+        assert np.allclose(
+            vectorizer.vectorize(features), [3.0, 0.5, 0.2, 1.0, 1.0, 1.5]
+        )
+
+    def test_vectorize_many(self):
+        """Test bulk encoding, including missing and unknown features"""
+        vectorizer = TaskScoringModel().cost_vectorizer
+        matrix = vectorizer.vectorize_many(
+            [
+                {"interruptibility": "low", "unknown": "high"},
+                {},
+                {"location_dependencies": "none", "emotional_stress_factor": "high"},
+            ]
+        )
+
+        assert matrix.shape == (3, 6)
+        assert not matrix[1].any()
+        assert matrix[2, vectorizer.columns.index("emotional_stress_factor")] == 1.0
@@ -0,0 +1,63 @@
+import asyncio
+import numpy as np
+import pytest
+from src.models.feedback_buffer import FeedbackBuffer
+
+
+def _sample(value):
+    return (np.full((1, 12), value), np.full((1, 6), value)), {
+        "utility": value,
+        "cost": value,
+    }
+
+
+@pytest.mark.asyncio
+async def test_flushes_once_at_batch_size():
+    """Test that samples are applied as one batch when the size threshold is hit"""
+    batches = []
+
+    async def apply_batch(features_list, targets, user_id):
+        batches.append((user_id, len(features_list), len(targets)))
+
+    buffer = FeedbackBuffer(apply_batch, max_samples=3, flush_seconds=60)
+    for value in (0.1, 0.2):
+        await buffer.add("user-1", *_sample(value))
+    assert batches == []
+    assert buffer.pending("user-1") == 2
+
+    await buffer.add("user-1", *_sample(0.3))
+    assert batches == [("user-1", 3, 3)]
+    assert buffer.pending("user-1") == 0
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_idle_time():
+    """Test that a partial buffer is applied once the debounce window elapses"""
+    batches = []
+
+    async def apply_batch(features_list, targets, user_id):
+        batches.append(len(features_list))
+
+    buffer = FeedbackBuffer(apply_batch, max_samples=10, flush_seconds=0.01)
+    await buffer.add("user-1", *_sample(0.1))
+    await buffer.add("user-1", *_sample(0.2))
+    await asyncio.sleep(0.05)
+
+    assert batches == [2]
+
+
+@pytest.mark.asyncio
+async def test_flush_all():
+    """Test that shutdown flushing applies every user's buffer"""
+    users = []
+
+    async def apply_batch(features_list, targets, user_id):
+        users.append(user_id)
+
+    buffer = FeedbackBuffer(apply_batch, max_samples=10, flush_seconds=60)
+    await buffer.add("user-1", *_sample(0.1))
+    await buffer.add("user-2", *_sample(0.2))
+    await buffer.flush_all()
+
+    assert sorted(users) == ["user-1", "user-2"]
+    assert buffer.pending("user-1") == buffer.pending("user-2") == 0
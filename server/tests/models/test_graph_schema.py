@@ -0,0 +1,107 @@
+import pytest
+from types import SimpleNamespace
+from src.models.graph.repository import GraphRepository
+from src.models.graph.schema import (
+    CONSTRAINTS,
+    INDEXES,
+    explain_queries,
+    install_schema,
+    plan_operators,
+)
+
+
+class SchemaDriver:
+    """Answers schema queries; `duplicates` lists labels holding duplicate keys"""
+
+    def __init__(self, duplicates=(), offline=(), existing=()):
+        self.duplicates = duplicates
+        self.offline = offline
+        self.existing = list(existing)
+        self.statements = []
+
+    async def execute_query(self, query, params, routing_=None, database_=None):
+        self.statements.append(query)
+        records = []
+        if query.startswith("SHOW CONSTRAINTS"):
+            records = [{"name": name} for name in self.existing]
+        elif "copies > 1" in query:
+            if any(f"(n:{label})" in query for label in self.duplicates):
+                records = [{"key": ["m1"], "copies": 2}]
+        elif query.startswith("SHOW INDEXES"):
+            names = self.existing + [
+                line.split()[2] for line in self.statements if line.startswith("CREATE")
+            ]
+            records = [
+                {
+                    "name": name,
+                    "state": "POPULATING" if name in self.offline else "ONLINE",
+                }
+                for name in names
+            ]
+        plan = {
+            "operatorType": "ProduceResults@neo4j",
+            "children": [{"operatorType": "NodeByLabelScan@neo4j", "children": []}],
+        }
+        return SimpleNamespace(records=records, summary=SimpleNamespace(plan=plan))
+
+
+@pytest.mark.asyncio
+async def test_install_creates_every_constraint_and_index():
+    """Test that the installer declares all schema idempotently and verifies it"""
+    driver = SchemaDriver()
+
+    report = await install_schema(GraphRepository(driver=driver))
+
+    created = [s for s in driver.statements if s.startswith("CREATE")]
+    assert len(created) == len(CONSTRAINTS) + len(INDEXES)
+    assert all("IF NOT EXISTS" in statement for statement in created)
+    assert (
+        "CREATE CONSTRAINT constraint_unique_EmailNode_messageId IF NOT EXISTS "
+        "FOR (n:EmailNode) REQUIRE n.messageId IS UNIQUE"
+    ) in created
+    assert any("ON (n.classification, n.relevance_score)" in s for s in created)
+    assert report["offline"] == [] and report["fallback"] == {}
+
+
+@pytest.mark.asyncio
+async def test_duplicates_fall_back_to_an_index():
+    """Test that duplicate message IDs downgrade the constraint to an index"""
+    driver = SchemaDriver(
+        duplicates=["EmailNode"], offline=["index_EmailNode_classification"]
+    )
+
+    report = await install_schema(GraphRepository(driver=driver))
+
+    assert report["fallback"] == {
+        "constraint_unique_EmailNode_messageId": [(["m1"], 2)]
+    }
+    assert "index_EmailNode_messageId" in report["installed"]
+    assert report["offline"] == ["index_EmailNode_classification"]
+
+
+@pytest.mark.asyncio
+async def test_existing_constraints_skip_the_duplicates_scan():
+    """Test that only missing constraints scan their label, ignoring null keys"""
+    existing = [name for name, _, _ in CONSTRAINTS[:2]]
+    driver = SchemaDriver(existing=existing)
+
+    report = await install_schema(GraphRepository(driver=driver))
+
+    scans = [s for s in driver.statements if "copies > 1" in s]
+    assert len(scans) == 1
+    assert "MATCH (n:EmailNode)\nWHERE n.messageId IS NOT NULL" in scans[0]
+    assert not any(name in s for s in driver.statements for name in existing)
+    assert set(existing) <= set(report["installed"])
+    assert report["offline"] == []
+
+
+@pytest.mark.asyncio
+async def test_explain_flags_label_scans():
+    """Test that plans are flattened and label scans are reported"""
+    plans = await explain_queries(GraphRepository(driver=SchemaDriver()))
+
+    assert plans["task_page"] == {
+        "operators": ["ProduceResults", "NodeByLabelScan"],
+        "scans": ["NodeByLabelScan"],
+    }
+    assert plan_operators(None) == []
@@ -0,0 +1,57 @@
+import joblib
+import numpy as np
+import pytest
+from pathlib import Path
+from src.models.linear_model import LinearRegressor
+from src.models.user import UserModel
+
+MODEL_DIR = Path(__file__).parents[2] / "src" / "utils" / "models"
+
+
+@pytest.fixture
+def sklearn_model():
+    return joblib.load(MODEL_DIR / "utility_model.joblib")
+
+
+class TestLinearRegressor:
+    def test_predict_matches_sklearn(self, sklearn_model):
+        """Test that converted models predict the same scores"""
+        model = LinearRegressor.from_sklearn(sklearn_model)
+        X = np.random.default_rng(0).random((10, 12))
+
+        assert np.allclose(model.predict(X), sklearn_model.predict(X))
+
+    def test_partial_fit_matches_sklearn(self, sklearn_model):
+        """Test that online updates follow SGDRegressor.partial_fit"""
+        model = LinearRegressor.from_sklearn(sklearn_model)
+        X = np.random.default_rng(1).random((5, 12))
+
+        for i in range(5):
+            sklearn_model.partial_fit(X[i : i + 1], [0.3])
+            model.partial_fit(X[i : i + 1], [0.3])
+
+        assert np.allclose(model.coef_, sklearn_model.coef_)
+        assert np.allclose(model.intercept_, sklearn_model.intercept_)
+        assert model.t_ == sklearn_model.t_
+
+    def test_round_trip(self, sklearn_model):
+        """Test serialization round trip and blob size"""
+        model = LinearRegressor.from_sklearn(sklearn_model)
+        blob = model.to_bytes()
+        restored = LinearRegressor.from_bytes(blob)
+
+        assert LinearRegressor.is_compact(blob)
+        assert len(blob) < 200
+        assert np.array_equal(restored.coef_, model.coef_)
+        assert restored.t_ == model.t_
+        assert restored.learning_rate == model.learning_rate
+
+    def test_deserialize_legacy_pickle(self, sklearn_model):
+        """Test that pickled SGDRegressor blobs are still readable"""
+        legacy_blob = (MODEL_DIR / "utility_model.joblib").read_bytes()
+
+        model = UserModel._deserialize_model(legacy_blob)
+
+        assert isinstance(model, LinearRegressor)
+        assert np.array_equal(model.coef_, sklearn_model.coef_)
+        assert not LinearRegressor.is_compact(legacy_blob)
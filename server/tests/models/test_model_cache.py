@@ -0,0 +1,80 @@
+import pytest
+from src.models.model_cache import UserModelCache
+from src.models.task_scoring import TaskScoringModel
+from src.models.user import UserModel
+
+
+@pytest.fixture
+def cache():
+    return UserModelCache(max_entries=2, max_bytes=100, ttl_seconds=0)
+
+
+class TestUserModelCache:
+    def test_get_miss_and_hit(self, cache):
+        """Test that a stored entry is returned and counted as a hit"""
+        assert cache.get("user-1") is None
+        cache.put("user-1", "utility", "cost", nbytes=10)
+
+        assert cache.get("user-1") == ("utility", "cost")
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_by_entries(self, cache):
+        """Test that the least recently used entry is evicted first"""
+        cache.put("user-1", "u1", "c1", nbytes=10)
+        cache.put("user-2", "u2", "c2", nbytes=10)
+        cache.get("user-1")
+        cache.put("user-3", "u3", "c3", nbytes=10)
+
+        assert cache.get("user-2") is None
+        assert cache.get("user-1") == ("u1", "c1")
+        assert cache.get("user-3") == ("u3", "c3")
+
+    def test_eviction_by_bytes(self, cache):
+        """Test that the byte budget is enforced"""
+        cache.put("user-1", "u1", "c1", nbytes=60)
+        cache.put("user-2", "u2", "c2", nbytes=60)
+
+        assert cache.get("user-1") is None
+        assert cache.stats()["bytes"] == 60
+
+    def test_invalidate(self, cache):
+        """Test that invalidation drops the entry and its bytes"""
+        cache.put("user-1", "u1", "c1", nbytes=10)
+        cache.invalidate("user-1")
+
+        assert cache.get("user-1") is None
+        assert cache.stats()["bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_load_user_models_uses_cache(monkeypatch):
+    """Test that repeated loads only hit the database once"""
+    scoring_model = TaskScoringModel()
+    default_utility, default_cost = scoring_model._create_default_models()
+    calls = []
+
+    class FakeUserModel:
+        utility_model = UserModel._serialize_model(default_utility)
+        cost_model = UserModel._serialize_model(default_cost)
+
+        def has_legacy_models(self):
+            return False
+
+        async def get_utility_model(self):
+            return UserModel._deserialize_model(self.utility_model)
+
+        async def get_cost_model(self):
+            return UserModel._deserialize_model(self.cost_model)
+
+    async def fake_get_or_create(user_id):
+        calls.append(user_id)
+        return FakeUserModel()
+
+    monkeypatch.setattr(UserModel, "get_or_create", fake_get_or_create)
+
+    first = await scoring_model.load_user_models("cached-user")
+    second = await scoring_model.load_user_models("cached-user")
+
+    assert len(calls) == 1
+    assert first[0] is second[0]
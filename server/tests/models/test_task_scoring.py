@@ -50,30 +50,15 @@ class TestTaskScoringModel:
         assert scoring_model._encode_priority("low") == 0.0
         assert scoring_model._encode_priority("invalid") == 0.5  # Default case
 
-    def test_convert_features_to_array(self, scoring_model, sample_task_data):
-        """Test feature conversion to numpy array"""
-        utility_array = scoring_model._convert_features_to_array(
-            sample_task_data["utility_features"], 
-            scoring_model.utility_mappings
-        )
-        cost_array = scoring_model._convert_features_to_array(
-            sample_task_data["cost_features"],
-            scoring_model.cost_mappings
-        )
-
-        assert isinstance(utility_array, np.ndarray)
-        assert isinstance(cost_array, np.ndarray)
-        assert len(utility_array) == len(sample_task_data["utility_features"])
-        assert len(cost_array) == len(sample_task_data["cost_features"])
-
     def test_extract_features(self, scoring_model, sample_task_data):
         """Test feature extraction from task data"""
         utility_features, cost_features = scoring_model.extract_features(sample_task_data)
         
         assert isinstance(utility_features, np.ndarray)
         assert isinstance(cost_features, np.ndarray)
-        assert utility_features.shape[1] == len(sample_task_data["utility_features"])
-        assert cost_features.shape[1] == len(sample_task_data["cost_features"])
+        # Features are encoded against the fixed schema, missing ones as 0.0
+        assert utility_features.shape == (1, 12)
+        assert cost_features.shape == (1, 6)
 
     def test_create_default_models(self, scoring_model):
         """Test default model creation"""
@@ -274,3 +259,54 @@ class TestTaskScoringModel:
         # Verify scores match the single reference task
         assert abs(result["utility_score"] - task_above.utility_score) < 0.01
         assert abs(result["cost_score"] - task_above.cost_score) < 0.01
+
+    def test_batch_calculate_relevance(self, scoring_model):
+        """Test vectorized relevance matches the scalar calculation"""
+        utility_scores = np.array([0.8, 0.1, 1.0])
+        cost_scores = np.array([0.3, 0.9, 0.0])
+
+        relevance = scoring_model.batch_calculate_relevance(utility_scores, cost_scores)
+
+        expected = [
+            scoring_model.calculate_relevance(u, c)
+            for u, c in zip(utility_scores, cost_scores)
+        ]
+        assert np.allclose(relevance, expected)
+
+    @pytest.mark.asyncio
+    async def test_batch_score_matches_single_predictions(self, scoring_model, monkeypatch):
+        """Test that one batched predict gives the same scores as per-task predicts"""
+        utility_model, cost_model = scoring_model._create_default_models()
+
+        async def mock_load_user_models(user_id):
+            return utility_model, cost_model
+
+        monkeypatch.setattr(scoring_model, "load_user_models", mock_load_user_models)
+
+        rng = np.random.default_rng(0)
+        utility_rows = [rng.random((1, 12)) for _ in range(5)]
+        cost_rows = [rng.random((1, 6)) for _ in range(5)]
+        # A row that is too narrow falls back to the default score
+        utility_rows.append(np.ones((1, 3)))
+        cost_rows.append(np.ones((1, 6)))
+
+        utility_matrix, utility_valid = scoring_model.stack_features(
+            utility_rows, scoring_model.utility_vectorizer.width
+        )
+        cost_matrix, cost_valid = scoring_model.stack_features(
+            cost_rows, scoring_model.cost_vectorizer.width
+        )
+        relevance, utility_scores, cost_scores = await scoring_model.batch_score(
+            utility_matrix, cost_matrix, "user", utility_valid, cost_valid
+        )
+
+        for i in range(5):
+            features = (utility_rows[i], cost_rows[i])
+            assert utility_scores[i] == pytest.approx(
+                await scoring_model.predict_utility(features, "user")
+            )
+            assert cost_scores[i] == pytest.approx(
+                await scoring_model.predict_cost(features, "user")
+            )
+        assert utility_scores[5] == 0.5
+        assert np.all((relevance >= 0.0) & (relevance <= 1.0))
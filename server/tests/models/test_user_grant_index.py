@@ -0,0 +1,61 @@
+import pytest
+import pytest_asyncio
+from tortoise import Tortoise
+from src.models.user import User
+from src.utils.encryption import encryption
+
+
+@pytest_asyncio.fixture
+async def db():
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": ["src.models.user"]}
+    )
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+async def _user(email, grant_id=None):
+    user = User(name=email, email=email)
+    if grant_id:
+        await user.set_nylas_grant_id(grant_id)
+    await user.save()
+    return user
+
+
+def test_blind_index_is_deterministic_and_keyed():
+    """Test that the index matches for equal values and hides the value"""
+    index = encryption.blind_index("grant-1")
+
+    assert index == encryption.blind_index("grant-1")
+    assert index != encryption.blind_index("grant-2")
+    assert "grant-1" not in index and len(index) == 64
+    assert encryption.blind_index("") is None
+
+
+@pytest.mark.asyncio
+async def test_set_grant_id_stores_ciphertext_and_index(db):
+    """Test that the grant ID is encrypted and indexed on save"""
+    user = await _user("a@example.com", "grant-1")
+
+    stored = await User.get(id=user.id)
+    assert stored.nylas_grant_id != "grant-1"
+    assert stored.get_nylas_grant_id() == "grant-1"
+    assert stored.nylas_grant_index == encryption.blind_index("grant-1")
+
+
+@pytest.mark.asyncio
+async def test_grant_lookups_use_the_index(db):
+    """Test that grant lookups return only users of that grant"""
+    first = await _user("a@example.com", "grant-1")
+    second = await _user("b@example.com", "grant-1")
+    await _user("c@example.com", "grant-2")
+    await _user("d@example.com")
+
+    users = await User.get_all_users_by_grant_id("grant-1")
+    assert sorted(str(user.id) for user in users) == sorted(
+        [str(first.id), str(second.id)]
+    )
+    assert (await User.get_by_grant_id("grant-2")).email == "c@example.com"
+    assert await User.get_by_grant_id("grant-3") is None
+    assert await User.get_all_users_by_grant_id(None) == []
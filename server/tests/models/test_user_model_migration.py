@@ -0,0 +1,55 @@
+import joblib
+import numpy as np
+import pytest
+import pytest_asyncio
+from io import BytesIO
+from sklearn.linear_model import SGDRegressor
+from tortoise import Tortoise
+from src.models.linear_model import LinearRegressor
+from src.models.user import User, UserModel
+
+
+@pytest_asyncio.fixture
+async def db():
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": ["src.models.user"]}
+    )
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+def _pickled_model(weight):
+    model = SGDRegressor()
+    model.fit(np.array([[1.0, 0.0], [0.0, 1.0]]), np.array([weight, 0.0]))
+    buffer = BytesIO()
+    joblib.dump(model, buffer)
+    return model, buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_models_rewrites_only_pickles(db):
+    """Test that pickled rows are converted with the same predictions"""
+    legacy_model, legacy_blob = _pickled_model(1.0)
+    legacy = await UserModel.create(
+        user=await User.create(name="a", email="a@example.com"),
+        utility_model=legacy_blob,
+        cost_model=legacy_blob,
+    )
+    compact = await UserModel.create(
+        user=await User.create(name="b", email="b@example.com"),
+        utility_model=LinearRegressor.from_sklearn(legacy_model).to_bytes(),
+        cost_model=LinearRegressor.from_sklearn(legacy_model).to_bytes(),
+    )
+
+    assert await UserModel.migrate_legacy_models() == 1
+    assert await UserModel.migrate_legacy_models() == 0
+
+    await legacy.refresh_from_db()
+    assert not legacy.has_legacy_models()
+    X = np.array([[0.5, 0.25]])
+    assert np.allclose(
+        (await legacy.get_utility_model()).predict(X), legacy_model.predict(X)
+    )
+    await compact.refresh_from_db()
+    assert not compact.has_legacy_models()
@@ -0,0 +1,176 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+from tortoise import Tortoise
+from src.models.mailbox import MailboxSyncState, SyncedMessage
+from src.modules.nylas import service as service_module
+from src.modules.nylas.folders import folder_cache
+from src.modules.nylas.message_cache import page_cache
+from src.modules.nylas.service import NylasService
+from src.utils.encryption import encryption
+
+DAY = 24 * 60 * 60
+
+
+class FakeMailbox:
+    """Fake messages API applying received_after/received_before/in like Nylas"""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.calls = []
+
+    def list(self, identifier, query_params=None):
+        params = query_params or {}
+        self.calls.append(params)
+        data = [
+            message
+            for message in sorted(self.messages, key=lambda m: -m["date"])
+            if message["date"] > params.get("received_after", 0)
+            and message["date"] < params.get("received_before", float("inf"))
+            and set(message["folders"]) & set(params.get("in", message["folders"]))
+        ]
+        return SimpleNamespace(
+            data=[SimpleNamespace(to_dict=lambda m=m: dict(m)) for m in data],
+            next_cursor=None,
+        )
+
+
+def _message(i, age_days, folder):
+    return {
+        "id": f"msg-{i}",
+        "grant_id": "grant-1",
+        "date": int(time.time() - age_days * DAY),
+        "folders": [folder],
+        "body": f"body {i}",
+    }
+
+
+@pytest_asyncio.fixture
+async def mailbox():
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": ["src.models.mailbox"]}
+    )
+    await Tortoise.generate_schemas()
+    folder_cache.invalidate("grant-1")
+    page_cache.clear()
+
+    service = NylasService()
+    fake = FakeMailbox(
+        [
+            _message(1, 1, "INBOX"),
+            _message(2, 5, "SENT"),
+            _message(3, 15, "INBOX"),
+            _message(4, 30, "INBOX"),
+        ]
+    )
+    service.client = SimpleNamespace(
+        messages=fake,
+        folders=SimpleNamespace(list=lambda identifier: SimpleNamespace(data=[])),
+    )
+    yield service, fake
+
+    folder_cache.invalidate("grant-1")
+    page_cache.clear()
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_onboarding_fetches_share_one_sync(mailbox):
+    """Test that inbox and sent fetches are served from a single sync"""
+    service, fake = mailbox
+
+    inbox = await service.fetch_last_two_weeks_emails(days=10, grant_id="grant-1")
+    sent = await service.fetch_last_two_weeks_emails_sent_by_user("grant-1")
+    older_inbox = await service.fetch_last_two_weeks_emails(days=20, grant_id="grant-1")
+
+    assert len(fake.calls) == 1
+    assert [m["id"] for m in inbox] == ["msg-1"]
+    assert [m["id"] for m in sent] == ["msg-2"]
+    assert [m["id"] for m in older_inbox] == ["msg-1", "msg-3"]
+
+
+@pytest.mark.asyncio
+async def test_resync_only_pulls_new_messages(mailbox, monkeypatch):
+    """Test that a later sync starts at the high-water mark"""
+    service, fake = mailbox
+    assert await service.sync_since_last("grant-1") == 3
+    state = await MailboxSyncState.get()
+    high_water_mark = state.synced_until
+
+    fake.messages.append(_message(5, 0, "INBOX"))
+    monkeypatch.setattr(service_module, "NYLAS_SYNC_MIN_INTERVAL_SECONDS", 0)
+
+    assert await service.sync_since_last("grant-1") == 2
+    assert fake.calls[-1]["received_after"] == high_water_mark - 1
+
+    inbox = await service.fetch_last_two_weeks_emails(days=10, grant_id="grant-1")
+    assert [m["id"] for m in inbox] == ["msg-5", "msg-1"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_only_pulls_older_window(mailbox, monkeypatch):
+    """Test that asking for an older window fetches just the missing range"""
+    service, fake = mailbox
+    monkeypatch.setattr(service_module, "NYLAS_SYNC_RETENTION_DAYS", 60)
+    await service.sync_since_last("grant-1")
+
+    since = int(time.time() - 40 * DAY)
+    assert await service.sync_since_last("grant-1", since=since) == 1
+    state = await MailboxSyncState.get()
+
+    assert "received_before" in fake.calls[-1]
+    assert state.synced_from == since
+
+
+@pytest.mark.asyncio
+async def test_resync_purges_messages_past_retention(mailbox, monkeypatch):
+    """Test that synced messages older than the retention window are deleted"""
+    service, fake = mailbox
+    monkeypatch.setattr(service_module, "NYLAS_SYNC_RETENTION_DAYS", 60)
+    await service.sync_since_last("grant-1", since=int(time.time() - 40 * DAY))
+    assert await SyncedMessage.filter(message_id="msg-4").exists()
+
+    monkeypatch.setattr(service_module, "NYLAS_SYNC_RETENTION_DAYS", 25)
+    monkeypatch.setattr(service_module, "NYLAS_SYNC_MIN_INTERVAL_SECONDS", 0)
+    await service.sync_since_last("grant-1")
+    state = await MailboxSyncState.get()
+
+    assert not await SyncedMessage.filter(message_id="msg-4").exists()
+    assert state.synced_from >= int(time.time() - 25 * DAY) - 5
+    assert state.grant_key == encryption.blind_index("grant-1")
+
+
+@pytest.mark.asyncio
+async def test_recent_emails_stream_until_a_sync_covers_them(mailbox):
+    """Test that pages stream from Nylas, or from the store after a fresh sync"""
+    service, fake = mailbox
+
+    pages = [p async for p in service.iter_recent_emails("grant-1", 20, ["INBOX"], 10)]
+    assert [[m["id"] for m in page] for page in pages] == [["msg-1", "msg-3"]]
+    assert await SyncedMessage.all().count() == 0
+
+    await service.sync_since_last("grant-1")
+    calls = len(fake.calls)
+    pages = [
+        p
+        async for p in service.iter_recent_emails(
+            "grant-1", 20, ["INBOX"], 10, page_size=1
+        )
+    ]
+    assert [[m["id"] for m in page] for page in pages] == [["msg-1"], ["msg-3"]]
+    assert len(fake.calls) == calls
+
+
+@pytest.mark.asyncio
+async def test_sync_locks_are_dropped_when_idle(mailbox):
+    """Test that concurrent syncs share one lock that is released afterwards"""
+    service, fake = mailbox
+
+    await asyncio.gather(
+        service.sync_since_last("grant-1"), service.sync_since_last("grant-1")
+    )
+
+    assert len(fake.calls) == 1
+    assert len(service_module._sync_locks) == 0
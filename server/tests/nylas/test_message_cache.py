@@ -0,0 +1,55 @@
+import time
+from src.modules.nylas.message_cache import MessageCache
+
+
+def _message(message_id, body="hello"):
+    return {"id": message_id, "subject": "Subject", "body": body}
+
+
+def test_round_trip_returns_copy():
+    """Test that cached messages are decompressed into independent copies"""
+    cache = MessageCache(max_entries=10, max_bytes=0, ttl_seconds=0)
+    cache.put("grant-1", _message("msg-1"))
+
+    first = cache.get("grant-1", "msg-1")
+    first["subject"] = "changed"
+
+    assert cache.get("grant-1", "msg-1")["subject"] == "Subject"
+    assert cache.get("grant-2", "msg-1") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_bodies_are_compressed():
+    """Test that the byte budget counts compressed bytes"""
+    cache = MessageCache(max_entries=10, max_bytes=0, ttl_seconds=0)
+    body = "<p>" + "quarterly report attached " * 400 + "</p>"
+    cache.put("grant-1", _message("msg-1", body))
+
+    assert cache.stats()["bytes"] < len(body) / 10
+
+
+def test_evicts_least_recently_used_within_byte_budget():
+    """Test that the byte cap evicts the least recently used message"""
+    cache = MessageCache(max_entries=10, max_bytes=0, ttl_seconds=0)
+    cache.put("grant-1", _message("msg-1"))
+    entry_bytes = cache.stats()["bytes"]
+    cache.max_bytes = entry_bytes * 2
+
+    cache.put("grant-1", _message("msg-2"))
+    cache.get("grant-1", "msg-1")
+    cache.put("grant-1", _message("msg-3"))
+
+    assert cache.get("grant-1", "msg-2") is None
+    assert cache.get("grant-1", "msg-1") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire():
+    """Test that entries older than the TTL are misses"""
+    cache = MessageCache(max_entries=10, max_bytes=0, ttl_seconds=0.01)
+    cache.put("grant-1", _message("msg-1"))
+    time.sleep(0.02)
+
+    assert cache.get("grant-1", "msg-1") is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,217 @@
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from src.modules.nylas.folders import folder_cache
+from src.modules.nylas.message_cache import message_cache, page_cache
+from src.modules.nylas.service import NylasService
+
+
+class SlowMessages:
+    def __init__(self):
+        self.found = []
+
+    def list(self, identifier, query_params=None):
+        time.sleep(0.2)
+        message = SimpleNamespace(to_dict=lambda: {"id": "msg-1"})
+        return SimpleNamespace(data=[message], next_cursor="cursor-2")
+
+    def find(self, identifier, message_id):
+        self.found.append(message_id)
+        time.sleep(0.2)
+        return SimpleNamespace(data=SimpleNamespace(to_dict=lambda: {"id": message_id}))
+
+
+@pytest.fixture
+def nylas_service():
+    message_cache.clear()
+    page_cache.clear()
+    service = NylasService()
+    service.client = SimpleNamespace(messages=SlowMessages())
+    yield service
+    message_cache.clear()
+    page_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_messages_does_not_block_event_loop(nylas_service):
+    """Test that SDK calls run off the event loop"""
+    finished = []
+
+    async def fetch():
+        result = await nylas_service.get_messages("grant-1", limit=10)
+        finished.append("fetch")
+        return result
+
+    async def ticker():
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+        finished.append("ticker")
+
+    result, _ = await asyncio.gather(fetch(), ticker())
+
+    assert result == {"data": [{"id": "msg-1"}], "next_cursor": "cursor-2"}
+    assert finished == ["ticker", "fetch"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_overlap(nylas_service):
+    """Test that concurrent fetches run in parallel in the thread pool"""
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(nylas_service.get_message("grant-1", f"msg-{i}") for i in range(4))
+    )
+
+    assert [result["id"] for result in results] == [f"msg-{i}" for i in range(4)]
+    assert time.perf_counter() - started < 0.6
+
+
+@pytest.mark.asyncio
+async def test_get_message_reads_through_cache(nylas_service):
+    """Test that repeat reads and reads after a listing skip Nylas"""
+    await nylas_service.get_message("grant-1", "msg-9")
+    await nylas_service.get_message("grant-1", "msg-9")
+    await nylas_service.get_messages("grant-1", limit=10)
+    message = await nylas_service.get_message("grant-1", "msg-1")
+
+    assert message == {"id": "msg-1"}
+    assert nylas_service.client.messages.found == ["msg-9"]
+
+
+class PagedMessages:
+    """Fake messages API serving three pages linked by next_cursor"""
+
+    def __init__(self):
+        self.calls = []
+        self.params = []
+
+    def list(self, identifier, query_params=None):
+        query_params = query_params or {}
+        token = query_params.get("page_token")
+        self.calls.append(token)
+        self.params.append(query_params)
+        page = int(token) if token else 0
+        data = [
+            {
+                "id": f"msg-{page}-{i}",
+                "folders": ["inbox-id"] if i % 2 == 0 else ["sent-id"],
+            }
+            for i in range(4)
+        ]
+        if "in" in query_params:
+            data = [
+                message
+                for message in data
+                if set(message["folders"]) & set(query_params["in"])
+            ]
+        next_cursor = str(page + 1) if page < 2 else None
+        return SimpleNamespace(
+            data=[SimpleNamespace(to_dict=lambda m=m: m) for m in data],
+            next_cursor=next_cursor,
+        )
+
+
+class FakeFolders:
+    def __init__(self):
+        self.calls = 0
+
+    def list(self, identifier):
+        self.calls += 1
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(id="inbox-id", name="Inbox", attributes=["\\Inbox"]),
+                SimpleNamespace(id="sent-id", name="Sent Items", attributes=["\\Sent"]),
+            ]
+        )
+
+
+@pytest.fixture
+def paged_client(nylas_service):
+    folder_cache.invalidate("grant-1")
+    client = SimpleNamespace(messages=PagedMessages(), folders=FakeFolders())
+    nylas_service.client = client
+    yield client
+    folder_cache.invalidate("grant-1")
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_follows_cursor(nylas_service, paged_client):
+    """Test that every page is fetched with the folder filter pushed to Nylas"""
+    pages = [
+        page
+        async for page in nylas_service.iter_messages(
+            "grant-1", folders=["INBOX"], page_size=4
+        )
+    ]
+
+    assert paged_client.messages.calls == [None, "1", "2"]
+    assert [len(page) for page in pages] == [2, 2, 2]
+    assert pages[2][0]["id"] == "msg-2-0"
+    for params in paged_client.messages.params:
+        assert params["in"] == ["inbox-id"]
+        assert "grant_id" in params["select"].split(",")
+
+
+@pytest.mark.asyncio
+async def test_folder_ids_are_cached_per_grant(nylas_service, paged_client):
+    """Test that the folder list is fetched once and resolved by attribute"""
+    for _ in range(2):
+        async for _ in nylas_service.iter_messages(
+            "grant-1", folders=["SENT"], page_size=4
+        ):
+            pass
+
+    assert paged_client.folders.calls == 1
+    assert paged_client.messages.params[-1]["in"] == ["sent-id"]
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_stops_at_max_messages(nylas_service, paged_client):
+    """Test that the stream ends once enough messages were yielded"""
+    pages = [
+        page
+        async for page in nylas_service.iter_messages(
+            "grant-1", page_size=4, prefetch=1, max_messages=5
+        )
+    ]
+
+    assert [len(page) for page in pages] == [4, 1]
+
+
+@pytest.mark.asyncio
+async def test_repeat_listing_is_served_from_page_cache(nylas_service, paged_client):
+    """Test that listing the same window twice calls Nylas once per page"""
+    runs = []
+    for _ in range(2):
+        runs.append(
+            [
+                message["id"]
+                async for page in nylas_service.iter_messages(
+                    "grant-1", since=1700000000, page_size=4
+                )
+                for message in page
+            ]
+        )
+    await nylas_service.get_messages("grant-1", limit=4)
+    await nylas_service.get_messages("grant-1", limit=4)
+
+    assert runs[0] == runs[1]
+    assert len(runs[0]) == 12
+    assert paged_client.messages.calls == [None, "1", "2", None]
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_writes_full_messages_through(nylas_service, paged_client):
+    """Test that only pages without a field selection fill the message cache"""
+    async for _ in nylas_service.iter_messages("grant-1", page_size=4, max_messages=4):
+        pass
+    assert message_cache.get("grant-1", "msg-0-0") is None
+
+    async for _ in nylas_service.iter_messages(
+        "grant-1", page_size=4, max_messages=4, fields=None
+    ):
+        pass
+    message = await nylas_service.get_message("grant-1", "msg-0-0")
+
+    assert message["id"] == "msg-0-0"
+    assert not hasattr(paged_client.messages, "found")
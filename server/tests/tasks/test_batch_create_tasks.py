@@ -0,0 +1,104 @@
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+from tortoise import Tortoise
+from src.models.graph.repository import GraphRepository
+from src.models.ranking import TaskRanking
+from src.models.user import Features, User
+from src.modules.tasks import service as service_module
+from src.modules.tasks.schemas import TaskCreate
+from src.modules.tasks.service import TaskService
+
+
+class FakeDriver:
+    """Records queries and returns one element ID per UNWIND row"""
+
+    def __init__(self, fail_on=None):
+        self.queries = []
+        self.fail_on = fail_on
+
+    async def execute_query(self, query, params, routing_=None, database_=None):
+        self.queries.append((query, params))
+        if self.fail_on == len(self.queries):
+            raise RuntimeError("write failed")
+        records = [
+            {"element_id": f"node-{row['props']['task_id']}"} for row in params["rows"]
+        ]
+        return SimpleNamespace(records=records)
+
+
+@pytest_asyncio.fixture
+async def user():
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["src.models.user", "src.models.ranking"]},
+    )
+    await Tortoise.generate_schemas()
+    yield await User.create(name="User", email="user@example.com")
+    await Tortoise.close_connections()
+
+
+def _tasks(count):
+    return [
+        TaskCreate(
+            task=f"task {i}",
+            messageId=f"m{i % 3}",
+            priority="high",
+            relevance_score=0.5,
+            utility_score=0.4,
+            cost_score=0.3,
+            classification="",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_written_in_one_statement(user, monkeypatch):
+    """Test that a batch costs one graph statement and one features insert"""
+    graph = FakeDriver()
+    monkeypatch.setattr(service_module, "graph", GraphRepository(driver=graph))
+    features = [{"n": i} for i in range(10)]
+
+    created = await TaskService.batch_create_tasks(
+        _tasks(10), str(user.id), features, features
+    )
+
+    assert len(graph.queries) == 1
+    query, params = graph.queries[0]
+    assert "UNWIND $rows" in query
+    assert params["user_id"] == str(user.id)
+    assert [row["message_id"] for row in params["rows"]] == [
+        f"m{i % 3}" for i in range(10)
+    ]
+    assert params["rows"][0]["props"]["deadline"] == "No Deadline"
+    assert isinstance(params["rows"][0]["props"]["createdAt"], float)
+    assert [task.messageId for task in created] == [f"m{i % 3}" for i in range(10)]
+    assert created[0].element_id == f"node-{created[0].task_id}"
+
+    stored = await Features.filter(user_id=user.id).order_by("task_id")
+    assert sorted(f.task_id for f in stored) == sorted(t.task_id for t in created)
+    by_task = {f.task_id: f.features for f in stored}
+    assert [by_task[task.task_id] for task in created] == features
+    ranked = await TaskRanking.filter(user_id=str(user.id)).values_list(
+        "task_id", "message_id"
+    )
+    assert sorted(ranked) == sorted((t.task_id, t.messageId) for t in created)
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_skips_only_its_tasks(user, monkeypatch):
+    """Test that a failed chunk is skipped and features follow the created tasks"""
+    graph = FakeDriver(fail_on=1)
+    monkeypatch.setattr(service_module, "graph", GraphRepository(driver=graph))
+    monkeypatch.setattr(TaskService, "BULK_WRITE_BATCH_SIZE", 2)
+    features = [{"n": i} for i in range(5)]
+
+    created = await TaskService.batch_create_tasks(
+        _tasks(5), str(user.id), features, features
+    )
+
+    assert len(graph.queries) == 3
+    assert [task.task for task in created] == ["task 2", "task 3", "task 4"]
+    stored = {f.task_id: f.features for f in await Features.all()}
+    assert [stored[task.task_id] for task in created] == features[2:]
@@ -0,0 +1,88 @@
+import pytest
+from src.modules.tasks import service as service_module
+from src.modules.tasks.service import TaskService
+
+
+class PagedGraph:
+    """Applies the page query semantics to tasks held in memory"""
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.calls = []
+
+    async def get_task_page(self, user_id, limit=None, classification=None, after=None):
+        self.calls.append(limit)
+        tasks = sorted(
+            self.tasks, key=lambda t: (-(t["relevance_score"] or 0.0), t["task_id"])
+        )
+        if classification is not None:
+            tasks = [t for t in tasks if t["classification"] == classification]
+        if after is not None:
+            score, task_id = after
+            tasks = [
+                t
+                for t in tasks
+                if (t["relevance_score"] or 0.0) < score
+                or ((t["relevance_score"] or 0.0) == score and t["task_id"] > task_id)
+            ]
+        return tasks[:limit] if limit is not None else tasks
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    tasks = [
+        {
+            "task_id": f"t{i:02d}",
+            "relevance_score": [0.9, 0.5, 0.5, None][i % 4],
+            "classification": "Today" if i % 2 else "Later",
+        }
+        for i in range(11)
+    ]
+    graph = PagedGraph(tasks)
+    monkeypatch.setattr(service_module, "graph", graph)
+    # Read straight from the graph; the ranking has its own tests
+    monkeypatch.setattr(service_module.task_ranking, "enabled", False)
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_task_once_in_order(graph):
+    """Test that following cursors returns every task exactly once, in order"""
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = await TaskService.get_tasks_by_user(
+            "user-1", limit=3, cursor=cursor
+        )
+        seen.extend(task["task_id"] for task in page)
+        if cursor is None:
+            break
+
+    all_tasks, next_cursor = await TaskService.get_tasks_by_user("user-1")
+    assert seen == [task["task_id"] for task in all_tasks]
+    assert len(seen) == 11 and next_cursor is None
+    assert graph.calls[:2] == [4, 4]
+
+
+@pytest.mark.asyncio
+async def test_top_k_with_classification(graph):
+    """Test that top-K returns the best tasks of one classification"""
+    page, cursor = await TaskService.get_tasks_by_user(
+        "user-1", limit=2, classification="Today"
+    )
+
+    assert [task["task_id"] for task in page] == ["t01", "t05"]
+    assert cursor is not None
+
+    last_page, cursor = await TaskService.get_tasks_by_user(
+        "user-1", limit=10, classification="Today", cursor=cursor
+    )
+    assert cursor is None
+    assert all(task["classification"] == "Today" for task in last_page)
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_is_rejected(graph):
+    """Test that a cursor that does not decode raises ValueError"""
+    with pytest.raises(ValueError):
+        await TaskService.get_tasks_by_user("user-1", limit=2, cursor="not-a-cursor")
@@ -0,0 +1,169 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from datetime import datetime, UTC
+from tortoise import Tortoise
+from src.models.graph.nodes import TaskNode
+from src.models.ranking import TaskRanking, TaskRankingState
+from src.modules.tasks import ranking as ranking_module
+from src.modules.tasks import service as service_module
+from src.modules.tasks.schemas import TaskCreate, TaskUpdate
+from src.modules.tasks.service import TaskService
+
+
+def _task(task_id, score, classification="Today", message_id="m1"):
+    return {
+        "task_id": task_id,
+        "task": f"Task {task_id}",
+        "deadline": "No Deadline",
+        "priority": "high",
+        "relevance_score": score,
+        "utility_score": 0.5,
+        "cost_score": 0.5,
+        "classification": classification,
+        "createdAt": datetime(2026, 1, 1, tzinfo=UTC),
+        "updatedAt": datetime(2026, 1, 1, tzinfo=UTC),
+        "messageId": message_id,
+    }
+
+
+class FakeGraph:
+    """Serves a fixed task list and stores written nodes"""
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.nodes = {}
+        self.page_reads = 0
+
+    async def get_task_page(self, user_id, limit=None, classification=None, after=None):
+        self.page_reads += 1
+        return list(self.tasks)
+
+    async def create_tasks(self, user_id, tasks):
+        for task in tasks:
+            self.nodes[task.task_id] = task
+        return tasks
+
+    async def get_task(self, task_id):
+        return self.nodes.get(task_id)
+
+    async def save_task(self, task):
+        return task.task_id in self.nodes
+
+    async def delete_task(self, task_id):
+        return self.nodes.pop(task_id, None) is not None
+
+
+@pytest_asyncio.fixture
+async def graph(monkeypatch):
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": ["src.models.ranking"]}
+    )
+    await Tortoise.generate_schemas()
+    graph = FakeGraph(
+        [_task("a", 0.9), _task("b", 0.5, "Later"), _task("c", 0.5), _task("d", None)]
+    )
+    monkeypatch.setattr(service_module, "graph", graph)
+    monkeypatch.setattr(ranking_module, "graph", graph)
+    monkeypatch.setattr(ranking_module.task_ranking, "enabled", True)
+    yield graph
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_first_read_builds_the_ranking_once(graph):
+    """Test that the ranking is built from the graph once, then read directly"""
+    first, cursor = await TaskService.get_tasks_by_user("user-1", limit=2)
+    rest, last_cursor = await TaskService.get_tasks_by_user(
+        "user-1", limit=2, cursor=cursor
+    )
+
+    assert [t["task_id"] for t in first + rest] == ["a", "b", "c", "d"]
+    assert last_cursor is None
+    assert rest[-1]["relevance_score"] == 0.0
+    assert first[0]["messageId"] == "m1"
+    assert first[0]["createdAt"].replace(tzinfo=UTC) == datetime(2026, 1, 1, tzinfo=UTC)
+    assert graph.page_reads == 1
+    assert await TaskRankingState.is_built("user-1")
+
+    today, _ = await TaskService.get_tasks_by_user("user-1", classification="Today")
+    assert [t["task_id"] for t in today] == ["a", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_task_writes_keep_the_ranking_in_step(graph):
+    """Test that create, update, reorder-style saves and delete reach the ranking"""
+    graph.tasks = []
+    await TaskService.get_tasks_by_user("user-1")
+
+    created = await TaskService.create_task(
+        TaskCreate(task="New", messageId="m9", relevance_score=0.7), "user-1"
+    )
+    await TaskService.update_task(created.task_id, TaskUpdate(priority="low"))
+    created.relevance_score = 0.95
+    await ranking_module.task_ranking.record_updated(created)
+
+    tasks, _ = await TaskService.get_tasks_by_user("user-1")
+    assert [(t["task_id"], t["priority"], t["relevance_score"]) for t in tasks] == [
+        (created.task_id, "low", 0.95)
+    ]
+    assert tasks[0]["messageId"] == "m9"
+
+    assert await TaskService.delete_task(created.task_id)
+    assert await TaskService.get_tasks_by_user("user-1") == ([], None)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_replaces_stale_rows(graph):
+    """Test that a rebuild drops rows the graph no longer has"""
+    await TaskRanking.upsert_tasks("user-1", [_task("stale", 0.99)])
+
+    assert await ranking_module.task_ranking.rebuild("user-1") == 4
+
+    ids = await TaskRanking.filter(user_id="user-1").values_list("task_id", flat=True)
+    assert sorted(ids) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_hook_forces_a_rebuild(graph, monkeypatch):
+    """Test that a ranking write error marks the affected users unbuilt"""
+    await TaskService.get_tasks_by_user("user-1")
+
+    async def update_task(task_id, changes):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(TaskRanking, "update_task", update_task)
+    await ranking_module.task_ranking.record_updated(TaskNode(task_id="a"))
+
+    assert not await TaskRankingState.is_built("user-1")
+    await TaskService.get_tasks_by_user("user-1")
+    assert graph.page_reads == 2
+
+
+@pytest.mark.asyncio
+async def test_rebuild_keeps_writes_made_during_the_graph_read(graph):
+    """Test that tasks written while the graph is read survive the rebuild"""
+    await TaskRanking.upsert_tasks("user-1", [_task("a", 0.9)])
+    read = graph.get_task_page
+
+    async def get_task_page(user_id, **kwargs):
+        tasks = await read(user_id, **kwargs)
+        await TaskRanking.upsert_tasks(user_id, [_task("new", 0.8)])
+        await TaskRanking.update_task("a", {"priority": "low"})
+        return tasks
+
+    graph.get_task_page = get_task_page
+
+    tasks, _ = await TaskService.get_tasks_by_user("user-1")
+
+    assert [t["task_id"] for t in tasks] == ["a", "new", "b", "c", "d"]
+    assert tasks[0]["priority"] == "low"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_reads_share_one_build(graph):
+    """Test that concurrent first reads build once and leave no lock behind"""
+    await asyncio.gather(*(TaskService.get_tasks_by_user("user-1") for _ in range(3)))
+
+    assert graph.page_reads == 1
+    assert ranking_module.task_ranking._build_locks == {}